@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        # Mendaftarkan signal invalidasi cache blok landing promosi, statistik per wilayah,
+        # dropdown UMKM dan perkiraan penjualan
+        from .utils import forecast_utils, promosi_cache, statistik_utils, umkm_cache  # noqa
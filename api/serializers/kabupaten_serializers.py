@@ -8,6 +8,8 @@ class KabupatenSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model Kabupaten (read-only)
     """
+    select_related_fields = ('provinsi',)
+
     provinsi = ProvinsiSerializer(read_only=True)
     nama_lengkap = serializers.SerializerMethodField()
 
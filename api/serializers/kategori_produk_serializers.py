@@ -1,6 +1,16 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from crud.models import KategoriProduk
+from crud.serializers.kategori_produk_serializer import annotate_produk_count, get_produk_count_value
+
+
+def prefetch_kategori(lookup):
+    """
+    Prefetch kategori bersarang (mis. 'kategori', 'produk__kategori') beserta jumlah produknya,
+    satu query untuk semua baris
+    """
+    return Prefetch(lookup, queryset=annotate_produk_count(KategoriProduk.objects.all()))
 
 
 class KategoriProdukSerializer(serializers.ModelSerializer):
@@ -9,8 +19,12 @@ class KategoriProdukSerializer(serializers.ModelSerializer):
     """
     jumlah_produk = serializers.SerializerMethodField()
 
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        return annotate_produk_count(queryset)
+
     def get_jumlah_produk(self, obj):
-        return obj.produk.count()
+        return get_produk_count_value(obj)
 
     class Meta:
         model = KategoriProduk
@@ -8,6 +8,8 @@ class KecamatanSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model Kecamatan (read-only)
     """
+    select_related_fields = ('kabupaten__provinsi',)
+
     kabupaten = KabupatenSerializer(read_only=True)
     nama_lengkap = serializers.SerializerMethodField()
 
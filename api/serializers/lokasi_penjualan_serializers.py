@@ -8,6 +8,8 @@ class LokasiPenjualanSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model LokasiPenjualan (read-only)
     """
+    select_related_fields = ('kecamatan__kabupaten__provinsi',)
+
     kecamatan = KecamatanSerializer(read_only=True)
     nama_lengkap = serializers.SerializerMethodField()
 
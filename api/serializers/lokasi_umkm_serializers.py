@@ -9,6 +9,8 @@ class LokasiUMKMSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model LokasiUMKM (read-only)
     """
+    select_related_fields = ('pengguna', 'kecamatan__kabupaten__provinsi')
+
     pengguna = UserLiteSerializer(read_only=True)
     kecamatan = KecamatanSerializer(read_only=True)
     tgl_update_formatted = serializers.SerializerMethodField()
@@ -0,0 +1,42 @@
+# serializers/onboarding_serializers.py
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from rest_framework import serializers
+
+LOKASI_FIELDS = ('kecamatan', 'latitude', 'longitude')
+
+
+class OnboardingUMKMRowSerializer(serializers.Serializer):
+    """
+    Serializer untuk satu baris file onboarding UMKM (CSV/XLSX)
+    """
+    # Akun
+    username = serializers.CharField(max_length=150, validators=[UnicodeUsernameValidator()])
+    email = serializers.EmailField(required=False, default='')
+    password = serializers.CharField(max_length=40, required=False)
+    first_name = serializers.CharField(max_length=150, required=False, default='')
+    last_name = serializers.CharField(max_length=150, required=False, default='')
+
+    # Profil UMKM
+    nm_bisnis = serializers.CharField(max_length=255, required=False)
+    alamat = serializers.CharField(required=False)
+    tlp = serializers.CharField(max_length=20, required=False)
+    desc_bisnis = serializers.CharField(required=False)
+    total_laki = serializers.IntegerField(min_value=0, required=False, default=0)
+    total_perempuan = serializers.IntegerField(min_value=0, required=False, default=0)
+
+    # Lokasi UMKM (opsional, kecamatan dicari berdasarkan nama)
+    kabupaten = serializers.CharField(max_length=100, required=False)
+    kecamatan = serializers.CharField(max_length=100, required=False)
+    latitude = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    longitude = serializers.FloatField(min_value=-180, max_value=180, required=False)
+    alamat_lengkap = serializers.CharField(required=False)
+    kode_pos = serializers.CharField(max_length=10, required=False)
+
+    def validate(self, attrs):
+        filled = [field for field in LOKASI_FIELDS if field in attrs]
+        if filled and len(filled) < len(LOKASI_FIELDS):
+            raise serializers.ValidationError({
+                field: 'Lokasi UMKM memerlukan kecamatan, latitude dan longitude.'
+                for field in LOKASI_FIELDS if field not in attrs
+            })
+        return attrs
@@ -2,19 +2,26 @@ from rest_framework import serializers
 
 from crud.models import Produk
 from .profil_umkm_serializers import UserLiteSerializer
-from .kategori_produk_serializers import KategoriProdukSerializer
+from .kategori_produk_serializers import KategoriProdukSerializer, prefetch_kategori
 
 
 class ProdukSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model Produk (read-only)
     """
+    select_related_fields = ('umkm__profil_umkm',)
+
     umkm = UserLiteSerializer(read_only=True)
     kategori = KategoriProdukSerializer(read_only=True)
     nama_bisnis = serializers.SerializerMethodField()
     tgl_dibuat_formatted = serializers.SerializerMethodField()
     tgl_update_formatted = serializers.SerializerMethodField()
 
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        # Kategori di-prefetch (bukan select_related) agar membawa anotasi jumlah produknya
+        return queryset.prefetch_related(prefetch_kategori('kategori'))
+
     def get_nama_bisnis(self, obj):
         return getattr(getattr(obj.umkm, 'profil_umkm', None), 'nm_bisnis', obj.umkm.username)
 
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from crud.models import ProdukTerjual
+from .kategori_produk_serializers import prefetch_kategori
 from .produk_serializers import ProdukSerializer
 from .lokasi_penjualan_serializers import LokasiPenjualanSerializer
 
@@ -9,11 +10,17 @@ class ProdukTerjualSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model ProdukTerjual (read-only)
     """
+    select_related_fields = ('produk__umkm__profil_umkm', 'lokasi_penjualan__kecamatan__kabupaten__provinsi')
+
     produk = ProdukSerializer(read_only=True)
     lokasi_penjualan = LokasiPenjualanSerializer(read_only=True)
     tgl_penjualan_formatted = serializers.SerializerMethodField()
     tgl_pelaporan_formatted = serializers.SerializerMethodField()
 
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        return queryset.prefetch_related(prefetch_kategori('produk__kategori'))
+
     def get_tgl_penjualan_formatted(self, obj):
         return obj.tgl_penjualan.strftime("%d %b %Y")
 
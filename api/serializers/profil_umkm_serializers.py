@@ -1,5 +1,4 @@
 from rest_framework import serializers
-from django.contrib.auth.models import User
 from django.contrib.auth import get_user_model
 
 from crud.models import ProfilUMKM
@@ -11,7 +10,7 @@ class UserLiteSerializer(serializers.ModelSerializer):
     """
 
     class Meta:
-        model = User
+        model = get_user_model()
         fields = ['id', 'username', 'first_name', 'last_name', 'email', 'role']
         read_only_fields = fields
 
@@ -182,6 +182,56 @@ class ProdukPromosiSerializer(serializers.ModelSerializer):
             return None
 
 
+_datetime_field = serializers.DateTimeField()
+_gambar_storage = Produk._meta.get_field('gambar_utama').storage
+
+
+class KatalogPromosiSerializer(serializers.BaseSerializer):
+    """
+    Serializer katalog promosi (read-only) dari read model KatalogProduk.
+    Format output sama dengan ProdukPromosiSerializer, tanpa join dan tanpa query per baris.
+    """
+
+    def _gambar_utama(self, obj):
+        if not obj.gambar_utama:
+            return None
+        url = _gambar_storage.url(obj.gambar_utama)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def to_representation(self, obj):
+        # Dibangun langsung tanpa field DRF (katalog publik sering diakses)
+        gambar_utama = self._gambar_utama(obj)
+        return {
+            'id': str(obj.pk),
+            'nm_produk': obj.nm_produk,
+            'desc': obj.desc,
+            'harga': obj.harga,
+            'stok': obj.stok,
+            'satuan': obj.satuan,
+            'gambar_utama': gambar_utama,
+            'gambar_utama_url': gambar_utama,
+            'aktif': obj.aktif,
+            'tgl_dibuat': _datetime_field.to_representation(obj.tgl_dibuat),
+            'tgl_update': _datetime_field.to_representation(obj.tgl_update),
+            'kategori_detail': {
+                'id': str(obj.kategori_id),
+                'nm_kategori': obj.nm_kategori,
+                'desc': obj.desc_kategori
+            },
+            'umkm_detail': {
+                'id': str(obj.umkm_id),
+                'username': obj.username,
+                'profil_umkm': {
+                    'nm_bisnis': obj.nm_bisnis,
+                    'alamat': obj.alamat,
+                    'tlp': obj.tlp,
+                    'desc_bisnis': obj.desc_bisnis
+                }
+            }
+        }
+
+
 class KategoriStatistikSerializer(serializers.ModelSerializer):
     """
     Serializer untuk kategori dengan statistik produk
@@ -196,6 +246,9 @@ class KategoriStatistikSerializer(serializers.ModelSerializer):
         """
         Menghitung jumlah produk aktif per kategori
         """
+        # Queryset kategori promosi sudah menganotasi jumlah_produk
+        if hasattr(obj, 'jumlah_produk'):
+            return obj.jumlah_produk
         try:
             return obj.produk.filter(aktif=True).count()
         except Exception as e:
@@ -59,6 +59,46 @@ class PeriodeStatistikSerializer(serializers.Serializer):
     margin_keuntungan = serializers.DecimalField(max_digits=5, decimal_places=2, allow_null=True)
 
 
+class WilayahStatistikSerializer(serializers.Serializer):
+    """
+    Statistik penjualan yang digulung per wilayah
+    """
+    total_transaksi = serializers.IntegerField()
+    total_produk_terjual = serializers.IntegerField()
+    total_pemasukan = serializers.DecimalField(max_digits=15, decimal_places=2)
+    total_pengeluaran = serializers.DecimalField(max_digits=15, decimal_places=2)
+    keuntungan_bersih = serializers.DecimalField(max_digits=15, decimal_places=2)
+    margin_keuntungan = serializers.DecimalField(max_digits=5, decimal_places=2, allow_null=True)
+    jumlah_umkm_aktif = serializers.IntegerField()
+
+
+class KecamatanStatistikSerializer(WilayahStatistikSerializer):
+    id = serializers.UUIDField()
+    nm_kecamatan = serializers.CharField()
+
+
+class KabupatenStatistikSerializer(WilayahStatistikSerializer):
+    id = serializers.UUIDField()
+    nm_kabupaten = serializers.CharField()
+    tipe = serializers.CharField()
+    kecamatan = KecamatanStatistikSerializer(many=True)
+
+
+class ProvinsiStatistikSerializer(WilayahStatistikSerializer):
+    id = serializers.UUIDField()
+    nm_provinsi = serializers.CharField()
+    kabupaten = KabupatenStatistikSerializer(many=True)
+
+
+class StatistikPerWilayahSerializer(serializers.Serializer):
+    """
+    Serializer untuk statistik per wilayah (provinsi -> kabupaten -> kecamatan)
+    """
+    ringkasan = WilayahStatistikSerializer()
+    tanpa_wilayah = WilayahStatistikSerializer()
+    provinsi = ProvinsiStatistikSerializer(many=True)
+
+
 class StatistikUmumSerializer(serializers.Serializer):
     """
     Serializer untuk statistik umum
@@ -163,4 +203,57 @@ class ParameterStatistikSerializer(serializers.Serializer):
                     "tahun harus diisi untuk periode bulanan atau tahunan"
                 )
 
-        return data
\ No newline at end of file
+        return data
+
+class ParameterForecastSerializer(serializers.Serializer):
+    """
+    Serializer untuk validasi parameter perkiraan penjualan
+    """
+    hari = serializers.IntegerField(
+        default=30,
+        min_value=1,
+        max_value=90,
+        help_text="Jumlah hari yang diperkirakan (default: 30)"
+    )
+
+    riwayat = serializers.IntegerField(
+        default=182,
+        min_value=56,
+        max_value=730,
+        help_text="Jumlah hari riwayat penjualan yang dipakai model (default: 182)"
+    )
+
+    sampai = serializers.DateField(
+        required=False,
+        help_text="Tanggal terakhir riwayat, perkiraan dimulai sehari setelahnya (default: hari ini)"
+    )
+
+    produk_id = serializers.UUIDField(
+        required=False,
+        help_text="Filter berdasarkan produk tertentu (optional)"
+    )
+
+    umkm_id = serializers.UUIDField(
+        required=False,
+        help_text="UMKM yang diperkirakan (wajib untuk admin)"
+    )
+
+
+class ForecastProdukSerializer(serializers.Serializer):
+    """
+    Serializer untuk perkiraan penjualan per produk
+    """
+    produk_id = serializers.UUIDField()
+    nama_produk = serializers.CharField()
+    satuan = serializers.CharField()
+    stok = serializers.IntegerField()
+
+    model = serializers.CharField()
+    alpha = serializers.FloatField(allow_null=True)
+    mae_holdout = serializers.FloatField()
+    rata_rata_harian_4_minggu = serializers.FloatField()
+
+    perkiraan_total = serializers.FloatField()
+    hari_stok_habis = serializers.IntegerField(allow_null=True)
+    saran_restok = serializers.IntegerField()
+    perkiraan_harian = serializers.ListField(child=serializers.FloatField())
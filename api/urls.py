@@ -13,6 +13,9 @@ from api.views import (
 )
 from api.views.grafik_view import grafik_penjualan_view, grafik_penjualan_per_umkm_view, list_umkm_view, \
     ringkasan_penjualan_view
+from api.views.instrumentasi_view import instrumentasi_view
+from api.views.onboarding_view import onboarding_umkm_view
+from api.views.profil_view import download_profil_view, list_profil_view
 from api.views.statistik_view import StatistikViewSet
 
 # Buat router untuk API
@@ -37,6 +40,10 @@ urlpatterns = [
     path('grafik-penjualan-per-umkm/', grafik_penjualan_per_umkm_view, name='   grafik-penjualan-per-umkm'),
     path('list-umkm/', list_umkm_view, name='list-umkm'),
     path('ringkasan-penjualan/', ringkasan_penjualan_view, name='ringkasan-penjualan'),
+    path('instrumentasi/', instrumentasi_view, name='instrumentasi'),
+    path('onboarding-umkm/', onboarding_umkm_view, name='onboarding-umkm'),
+    path('profil/', list_profil_view, name='profil-list'),
+    path('profil/<str:profil_id>/', download_profil_view, name='profil-download'),
 
     path('promosi/', include('api.promosi_urls')),
 
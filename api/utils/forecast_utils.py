@@ -0,0 +1,177 @@
+# utils/forecast_utils.py
+"""
+Perkiraan penjualan harian per produk.
+
+Deret penjualan harian semua produk diambil dengan satu query lalu disusun menjadi
+matriks (produk x hari). Dua model ringan dihitung sekaligus untuk semua baris:
+
+- seasonal naive mingguan: rata-rata hari yang sama dalam SEASONAL_WEEKS minggu terakhir
+- simple exponential smoothing (scipy.signal.lfilter), alpha dipilih per produk dari ALPHA_GRID
+
+Model per produk dipilih berdasarkan MAE pada HOLDOUT_DAYS hari terakhir, lalu dihitung
+ulang dengan seluruh riwayat. Hasil disimpan di cache per produk; versinya berganti
+setiap ada penjualan baru/berubah untuk produk tersebut.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from scipy.signal import lfilter
+
+from crud.cache_versions import (
+    bump_cache_version, bump_cache_version_on_commit, cache_version, cache_versions
+)
+from crud.models import ProdukTerjual
+
+VERSION_NAME = 'forecast'
+PRODUK_VERSION_NAME = 'forecast:{}'
+FORECAST_CACHE_TIMEOUT = 60 * 60 * 24
+
+SEASON = 7
+SEASONAL_WEEKS = 4
+HOLDOUT_DAYS = 28
+ALPHA_GRID = np.array([0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9])
+
+MODEL_SEASONAL_NAIVE = 'seasonal_naive'
+MODEL_SES = 'exponential_smoothing'
+
+
+def forecast_version():
+    return cache_version(VERSION_NAME)
+
+
+def invalidate_forecast():
+    """
+    Semua perkiraan kadaluarsa (setelah perubahan massal tanpa signal)
+    """
+    bump_cache_version(VERSION_NAME)
+
+
+def invalidate_forecast_produk(produk_id):
+    bump_cache_version(PRODUK_VERSION_NAME.format(produk_id))
+
+
+@receiver(post_save, sender=ProdukTerjual)
+@receiver(post_delete, sender=ProdukTerjual)
+def invalidate_forecast_on_sale(sender, instance, **kwargs):
+    bump_cache_version_on_commit(PRODUK_VERSION_NAME.format(instance.produk_id))
+
+
+def daily_series(produk_ids, sampai, riwayat):
+    """
+    Matriks jumlah terjual (len(produk_ids) x riwayat hari) yang berakhir pada tanggal sampai
+    """
+    mulai = sampai - timedelta(days=riwayat - 1)
+    index = {produk_id: i for i, produk_id in enumerate(produk_ids)}
+    rows = ProdukTerjual.objects.filter(
+        produk_id__in=produk_ids, tgl_penjualan__range=(mulai, sampai)
+    ).order_by().values_list('produk_id', 'tgl_penjualan').annotate(jumlah=Sum('jumlah_terjual'))
+
+    series = np.zeros((len(produk_ids), riwayat))
+    rows = list(rows)
+    if rows:
+        produk_idx = np.fromiter((index[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+        hari_idx = np.fromiter(((row[1] - mulai).days for row in rows), dtype=np.intp, count=len(rows))
+        jumlah = np.fromiter((row[2] for row in rows), dtype=float, count=len(rows))
+        np.add.at(series, (produk_idx, hari_idx), jumlah)
+    return series
+
+
+def seasonal_naive(series, hari):
+    """
+    Profil mingguan dari SEASONAL_WEEKS minggu terakhir, diulang sepanjang horizon.
+    Kolom pertama hasil adalah hari setelah kolom terakhir series.
+    """
+    weeks = min(SEASONAL_WEEKS, series.shape[1] // SEASON)
+    recent = series[:, series.shape[1] - weeks * SEASON:]
+    profile = recent.reshape(series.shape[0], weeks, SEASON).mean(axis=1)
+    return np.tile(profile, -(-hari // SEASON))[:, :hari]
+
+
+def exponential_smoothing(series):
+    """
+    Level akhir dan alpha terbaik per baris. Semua alpha di ALPHA_GRID dihitung dengan
+    lfilter (level_t = alpha*y_t + (1-alpha)*level_{t-1}) dan dipilih berdasarkan
+    galat kuadrat ramalan satu langkah.
+    """
+    initial = series[:, :SEASON].mean(axis=1, keepdims=True)
+    errors, levels = [], []
+    for alpha in ALPHA_GRID:
+        level = lfilter([alpha], [1, alpha - 1], series, axis=1, zi=(1 - alpha) * initial)[0]
+        # Ramalan untuk hari t adalah level hari t-1; minggu pertama dipakai sebagai pemanasan
+        errors.append(((series[:, SEASON:] - level[:, SEASON - 1:-1]) ** 2).sum(axis=1))
+        levels.append(level[:, -1])
+
+    best = np.argmin(np.array(errors), axis=0)
+    rows = np.arange(series.shape[0])
+    return np.array(levels)[best, rows], ALPHA_GRID[best]
+
+
+def fit_forecast(series, hari):
+    """
+    Perkiraan harian (produk x hari) beserta model, alpha dan MAE holdout per produk
+    """
+    train, test = series[:, :-HOLDOUT_DAYS], series[:, -HOLDOUT_DAYS:]
+    holdout_level, _ = exponential_smoothing(train)
+    mae_ses = np.abs(test - holdout_level[:, None]).mean(axis=1)
+    mae_naive = np.abs(test - seasonal_naive(train, HOLDOUT_DAYS)).mean(axis=1)
+    pakai_ses = mae_ses < mae_naive
+
+    level, alpha = exponential_smoothing(series)
+    forecast = np.where(pakai_ses[:, None], level[:, None], seasonal_naive(series, hari))
+    return forecast, pakai_ses, alpha, np.where(pakai_ses, mae_ses, mae_naive)
+
+
+def _cache_keys(produk_ids, sampai, riwayat, hari):
+    versions = cache_versions([VERSION_NAME] + [PRODUK_VERSION_NAME.format(pk) for pk in produk_ids])
+    return {
+        pk: f'forecast:{pk}:{versions[VERSION_NAME]}:{versions[PRODUK_VERSION_NAME.format(pk)]}:'
+            f'{sampai.isoformat()}:{riwayat}:{hari}'
+        for pk in produk_ids
+    }
+
+
+def forecast_produk(produk_ids, sampai, riwayat, hari):
+    """
+    dict produk_id -> perkiraan (model, alpha, mae, rata-rata historis, perkiraan harian).
+    Produk yang sudah ada di cache tidak dihitung ulang; sisanya dihitung bersama.
+    """
+    keys = _cache_keys(produk_ids, sampai, riwayat, hari)
+    cached = cache.get_many(list(keys.values()))
+    hasil = {pk: cached[key] for pk, key in keys.items() if key in cached}
+
+    pending = [pk for pk in produk_ids if pk not in hasil]
+    if pending:
+        series = daily_series(pending, sampai, riwayat)
+        forecast, pakai_ses, alpha, mae = fit_forecast(series, hari)
+        rata_rata = series[:, -HOLDOUT_DAYS:].mean(axis=1)
+
+        fresh = {}
+        for i, pk in enumerate(pending):
+            hasil[pk] = fresh[keys[pk]] = {
+                'model': MODEL_SES if pakai_ses[i] else MODEL_SEASONAL_NAIVE,
+                'alpha': round(float(alpha[i]), 2) if pakai_ses[i] else None,
+                'mae_holdout': round(float(mae[i]), 2),
+                'rata_rata_harian_4_minggu': round(float(rata_rata[i]), 2),
+                'perkiraan_harian': np.round(forecast[i], 2).tolist(),
+            }
+        cache.set_many(fresh, FORECAST_CACHE_TIMEOUT)
+    return hasil
+
+
+def ringkasan_stok(perkiraan_harian, stok):
+    """
+    Total perkiraan, hari ke berapa stok diperkirakan habis (None jika cukup) dan saran restok
+    """
+    harian = np.asarray(perkiraan_harian)
+    total = float(harian.sum())
+    kumulatif = np.cumsum(harian)
+    habis = np.nonzero(kumulatif >= stok)[0] if total > 0 else []
+    return {
+        'perkiraan_total': round(total, 2),
+        'hari_stok_habis': int(habis[0]) + 1 if len(habis) else None,
+        'saran_restok': int(np.ceil(max(total - stok, 0))),
+    }
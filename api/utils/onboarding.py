@@ -0,0 +1,304 @@
+# api/utils/onboarding.py
+"""
+Onboarding UMKM massal dari file CSV/XLSX.
+
+Semua baris divalidasi lebih dulu (serializer per baris, cek duplikat username/email
+dalam file dan database dengan satu query per kolom, nama kecamatan lewat map yang
+dimuat sekali). Password di-hash (di process pool hanya dari command onboarding_umkm,
+karena fork dari worker web yang multithread tidak aman), lalu user, profil dan lokasi
+UMKM dibuat dengan bulk_create dalam satu transaksi.
+
+bulk_create tidak mengirim signal, jadi cache yang terdampak diinvalidasi di sini.
+"""
+import csv
+import io
+import multiprocessing
+import os
+import secrets
+import uuid
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, connections, transaction
+from django.db.models.functions import Lower
+
+from api.serializers.onboarding_serializers import OnboardingUMKMRowSerializer
+from api.utils.umkm_cache import invalidate_umkm_list
+from crud.models import Kecamatan, LokasiUMKM, ProfilUMKM
+from crud.pagination.counting import bump_count_version
+from crud.peta import LAYER_UMKM, invalidate_peta
+from crud.search.autocomplete import invalidate_autocomplete
+from crud.spatial import grid_cell
+
+User = get_user_model()
+
+EKSTENSI_DIDUKUNG = ('.csv', '.xlsx')
+BATCH_SIZE = 1000
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+# Di bawah jumlah ini biaya fork pool lebih besar daripada hashing berurutan
+MIN_POOL_PASSWORDS = 50
+# Endpoint meng-hash password berurutan di dalam request (~0,3 detik per password),
+# file yang lebih besar diproses lewat command onboarding_umkm
+MAX_BARIS_API = 50
+
+
+class OnboardingError(Exception):
+    """
+    Kesalahan pada file secara keseluruhan (format, header), bukan per baris
+    """
+
+
+def _nama_kolom(value):
+    return str(value or '').strip().lower().replace(' ', '_')
+
+
+def _nilai(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        # Angka dari Excel (mis. nomor telepon) tanpa ".0"
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def _rows(header, records):
+    """
+    (nomor baris di file, dict kolom -> nilai) untuk setiap baris yang tidak kosong
+    """
+    columns = [_nama_kolom(name) for name in header]
+    if 'username' not in columns:
+        raise OnboardingError('Kolom "username" tidak ditemukan pada baris pertama file')
+
+    rows = []
+    for line, record in enumerate(records, start=2):
+        data = {}
+        for column, value in zip(columns, record):
+            value = _nilai(value)
+            if column and value is not None:
+                data[column] = value
+        if data:
+            rows.append((line, data))
+    return rows
+
+
+def baca_file(file, nama_file):
+    """
+    Membaca file onboarding (CSV dengan pemisah koma/titik koma, atau sheet pertama XLSX)
+    """
+    ext = os.path.splitext(nama_file)[1].lower()
+    if ext not in EKSTENSI_DIDUKUNG:
+        raise OnboardingError(f'Format file tidak didukung, gunakan {" atau ".join(EKSTENSI_DIDUKUNG)}')
+
+    if ext == '.xlsx':
+        from openpyxl import load_workbook
+
+        try:
+            workbook = load_workbook(file, read_only=True, data_only=True)
+        except Exception as e:
+            raise OnboardingError(f'File XLSX tidak dapat dibaca: {e}')
+        try:
+            records = workbook.active.iter_rows(values_only=True)
+            header = next(records, None)
+            if header is None:
+                raise OnboardingError('File kosong')
+            return _rows(header, records)
+        finally:
+            workbook.close()
+
+    try:
+        text = file.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise OnboardingError('File CSV harus berenkoding UTF-8')
+    try:
+        dialect = csv.Sniffer().sniff(text[:4096], delimiters=',;')
+    except csv.Error:
+        dialect = csv.excel
+    records = csv.reader(io.StringIO(text), dialect)
+    header = next(records, None)
+    if header is None:
+        raise OnboardingError('File kosong')
+    return _rows(header, records)
+
+
+def hash_passwords(passwords, workers=1):
+    """
+    make_password untuk setiap password. workers > 1 memakai process pool (fork), hanya untuk
+    proses tanpa thread lain seperti management command.
+    """
+    in_transaction = any(conn.in_atomic_block for conn in connections.all())
+    if (workers > 1 and len(passwords) >= MIN_POOL_PASSWORDS and not in_transaction
+            and 'fork' in multiprocessing.get_all_start_methods()):
+        # Koneksi induk tidak boleh dipakai bersama oleh proses anak
+        connections.close_all()
+        chunksize = max(1, len(passwords) // (workers * 4))
+        with multiprocessing.get_context('fork').Pool(workers) as pool:
+            return pool.map(make_password, passwords, chunksize=chunksize)
+    return [make_password(password) for password in passwords]
+
+
+def _kecamatan_map():
+    """
+    nama kecamatan (huruf kecil) -> list (nama kabupaten huruf kecil, id kecamatan)
+    """
+    kecamatan = defaultdict(list)
+    for pk, nama, kabupaten in Kecamatan.objects.values_list('pk', 'nm_kecamatan', 'kabupaten__nm_kabupaten'):
+        kecamatan[nama.strip().lower()].append((kabupaten.strip().lower(), pk))
+    return kecamatan
+
+
+def _resolve_kecamatan(kecamatan_map, data):
+    candidates = kecamatan_map.get(data['kecamatan'].lower(), [])
+    if 'kabupaten' in data:
+        candidates = [c for c in candidates if c[0] == data['kabupaten'].lower()]
+    if not candidates:
+        return None, 'Kecamatan tidak ditemukan.'
+    if len(candidates) > 1:
+        return None, 'Nama kecamatan ada di beberapa kabupaten, isi kolom kabupaten.'
+    return candidates[0][1], None
+
+
+def _validate(rows):
+    valid, errors = [], []
+    for line, raw in rows:
+        serializer = OnboardingUMKMRowSerializer(data=raw)
+        if serializer.is_valid():
+            valid.append((line, dict(serializer.validated_data)))
+        else:
+            errors.append({'baris': line, 'username': raw.get('username'), 'errors': serializer.errors})
+
+    usernames = Counter(data['username'] for _, data in valid)
+    emails = Counter(data['email'].lower() for _, data in valid if data['email'])
+    existing_usernames = set(
+        User.objects.filter(username__in=list(usernames)).values_list('username', flat=True)
+    )
+    existing_emails = set(
+        User.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=list(emails)).values_list('email_lower', flat=True)
+    )
+    kecamatan_map = _kecamatan_map() if any('kecamatan' in data for _, data in valid) else {}
+
+    checked = []
+    for line, data in valid:
+        row_errors = {}
+        if data['username'] in existing_usernames:
+            row_errors['username'] = ['Username ini sudah digunakan oleh user lain.']
+        elif usernames[data['username']] > 1:
+            row_errors['username'] = ['Username muncul lebih dari sekali di file.']
+
+        email = data['email'].lower()
+        if email in existing_emails:
+            row_errors['email'] = ['Email ini sudah digunakan oleh user lain.']
+        elif email and emails[email] > 1:
+            row_errors['email'] = ['Email muncul lebih dari sekali di file.']
+
+        if 'kecamatan' in data:
+            data['kecamatan_id'], error = _resolve_kecamatan(kecamatan_map, data)
+            if error:
+                row_errors['kecamatan'] = [error]
+
+        if row_errors:
+            errors.append({'baris': line, 'username': data['username'], 'errors': row_errors})
+        else:
+            checked.append((line, data))
+
+    errors.sort(key=lambda item: item['baris'])
+    return checked, errors
+
+
+def _invalidate(ada_lokasi, ada_nama_bisnis):
+    invalidate_umkm_list()
+    bump_count_version(User._meta.db_table)
+    bump_count_version(ProfilUMKM._meta.db_table)
+    if ada_lokasi:
+        bump_count_version(LokasiUMKM._meta.db_table)
+        invalidate_peta(LAYER_UMKM)
+    if ada_nama_bisnis:
+        invalidate_autocomplete()
+
+
+def onboard_umkm(rows, simpan_sebagian=False, cek=False, workers=1):
+    """
+    Membuat user UMKM beserta profil (dan lokasi jika diisi) dari baris hasil baca_file.
+
+    Tanpa simpan_sebagian, satu baris bermasalah membatalkan seluruh file.
+    cek=True hanya memvalidasi. Mengembalikan ringkasan beserta error per baris.
+    """
+    valid, errors = _validate(rows)
+    hasil = {
+        'total_baris': len(rows),
+        'valid': len(valid),
+        'dibuat': 0,
+        'errors': errors,
+        'users': [],
+    }
+    if cek or not valid or (errors and not simpan_sebagian):
+        return hasil
+
+    passwords, generated = [], []
+    for _, data in valid:
+        password = data.get('password')
+        generated.append(password is None)
+        passwords.append(password or secrets.token_urlsafe(9))
+    hashed = hash_passwords(passwords, workers=workers)
+
+    users, profiles, lokasi = [], [], []
+    for (line, data), password, password_hash in zip(valid, passwords, hashed):
+        user = User(
+            id=uuid.uuid4(),
+            username=data['username'],
+            email=data['email'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            role='umkm',
+            is_active=True,
+            password=password_hash,
+            show_password=password,
+        )
+        users.append(user)
+        profiles.append(ProfilUMKM(
+            user_id=user.id,
+            nm_bisnis=data.get('nm_bisnis'),
+            alamat=data.get('alamat'),
+            tlp=data.get('tlp'),
+            desc_bisnis=data.get('desc_bisnis'),
+            total_laki=data['total_laki'],
+            total_perempuan=data['total_perempuan'],
+        ))
+        if 'kecamatan_id' in data:
+            lokasi.append(LokasiUMKM(
+                pengguna_id=user.id,
+                latitude=data['latitude'],
+                longitude=data['longitude'],
+                grid_cell=grid_cell(data['latitude'], data['longitude']),
+                alamat_lengkap=data.get('alamat_lengkap') or data.get('alamat') or '',
+                kecamatan_id=data['kecamatan_id'],
+                kode_pos=data.get('kode_pos'),
+            ))
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+            ProfilUMKM.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
+            LokasiUMKM.objects.bulk_create(lokasi, batch_size=BATCH_SIZE)
+    except IntegrityError:
+        # Username/email yang sama dibuat oleh request lain setelah validasi
+        raise OnboardingError('Sebagian username sudah dibuat oleh proses lain, unggah ulang file')
+
+    transaction.on_commit(lambda: _invalidate(
+        bool(lokasi), any(profile.nm_bisnis for profile in profiles)
+    ))
+
+    hasil['dibuat'] = len(users)
+    hasil['users'] = [
+        {
+            'baris': line,
+            'id': user.id,
+            'username': user.username,
+            # Password acak perlu diteruskan ke pemilik UMKM
+            **({'password': password} if is_generated else {}),
+        }
+        for (line, _), user, password, is_generated in zip(valid, users, passwords, generated)
+    ]
+    return hasil
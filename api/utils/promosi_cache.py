@@ -0,0 +1,103 @@
+# api/utils/promosi_cache.py
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from crud.cache_versions import bump_cache_version, bump_cache_version_on_commit, cache_version
+from crud.models import KategoriProduk, Produk, ProdukTerjual, ProfilUMKM
+
+VERSION_NAME = 'promosi_landing'
+# Blok dibangun ulang paling lambat setelah sekian detik walau tidak ada perubahan data
+# (mis. produk yang keluar dari rentang "30 hari terakhir")
+LANDING_CACHE_TIMEOUT = 600
+# Lama browser/CDN boleh memakai respons tanpa revalidasi
+LANDING_MAX_AGE = 60
+
+
+def landing_version():
+    return cache_version(VERSION_NAME)
+
+
+def invalidate_landing_blocks():
+    """
+    Menandai semua blok landing promosi kadaluarsa, dibangun ulang pada request berikutnya
+    """
+    bump_cache_version(VERSION_NAME)
+
+
+@receiver(post_save, sender=Produk)
+@receiver(post_delete, sender=Produk)
+@receiver(post_save, sender=KategoriProduk)
+@receiver(post_delete, sender=KategoriProduk)
+@receiver(post_save, sender=ProfilUMKM)
+@receiver(post_delete, sender=ProfilUMKM)
+# Penjualan mengubah stok produk (crud/inventory.py) lewat update() tanpa signal Produk
+@receiver(post_save, sender=ProdukTerjual)
+@receiver(post_delete, sender=ProdukTerjual)
+def invalidate_landing_on_write(sender, **kwargs):
+    bump_cache_version_on_commit(VERSION_NAME)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_landing_on_user_write(sender, update_fields=None, **kwargs):
+    # Login hanya menyimpan last_login, tidak mengubah isi blok
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_cache_version_on_commit(VERSION_NAME)
+
+
+def _block_cache_key(name, request, params):
+    # URL gambar absolut bergantung pada host; hanya parameter yang dibaca blok ikut kunci,
+    # agar query string lain (mis. cache buster) tidak memecah cache
+    values = [(param, request.query_params.getlist(param)) for param in sorted(params)]
+    key_string = f"{landing_version()}:{name}:{request.build_absolute_uri('/')}:{values}"
+    return 'promosi_landing:' + hashlib.md5(key_string.encode()).hexdigest()
+
+
+def get_landing_block(name, request, build, params=()):
+    """
+    Blok landing dari cache, atau hasil build() yang langsung disimpan beserta ETag-nya.
+    `params` adalah parameter query string yang memengaruhi isi blok.
+    """
+    cache_key = _block_cache_key(name, request, params)
+    block = cache.get(cache_key)
+    if block is None:
+        content = json.dumps(build(), cls=JSONEncoder)
+        block = {
+            'data': json.loads(content),
+            'etag': '"%s"' % hashlib.md5(content.encode()).hexdigest(),
+            'dibuat': timezone.now(),
+        }
+        cache.set(cache_key, block, LANDING_CACHE_TIMEOUT)
+    return block
+
+
+def landing_response(request, block, message):
+    """
+    Response blok landing dengan ETag/Cache-Control, 304 jika klien sudah punya versi yang sama
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    etags = parse_etags(if_none_match) if if_none_match else []
+    if block['etag'] in etags or '*' in etags:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response({
+            'status': 'success',
+            'message': message,
+            'data': block['data']
+        })
+
+    response['ETag'] = block['etag']
+    response['Last-Modified'] = http_date(block['dibuat'].timestamp())
+    response['Cache-Control'] = f'public, max-age={LANDING_MAX_AGE}'
+    return response
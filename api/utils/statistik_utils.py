@@ -6,7 +6,35 @@ from datetime import datetime, date
 from calendar import monthrange
 import calendar
 
-from crud.models import ProdukTerjual, Produk, LokasiPenjualan
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from crud.cache_versions import bump_cache_version, bump_cache_version_on_commit, cache_version
+from crud.models import ProdukTerjual, Produk, LokasiPenjualan, Provinsi, Kabupaten, Kecamatan
+from crud.regions import get_region_cache, tipe_kabupaten
+
+WILAYAH_VERSION_NAME = 'statistik_wilayah'
+WILAYAH_CACHE_TIMEOUT = 60 * 60
+
+
+def statistik_wilayah_version():
+    return cache_version(WILAYAH_VERSION_NAME)
+
+
+def invalidate_statistik_wilayah():
+    bump_cache_version(WILAYAH_VERSION_NAME)
+
+
+# Penjualan, biaya produk, kecamatan lokasi dan nama wilayah semuanya ikut dalam agregat per wilayah
+@receiver(post_save, sender=ProdukTerjual)
+@receiver(post_delete, sender=ProdukTerjual)
+@receiver(post_save, sender=Produk)
+@receiver(post_save, sender=LokasiPenjualan)
+@receiver(post_save, sender=Provinsi)
+@receiver(post_save, sender=Kabupaten)
+@receiver(post_save, sender=Kecamatan)
+def invalidate_statistik_wilayah_on_write(sender, **kwargs):
+    bump_cache_version_on_commit(WILAYAH_VERSION_NAME)
 
 
 class StatistikCalculator:
@@ -15,11 +43,11 @@ class StatistikCalculator:
     Pengeluaran dihitung dari biaya_upah + biaya_produksi * jumlah_terjual
     """
 
-    def __init__(self, user):
+    def __init__(self, user, semua_umkm=False):
         self.user = user
-        self.base_queryset = ProdukTerjual.objects.filter(
-            produk__umkm=user
-        ).select_related('produk', 'lokasi_penjualan')
+        self.base_queryset = ProdukTerjual.objects.select_related('produk', 'lokasi_penjualan')
+        if not semua_umkm:
+            self.base_queryset = self.base_queryset.filter(produk__umkm=user)
 
     def get_periode_filter(self, params):
         """
@@ -198,6 +226,109 @@ class StatistikCalculator:
 
         return result
 
+    def get_statistik_per_wilayah(self, queryset):
+        """
+        Statistik per kecamatan yang digulung ke kabupaten dan provinsi.
+
+        Penjualan dikelompokkan sekali per (kecamatan, UMKM); hierarki wilayah diambil
+        dari cache wilayah, jadi jumlah query tidak bergantung pada banyaknya lokasi.
+        UMKM aktif = UMKM yang punya penjualan di wilayah tersebut pada periode ini.
+        """
+        grouped = queryset.order_by().values(
+            'lokasi_penjualan__kecamatan_id',
+            'produk__umkm_id'
+        ).annotate(
+            total_transaksi=Count('id'),
+            total_produk_terjual=Coalesce(Sum('jumlah_terjual'), 0),
+            total_pemasukan=Coalesce(Sum('total_penjualan'), 0),
+            total_pengeluaran=Coalesce(
+                Sum(F('jumlah_terjual') * (
+                    Coalesce('produk__biaya_upah', 0) + Coalesce('produk__biaya_produksi', 0)
+                )),
+                0
+            )
+        )
+
+        stat_fields = ('total_transaksi', 'total_produk_terjual', 'total_pemasukan', 'total_pengeluaran')
+
+        def new_node(**info):
+            node = dict(info, umkm=set())
+            node.update((field, 0) for field in stat_fields)
+            return node
+
+        def add(node, row):
+            for field in stat_fields:
+                node[field] += row[field]
+            node['umkm'].add(row['produk__umkm_id'])
+
+        regions = get_region_cache()
+        ringkasan = new_node()
+        tanpa_wilayah = new_node()
+        provinsi_nodes, kabupaten_nodes, kecamatan_nodes = {}, {}, {}
+
+        for row in grouped:
+            add(ringkasan, row)
+            kecamatan, kabupaten, provinsi = regions.hierarchy(row['lokasi_penjualan__kecamatan_id'])
+            if provinsi is None:
+                add(tanpa_wilayah, row)
+                continue
+
+            if provinsi.id not in provinsi_nodes:
+                provinsi_nodes[provinsi.id] = new_node(
+                    id=provinsi.id, nm_provinsi=provinsi.nm_provinsi, kabupaten={})
+            provinsi_node = provinsi_nodes[provinsi.id]
+
+            if kabupaten.id not in kabupaten_nodes:
+                kabupaten_nodes[kabupaten.id] = new_node(
+                    id=kabupaten.id, nm_kabupaten=kabupaten.nm_kabupaten,
+                    tipe=tipe_kabupaten(kabupaten), kecamatan={})
+                provinsi_node['kabupaten'][kabupaten.id] = kabupaten_nodes[kabupaten.id]
+            kabupaten_node = kabupaten_nodes[kabupaten.id]
+
+            if kecamatan.id not in kecamatan_nodes:
+                kecamatan_nodes[kecamatan.id] = new_node(id=kecamatan.id, nm_kecamatan=kecamatan.nm_kecamatan)
+                kabupaten_node['kecamatan'][kecamatan.id] = kecamatan_nodes[kecamatan.id]
+
+            for node in (provinsi_node, kabupaten_node, kecamatan_nodes[kecamatan.id]):
+                add(node, row)
+
+        def finish(node, children=None):
+            total_pemasukan = Decimal(str(node['total_pemasukan']))
+            total_pengeluaran = Decimal(str(node['total_pengeluaran']))
+            keuntungan_bersih = total_pemasukan - total_pengeluaran
+
+            margin_keuntungan = None
+            if total_pemasukan > 0:
+                margin_keuntungan = (keuntungan_bersih / total_pemasukan * 100).quantize(Decimal('0.01'))
+
+            node.update({
+                'total_pemasukan': total_pemasukan,
+                'total_pengeluaran': total_pengeluaran,
+                'keuntungan_bersih': keuntungan_bersih,
+                'margin_keuntungan': margin_keuntungan,
+                'jumlah_umkm_aktif': len(node.pop('umkm')),
+            })
+            if children:
+                node[children] = sorted(
+                    node[children].values(), key=lambda child: child['total_pemasukan'], reverse=True
+                )
+            return node
+
+        for node in kecamatan_nodes.values():
+            finish(node)
+        for node in kabupaten_nodes.values():
+            finish(node, 'kecamatan')
+        for node in provinsi_nodes.values():
+            finish(node, 'kabupaten')
+
+        return {
+            'ringkasan': finish(ringkasan),
+            'tanpa_wilayah': finish(tanpa_wilayah),
+            'provinsi': sorted(
+                provinsi_nodes.values(), key=lambda node: node['total_pemasukan'], reverse=True
+            ),
+        }
+
     def get_statistik_per_produk(self, queryset):
         """
         Menghitung statistik per produk dengan semua field sebagai DecimalField
@@ -0,0 +1,50 @@
+# api/utils/umkm_cache.py
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from crud.cache_versions import bump_cache_version, bump_cache_version_on_commit, cache_version
+from crud.models import LokasiPenjualan, Produk, ProfilUMKM
+
+VERSION_NAME = 'umkm_list'
+UMKM_LIST_CACHE_TIMEOUT = 60 * 60
+
+
+def umkm_list_version():
+    return cache_version(VERSION_NAME)
+
+
+def invalidate_umkm_list():
+    bump_cache_version(VERSION_NAME)
+
+
+@receiver(post_save, sender=ProfilUMKM)
+@receiver(post_delete, sender=ProfilUMKM)
+@receiver(post_save, sender=Produk)
+@receiver(post_delete, sender=Produk)
+@receiver(post_save, sender=LokasiPenjualan)
+@receiver(post_delete, sender=LokasiPenjualan)
+def invalidate_umkm_list_on_write(sender, **kwargs):
+    bump_cache_version_on_commit(VERSION_NAME)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_umkm_list_on_user_write(sender, update_fields=None, **kwargs):
+    # Login hanya menyimpan last_login
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    bump_cache_version_on_commit(VERSION_NAME)
+
+
+def get_umkm_list(build):
+    """
+    Data dropdown UMKM (sama untuk semua pengguna) dari cache, atau hasil build()
+    """
+    cache_key = f'umkm_list:{umkm_list_version()}'
+    data = cache.get(cache_key)
+    if data is None:
+        data = build()
+        cache.set(cache_key, data, UMKM_LIST_CACHE_TIMEOUT)
+    return data
@@ -8,6 +8,7 @@ from django.db.models.functions import Extract, Coalesce
 from django.contrib.auth import get_user_model
 from datetime import datetime
 from crud.models import ProdukTerjual, ProfilUMKM, LokasiPenjualan, Produk
+from api.utils.umkm_cache import get_umkm_list
 from api.serializers.grafik_serializers import (
     GrafikPenjualanSerializer,
     GrafikPenjualanUMKMSerializer,
@@ -481,30 +482,21 @@ def list_umkm_view(request):
     """
     Endpoint untuk mendapatkan list UMKM untuk dropdown dengan statistik
     """
-    # Filter user berdasarkan role jika field tersebut ada
-    try:
-        umkm_users = User.objects.filter(
-            role='umkm'
-        ).select_related('profil_umkm').annotate(
-            jumlah_lokasi=Count('lokasi_penjualan', distinct=True),
-            jumlah_produk=Count('produk', distinct=True)
-        ).order_by('username')
-    except:
-        umkm_users = User.objects.filter(
-            profil_umkm__isnull=False
-        ).select_related('profil_umkm').annotate(
-            jumlah_lokasi=Count('lokasi_penjualan', distinct=True),
-            jumlah_produk=Count('produk', distinct=True)
-        ).order_by('username')
-
-    serializer = UMKMListSerializer(umkm_users, many=True)
-
     return Response({
         'status': 'success',
-        'data': serializer.data
+        'data': get_umkm_list(_build_umkm_list)
     })
 
 
+def _build_umkm_list():
+    # jumlah_lokasi dan jumlah_produk adalah kolom penghitung di User (crud/counters.py)
+    umkm_users = User.objects.filter(
+        role='umkm'
+    ).select_related('profil_umkm').order_by('username')
+
+    return UMKMListSerializer(umkm_users, many=True).data
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_lokasi_penjualan_view(request):
@@ -0,0 +1,42 @@
+# api/views/instrumentasi_view.py
+import os
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from thobias.instrumentasi import HISTOGRAM_WINDOW, histograms
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAdminUser])
+def instrumentasi_view(request):
+    """
+    Histogram waktu request per endpoint dari InstrumentasiMiddleware (khusus staff).
+    Data milik proses/worker yang melayani request ini. DELETE mengosongkan histogram.
+    """
+    if not settings.INSTRUMENTASI_REQUEST:
+        return Response({
+            'status': 'error',
+            'message': 'Instrumentasi request tidak aktif (set INSTRUMENTASI_REQUEST=1)'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'DELETE':
+        histograms.reset()
+        return Response({
+            'status': 'success',
+            'message': 'Histogram instrumentasi dikosongkan'
+        })
+
+    return Response({
+        'status': 'success',
+        'message': 'Berhasil mendapatkan histogram instrumentasi',
+        'data': {
+            'pid': os.getpid(),
+            'jendela': HISTOGRAM_WINDOW,
+            'batas_lambat_ms': settings.INSTRUMENTASI_SLOW_MS,
+            'endpoint': histograms.snapshot(),
+        }
+    })
@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions, filters
 from api.serializers import KabupatenSerializer
 from crud.models import Kabupaten
+from crud.views.mixins import SerializerRelationsMixin
 
 
-class KabupatenViewSet(viewsets.ReadOnlyModelViewSet):
+class KabupatenViewSet(SerializerRelationsMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint untuk melihat data kabupaten.
     Read-only: Hanya mengizinkan operasi GET.
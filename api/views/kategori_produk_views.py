@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions
 from api.serializers import KategoriProdukSerializer
 from crud.models import KategoriProduk
+from crud.views.mixins import SerializerRelationsMixin
 
 
-class KategoriProdukViewSet(viewsets.ReadOnlyModelViewSet):
+class KategoriProdukViewSet(SerializerRelationsMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint untuk melihat data kategori produk.
     Read-only: Hanya mengizinkan operasi GET.
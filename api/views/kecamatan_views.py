@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions
 from api.serializers import KecamatanSerializer
 from crud.models import Kecamatan
+from crud.views.mixins import SerializerRelationsMixin
 
 
-class KecamatanViewSet(viewsets.ReadOnlyModelViewSet):
+class KecamatanViewSet(SerializerRelationsMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint untuk melihat data kecamatan.
     Read-only: Hanya mengizinkan operasi GET.
@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions
 from api.serializers import LokasiPenjualanSerializer
 from crud.models import LokasiPenjualan
+from crud.views.mixins import ConditionalGetMixin, SerializerRelationsMixin
 
 
-class LokasiPenjualanViewSet(viewsets.ReadOnlyModelViewSet):
+class LokasiPenjualanViewSet(ConditionalGetMixin, SerializerRelationsMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint untuk melihat data lokasi penjualan.
     Read-only: Hanya mengizinkan operasi GET.
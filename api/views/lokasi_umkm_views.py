@@ -1,9 +1,10 @@
 from rest_framework import viewsets, permissions
 from api.serializers import LokasiUMKMSerializer
 from crud.models import LokasiUMKM
+from crud.views.mixins import ConditionalGetMixin, SerializerRelationsMixin
 
 
-class LokasiUMKMViewSet(viewsets.ReadOnlyModelViewSet):
+class LokasiUMKMViewSet(ConditionalGetMixin, SerializerRelationsMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint untuk melihat data lokasi UMKM.
     Read-only: Hanya mengizinkan operasi GET.
@@ -0,0 +1,75 @@
+# api/views/onboarding_view.py
+from rest_framework import status
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+
+from authentication.permissions import IsAdmin
+from api.utils.onboarding import MAX_BARIS_API, OnboardingError, baca_file, onboard_umkm
+
+TRUE_VALUES = ('1', 'true', 'ya')
+
+
+@api_view(['POST'])
+@permission_classes([IsAdmin])
+@parser_classes([MultiPartParser, FormParser])
+def onboarding_umkm_view(request):
+    """
+    Onboarding UMKM massal dari file CSV/XLSX (field "file").
+
+    Kolom wajib: username. Kolom opsional: email, password (acak jika kosong), first_name,
+    last_name, nm_bisnis, alamat, tlp, desc_bisnis, total_laki, total_perempuan, dan
+    lokasi UMKM: kecamatan, kabupaten, latitude, longitude, alamat_lengkap, kode_pos.
+
+    Parameter form: cek=1 hanya memvalidasi, simpan_sebagian=1 tetap menyimpan baris
+    yang valid walaupun ada baris bermasalah.
+
+    Penyimpanan dibatasi MAX_BARIS_API baris per file karena password di-hash di dalam
+    request; file yang lebih besar diproses dengan command onboarding_umkm.
+    """
+    file = request.FILES.get('file')
+    if file is None:
+        return Response({
+            'status': 'error',
+            'message': 'File onboarding diperlukan',
+            'errors': {'file': ['Field ini diperlukan.']}
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    cek = str(request.data.get('cek', '')).lower() in TRUE_VALUES
+    simpan_sebagian = str(request.data.get('simpan_sebagian', '')).lower() in TRUE_VALUES
+
+    try:
+        rows = baca_file(file, file.name)
+        if not cek and len(rows) > MAX_BARIS_API:
+            raise OnboardingError(
+                f'Maksimal {MAX_BARIS_API} baris per file, file ini berisi {len(rows)} baris. '
+                f'Bagi file atau jalankan command onboarding_umkm.'
+            )
+        hasil = onboard_umkm(rows, simpan_sebagian=simpan_sebagian, cek=cek)
+    except OnboardingError as e:
+        return Response({
+            'status': 'error',
+            'message': str(e),
+            'errors': {'file': [str(e)]}
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    if cek:
+        return Response({
+            'status': 'success' if not hasil['errors'] else 'error',
+            'message': f"{hasil['valid']} dari {hasil['total_baris']} baris valid",
+            'data': hasil
+        })
+
+    if not hasil['dibuat']:
+        return Response({
+            'status': 'error',
+            'message': 'Tidak ada UMKM yang dibuat, perbaiki baris yang bermasalah',
+            'data': hasil,
+            'errors': {'baris': hasil['errors']}
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'status': 'partial_success' if hasil['errors'] else 'success',
+        'message': f"Berhasil membuat {hasil['dibuat']} UMKM dari {hasil['total_baris']} baris",
+        'data': hasil
+    }, status=status.HTTP_201_CREATED)
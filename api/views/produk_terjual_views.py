@@ -2,9 +2,10 @@ from rest_framework import viewsets, permissions
 from django.db.models import Sum
 from api.serializers import ProdukTerjualSerializer
 from crud.models import ProdukTerjual
+from crud.views.mixins import ConditionalGetMixin, SerializerRelationsMixin
 
 
-class ProdukTerjualViewSet(viewsets.ReadOnlyModelViewSet):
+class ProdukTerjualViewSet(ConditionalGetMixin, SerializerRelationsMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint untuk melihat data produk terjual.
     Read-only: Hanya mengizinkan operasi GET.
@@ -15,6 +16,7 @@ class ProdukTerjualViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['produk__nm_produk', 'lokasi_penjualan__nm_lokasi', 'catatan']
     ordering_fields = ['tgl_penjualan', 'jumlah_terjual', 'total_penjualan']
     ordering = ['-tgl_penjualan']
+    conditional_fields = ('tgl_update', 'produk__tgl_update', 'lokasi_penjualan__tgl_update')
 
     def get_queryset(self):
         """
@@ -1,20 +1,24 @@
 from rest_framework import viewsets, permissions
+from django_filters.rest_framework import DjangoFilterBackend
 from api.serializers import ProdukSerializer
 from crud.models import Produk
+from crud.search import ProdukSearchFilter
+from crud.views.mixins import ConditionalGetMixin, SerializerRelationsMixin
 
 
-class ProdukViewSet(viewsets.ReadOnlyModelViewSet):
+class ProdukViewSet(ConditionalGetMixin, SerializerRelationsMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint untuk melihat data produk.
     Read-only: Hanya mengizinkan operasi GET.
     """
     queryset = Produk.objects.all()
     serializer_class = ProdukSerializer
+    filter_backends = [DjangoFilterBackend, ProdukSearchFilter]
     filterset_fields = ['umkm', 'kategori', 'nm_produk', 'aktif']
-    search_fields = ['nm_produk', 'desc', 'bahan_baku', 'metode_produksi',
-                     'umkm__username', 'kategori__nm_kategori']
     ordering_fields = ['nm_produk', 'harga', 'tgl_dibuat', 'tgl_update']
     ordering = ['-tgl_update']
+    # UMKM, kategori dan nama bisnis ikut ditampilkan
+    conditional_fields = ('tgl_update', 'kategori__tgl_update', 'umkm__tgl_update', 'umkm__profil_umkm__tgl_update')
 
     def get_queryset(self):
         """
@@ -0,0 +1,53 @@
+# api/views/profil_view.py
+from django.conf import settings
+from django.http import FileResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from thobias.profiling import daftar_profil, file_profil
+
+
+def _nonaktif():
+    return Response({
+        'status': 'error',
+        'message': 'Profil request tidak aktif (set PROFIL_REQUEST=1)'
+    }, status=status.HTTP_404_NOT_FOUND)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def list_profil_view(request):
+    """
+    Daftar profil request yang tersimpan (terbaru lebih dulu), khusus staff
+    """
+    if not settings.PROFIL_REQUEST:
+        return _nonaktif()
+
+    return Response({
+        'status': 'success',
+        'message': 'Berhasil mendapatkan daftar profil',
+        'data': daftar_profil()
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def download_profil_view(request, profil_id):
+    """
+    Mengunduh file profil: .prof (cProfile, buka dengan pstats/snakeviz)
+    atau .folded (sampling, buka dengan speedscope/flamegraph.pl)
+    """
+    if not settings.PROFIL_REQUEST:
+        return _nonaktif()
+
+    found = file_profil(profil_id)
+    if found is None:
+        return Response({
+            'status': 'error',
+            'message': 'Profil tidak ditemukan'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    path, meta = found
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=meta['file'])
@@ -4,15 +4,15 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from django.db.models import Q, Count
+from django.db.models import F, Q, OuterRef, Subquery
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework.pagination import PageNumberPagination
 
-from crud.models import Produk, KategoriProduk, ProfilUMKM
+from crud.models import KatalogProduk, Produk, KategoriProduk, ProfilUMKM
 from authentication.models import User
 from api.serializers.promosi_serializers import (
-    ProdukPromosiSerializer,
+    KatalogPromosiSerializer,
     KategoriStatistikSerializer,
     PromosiStatsSerializer
 )
@@ -20,6 +20,8 @@ from api.serializers.promosi_serializers import (
 # Import LaravelStylePagination dari kategori_produk_view.py
 # Asumsi ini didefinisikan di crud/pagination.py atau serupa, jadi import sesuai
 from crud.pagination import LaravelStylePagination  # Sesuaikan path import jika diperlukan
+from crud.search import get_autocomplete_index, get_search_backend
+from api.utils.promosi_cache import get_landing_block, landing_response
 import uuid
 
 class PromosePagination(PageNumberPagination):
@@ -35,13 +37,16 @@ class PromosePagination(PageNumberPagination):
 class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet khusus untuk halaman promosi produk UMKM
-    Read-only karena ini untuk public display
+    Read-only karena ini untuk public display.
+    Membaca read model KatalogProduk (satu tabel, diperbarui lewat signal di crud.katalog)
     """
-    queryset = Produk.objects.all()
-    serializer_class = ProdukPromosiSerializer
+    queryset = KatalogProduk.objects.all()
+    serializer_class = KatalogPromosiSerializer
     # Ganti ke LaravelStylePagination seperti di kategori_produk_view.py
     pagination_class = LaravelStylePagination
     permission_classes = [AllowAny]
+    # Parameter filter get_queryset; blok landing featured/popular memakai urutannya sendiri
+    filter_params = ('kategori', 'umkm_id', 'min_harga', 'max_harga', 'stok_tersedia', 'search')
 
     def get_queryset(self):
         """
@@ -49,11 +54,8 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
         """
         queryset = super().get_queryset()
 
-        # Filter produk aktif
-        queryset = queryset.filter(aktif=True)
-
-        # Optimasi query dengan select_related
-        queryset = queryset.select_related('kategori', 'umkm')
+        # Filter produk aktif milik user aktif
+        queryset = queryset.filter(aktif=True, umkm_aktif=True)
 
         # Filter berdasarkan parameter query
         kategori = self.request.query_params.get('kategori')
@@ -67,7 +69,7 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
             try:
                 # Konversi ke UUID untuk menghindari masalah filter pada UUIDField
                 kategori_uuid = uuid.UUID(kategori)
-                queryset = queryset.filter(kategori__id=kategori_uuid)
+                queryset = queryset.filter(kategori_id=kategori_uuid)
             except (ValueError, TypeError):
                 # Jika bukan UUID valid, skip filter atau bisa raise error jika diinginkan
                 pass
@@ -75,7 +77,7 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
         if umkm_id:
             try:
                 umkm_uuid = uuid.UUID(umkm_id)
-                queryset = queryset.filter(umkm__id=umkm_uuid)
+                queryset = queryset.filter(umkm_id=umkm_uuid)
             except (ValueError, TypeError):
                 pass
 
@@ -94,27 +96,20 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
         if stok_tersedia and stok_tersedia.lower() in ['true', '1', 'yes']:
             queryset = queryset.filter(stok__gt=0)
 
-        # Search functionality
-        if search:
-            queryset = queryset.filter(
-                Q(nm_produk__icontains=search) |
-                Q(desc__icontains=search) |
-                Q(umkm__username__icontains=search) |
-                Q(kategori__nm_kategori__icontains=search)
-            )
+        # Search functionality (inverted index, lihat crud.search)
+        if search and search.strip():
+            hasil = get_search_backend().search(Produk.objects.all(), search)
+            skor = hasil.filter(pk=OuterRef('pk')).values('skor_pencarian')[:1]
+            queryset = queryset.filter(pk__in=hasil.values('pk')).annotate(skor_pencarian=Subquery(skor))
 
-        # Filter user aktif jika field exists
-        try:
-            queryset = queryset.filter(umkm__is_active=True)
-        except Exception:
-            pass
-
-        # Ordering
+        # Ordering, hasil pencarian default diurutkan berdasarkan relevansi
         ordering = self.request.query_params.get('ordering', '-tgl_update')
         valid_orderings = ['nm_produk', '-nm_produk', 'harga', '-harga',
                            'tgl_dibuat', '-tgl_dibuat', 'tgl_update', '-tgl_update',
                            'stok', '-stok']
-        if ordering in valid_orderings:
+        if search and search.strip() and 'ordering' not in self.request.query_params:
+            queryset = queryset.order_by('-skor_pencarian', '-tgl_update')
+        elif ordering in valid_orderings:
             queryset = queryset.order_by(ordering)
         else:
             queryset = queryset.order_by('-tgl_update', '-tgl_dibuat')
@@ -162,20 +157,16 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
         Endpoint untuk mendapatkan daftar kategori dengan statistik
         GET /api/promosi/categories/
         """
-        try:
+        def build():
             categories = KategoriProduk.objects.annotate(
-                jumlah_produk=Count(
-                    'produk',
-                    filter=Q(produk__aktif=True)
-                )
+                jumlah_produk=F('jumlah_produk_aktif')
             ).filter(jumlah_produk__gt=0).order_by('nm_kategori')
 
-            serializer = KategoriStatistikSerializer(categories, many=True)
-            return Response({
-                'status': 'success',
-                'message': 'Berhasil mendapatkan daftar kategori',
-                'data': serializer.data
-            })
+            return KategoriStatistikSerializer(categories, many=True).data
+
+        try:
+            block = get_landing_block('categories', request, build)
+            return landing_response(request, block, 'Berhasil mendapatkan daftar kategori')
         except Exception as e:
             return Response(
                 {'error': f'Gagal memuat kategori: {str(e)}'},
@@ -188,18 +179,17 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
         Endpoint untuk produk unggulan/featured
         GET /api/promosi/featured/
         """
-        try:
+        def build():
             featured_products = self.get_queryset().filter(
                 stok__gt=0,
                 tgl_dibuat__gte=timezone.now() - timedelta(days=30)
             ).order_by('-tgl_dibuat')[:8]
 
-            serializer = self.get_serializer(featured_products, many=True)
-            return Response({
-                'status': 'success',
-                'message': 'Berhasil mendapatkan produk unggulan',
-                'data': serializer.data
-            })
+            return self.get_serializer(featured_products, many=True).data
+
+        try:
+            block = get_landing_block('featured', request, build, self.filter_params)
+            return landing_response(request, block, 'Berhasil mendapatkan produk unggulan')
         except Exception as e:
             return Response(
                 {'error': f'Gagal memuat produk unggulan: {str(e)}'},
@@ -212,44 +202,43 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
         Endpoint untuk statistik promosi
         GET /api/promosi/stats/
         """
-        try:
+        def build():
+            sebulan_lalu = timezone.now() - timedelta(days=30)
             total_produk = Produk.objects.filter(aktif=True).count()
 
-            try:
-                total_umkm = User.objects.filter(
-                    is_active=True,
-                    produk__aktif=True
-                ).distinct().count()
-            except:
-                total_umkm = User.objects.filter(
-                    produk__aktif=True
-                ).distinct().count()
-
-            total_kategori = KategoriProduk.objects.annotate(
-                produk_count=Count(
-                    'produk',
-                    filter=Q(produk__aktif=True)
-                )
-            ).filter(produk_count__gt=0).count()
+            # Kolom penghitung jumlah_produk_aktif (crud/counters.py), tanpa JOIN ke produk
+            total_umkm = User.objects.filter(
+                is_active=True,
+                jumlah_produk_aktif__gt=0
+            ).count()
+
+            total_kategori = KategoriProduk.objects.filter(jumlah_produk_aktif__gt=0).count()
 
             produk_terbaru = Produk.objects.filter(
                 aktif=True,
-                tgl_dibuat__gte=timezone.now() - timedelta(days=30)
+                tgl_dibuat__gte=sebulan_lalu
             ).count()
 
+            # UMKM yang menambah atau memperbarui produk aktif dalam 30 hari terakhir
+            umkm_aktif = Produk.objects.filter(
+                aktif=True,
+                umkm__is_active=True,
+                tgl_update__gte=sebulan_lalu
+            ).values('umkm').distinct().count()
+
             stats_data = {
                 'total_produk': total_produk,
                 'total_umkm': total_umkm,
                 'total_kategori': total_kategori,
                 'produk_terbaru': produk_terbaru,
+                'umkm_aktif': umkm_aktif,
             }
 
-            serializer = PromosiStatsSerializer(stats_data)
-            return Response({
-                'status': 'success',
-                'message': 'Berhasil mendapatkan statistik promosi',
-                'data': serializer.data
-            })
+            return PromosiStatsSerializer(stats_data).data
+
+        try:
+            block = get_landing_block('stats', request, build)
+            return landing_response(request, block, 'Berhasil mendapatkan statistik promosi')
         except Exception as e:
             return Response(
                 {'error': f'Gagal memuat statistik: {str(e)}'},
@@ -262,17 +251,16 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
         Endpoint untuk produk populer
         GET /api/promosi/popular/
         """
-        try:
+        def build():
             popular_products = self.get_queryset().filter(
                 stok__gte=5
             ).order_by('-stok', '-tgl_update')[:12]
 
-            serializer = self.get_serializer(popular_products, many=True)
-            return Response({
-                'status': 'success',
-                'message': 'Berhasil mendapatkan produk populer',
-                'data': serializer.data
-            })
+            return self.get_serializer(popular_products, many=True).data
+
+        try:
+            block = get_landing_block('popular', request, build, self.filter_params)
+            return landing_response(request, block, 'Berhasil mendapatkan produk populer')
         except Exception as e:
             return Response(
                 {'error': f'Gagal memuat produk populer: {str(e)}'},
@@ -317,6 +305,24 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """
+        Endpoint autocomplete nama produk, bisnis UMKM dan kategori (toleran salah ketik)
+        GET /api/promosi/products/suggest/?q=nokn
+        """
+        query = request.query_params.get('q', '')
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), 20))
+        except ValueError:
+            limit = 10
+
+        return Response({
+            'status': 'success',
+            'message': 'Berhasil mendapatkan saran pencarian',
+            'data': get_autocomplete_index().search(query, limit=limit)
+        })
+
     @action(detail=True, methods=['get'])
     def related(self, request, pk=None):
         """
@@ -326,8 +332,8 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
         try:
             product = self.get_object()
             related_products = self.get_queryset().filter(
-                kategori=product.kategori
-            ).exclude(id=product.id)[:6]
+                kategori_id=product.kategori_id
+            ).exclude(pk=product.pk)[:6]
 
             serializer = self.get_serializer(related_products, many=True)
             return Response({
@@ -336,7 +342,7 @@ class PromosiViewSet(viewsets.ReadOnlyModelViewSet):
                 'data': serializer.data
             })
 
-        except Produk.DoesNotExist:
+        except KatalogProduk.DoesNotExist:
             return Response(
                 {'error': 'Produk tidak ditemukan'},
                 status=status.HTTP_404_NOT_FOUND
@@ -365,10 +371,7 @@ class PromosiKategoriViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = super().get_queryset()
 
         queryset = queryset.annotate(
-            jumlah_produk=Count(
-                'produk',
-                filter=Q(produk__aktif=True)
-            )
+            jumlah_produk=F('jumlah_produk_aktif')
         ).filter(jumlah_produk__gt=0)
 
         # Manual search implementation
@@ -7,7 +7,7 @@ from django.db.models import Q
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.core.cache import cache
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import hashlib
 
 from ..serializers.statistik_serializer import (
@@ -15,9 +15,13 @@ from ..serializers.statistik_serializer import (
     StatistikUmumSerializer,
     LokasiStatistikSerializer,
     ProdukStatistikSerializer,
-    PeriodeStatistikSerializer
+    PeriodeStatistikSerializer,
+    StatistikPerWilayahSerializer,
+    ParameterForecastSerializer,
+    ForecastProdukSerializer
 )
-from ..utils.statistik_utils import StatistikCalculator
+from ..utils.forecast_utils import forecast_produk, ringkasan_stok
+from ..utils.statistik_utils import StatistikCalculator, statistik_wilayah_version, WILAYAH_CACHE_TIMEOUT
 from crud.models import LokasiPenjualan, Produk
 
 
@@ -30,7 +34,9 @@ class StatistikViewSet(viewsets.ViewSet):
     - GET /statistik/lokasi/ - Statistik per lokasi penjualan
     - GET /statistik/produk/ - Statistik per produk
     - GET /statistik/periode/ - Statistik per periode (bulanan/tahunan)
+    - GET /statistik/wilayah/ - Statistik per provinsi/kabupaten/kecamatan
     - GET /statistik/dashboard/ - Ringkasan untuk dashboard
+    - GET /statistik/forecast/ - Perkiraan penjualan per produk untuk perencanaan stok
     """
 
     permission_classes = [IsAuthenticated]
@@ -258,6 +264,67 @@ class StatistikViewSet(viewsets.ViewSet):
                 'message': f'Terjadi kesalahan: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['get'])
+    def wilayah(self, request):
+        """
+        Endpoint untuk statistik penjualan per wilayah (provinsi -> kabupaten -> kecamatan).
+        Admin melihat seluruh UMKM, UMKM hanya penjualannya sendiri.
+
+        Query Parameters sama dengan /statistik/ringkasan/
+        """
+        access_error = self.validate_umkm_access(request)
+        if access_error:
+            return access_error
+
+        param_serializer = ParameterStatistikSerializer(data=request.query_params)
+        if not param_serializer.is_valid():
+            return Response({
+                'status': 'error',
+                'message': 'Parameter tidak valid',
+                'errors': param_serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        params = param_serializer.validated_data
+        semua_umkm = request.user.role == 'admin'
+
+        # Cache per periode; versi berganti setiap ada perubahan penjualan/lokasi/wilayah
+        cache_key = self.get_cache_key(
+            'semua' if semua_umkm else request.user.id,
+            f'wilayah:{statistik_wilayah_version()}',
+            params
+        )
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            return Response({
+                'status': 'success',
+                'message': 'Berhasil mendapatkan statistik per wilayah (cached)',
+                'data': cached_result
+            })
+
+        try:
+            calculator = StatistikCalculator(user=request.user, semua_umkm=semua_umkm)
+
+            periode_filter = calculator.get_periode_filter(params)
+            additional_filter = calculator.get_additional_filters(params)
+            queryset = calculator.base_queryset.filter(periode_filter & additional_filter)
+
+            stats_wilayah = calculator.get_statistik_per_wilayah(queryset)
+            serializer = StatistikPerWilayahSerializer(stats_wilayah)
+
+            cache.set(cache_key, serializer.data, WILAYAH_CACHE_TIMEOUT)
+
+            return Response({
+                'status': 'success',
+                'message': 'Berhasil mendapatkan statistik per wilayah',
+                'data': serializer.data
+            })
+
+        except Exception as e:
+            return Response({
+                'status': 'error',
+                'message': f'Terjadi kesalahan: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
         """
@@ -344,3 +411,87 @@ class StatistikViewSet(viewsets.ViewSet):
                 'status': 'error',
                 'message': f'Terjadi kesalahan: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['get'])
+    def forecast(self, request):
+        """
+        Endpoint untuk perkiraan penjualan harian per produk UMKM
+
+        Query Parameters:
+        - hari: 1-90 (default: 30)
+        - riwayat: 56-730 hari riwayat penjualan (default: 182)
+        - sampai: YYYY-MM-DD tanggal terakhir riwayat (default: hari ini)
+        - produk_id: UUID (optional)
+        - umkm_id: UUID (wajib untuk admin)
+        """
+        access_error = self.validate_umkm_access(request)
+        if access_error:
+            return access_error
+
+        param_serializer = ParameterForecastSerializer(data=request.query_params)
+        if not param_serializer.is_valid():
+            return Response({
+                'status': 'error',
+                'message': 'Parameter tidak valid',
+                'errors': param_serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        params = param_serializer.validated_data
+
+        if request.user.role == 'admin':
+            if not params.get('umkm_id'):
+                return Response({
+                    'status': 'error',
+                    'message': 'Parameter tidak valid',
+                    'errors': {'umkm_id': ['Field ini diperlukan untuk admin.']}
+                }, status=status.HTTP_400_BAD_REQUEST)
+            produk_queryset = Produk.objects.filter(umkm_id=params['umkm_id'])
+        else:
+            produk_queryset = Produk.objects.filter(umkm=request.user)
+
+        if params.get('produk_id'):
+            produk_queryset = produk_queryset.filter(id=params['produk_id'])
+
+        produk_list = list(produk_queryset.order_by('nm_produk').values('id', 'nm_produk', 'satuan', 'stok'))
+        if params.get('produk_id') and not produk_list:
+            return Response({
+                'status': 'error',
+                'message': 'Produk tidak ditemukan'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        sampai = params.get('sampai') or date.today()
+        try:
+            perkiraan = forecast_produk(
+                [produk['id'] for produk in produk_list], sampai, params['riwayat'], params['hari']
+            ) if produk_list else {}
+
+            hasil = []
+            for produk in produk_list:
+                item = perkiraan[produk['id']]
+                hasil.append({
+                    'produk_id': produk['id'],
+                    'nama_produk': produk['nm_produk'],
+                    'satuan': produk['satuan'],
+                    'stok': produk['stok'],
+                    **item,
+                    # Stok dibaca setiap request, perkiraannya dari cache
+                    **ringkasan_stok(item['perkiraan_harian'], produk['stok']),
+                })
+            hasil.sort(key=lambda item: item['perkiraan_total'], reverse=True)
+
+            return Response({
+                'status': 'success',
+                'message': 'Berhasil mendapatkan perkiraan penjualan',
+                'data': {
+                    'mulai': sampai + timedelta(days=1),
+                    'sampai': sampai + timedelta(days=params['hari']),
+                    'riwayat_hari': params['riwayat'],
+                    'produk': ForecastProdukSerializer(hasil, many=True).data
+                }
+            })
+
+        except Exception as e:
+            return Response({
+                'status': 'error',
+                'message': f'Terjadi kesalahan: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
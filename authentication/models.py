@@ -12,4 +12,38 @@ class User(AbstractUser):
         primary_key=True,
         default=uuid.uuid4,
         editable=False
-    )
\ No newline at end of file
+    )
+    # Penghitung denormalisasi untuk UMKM, dijaga oleh crud/counters.py
+    jumlah_produk = models.IntegerField(default=0, editable=False)
+    jumlah_produk_aktif = models.IntegerField(default=0, editable=False)
+    jumlah_lokasi = models.IntegerField(default=0, editable=False)
+    tgl_update = models.DateTimeField(auto_now=True)
+
+    # Kolom yang disalin ke katalog dan indeks pencarian produk (crud.katalog, crud.search).
+    # Nilai terakhir yang dimuat/disimpan dicatat tanpa query tambahan, sehingga receiver
+    # post_save bisa melewati save yang tidak mengubahnya.
+    TRACKED_FIELDS = ('username', 'is_active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._tracked_values = {
+            name: value for name, value in zip(field_names, values) if name in cls.TRACKED_FIELDS
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        saved = self.TRACKED_FIELDS if update_fields is None else set(self.TRACKED_FIELDS) & set(update_fields)
+        tracked = getattr(self, '_tracked_values', {})
+        tracked.update((name, self.__dict__[name]) for name in saved if name in self.__dict__)
+        self._tracked_values = tracked
+
+    def tracked_changed(self, *fields):
+        """
+        True jika salah satu kolom berbeda dari nilai terakhir yang dimuat/disimpan, atau nilai
+        lamanya tidak diketahui. Di receiver post_save nilai lama belum diganti nilai baru.
+        """
+        tracked = getattr(self, '_tracked_values', {})
+        return any(name not in tracked or self.__dict__.get(name) != tracked[name] for name in fields)
@@ -1,6 +1,19 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CrudConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'crud'
+
+    def ready(self):
+        # Mendaftarkan signal invalidasi cache wilayah dan cluster peta, pembaruan indeks
+        # pencarian, katalog, penghitung denormalisasi dan stok
+        from .search import signals  # noqa
+        from . import counters, inventory, katalog, peta, regions  # noqa
+        from .cache_versions import create_cache_table
+        from .pagination.counting import connect_count_invalidation
+
+        # Invalidasi cache count pagination, dan tabel cache bersama setelah migrate
+        connect_count_invalidation()
+        post_migrate.connect(create_cache_table, sender=self)
@@ -0,0 +1,72 @@
+# crud/cache_versions.py
+"""
+Versi cache bersama.
+
+Kunci cache turunan memuat versi sebuah nama (mis. 'peta:umkm'); menaikkan versi
+membuat semua turunannya kadaluarsa tanpa perlu dihapus satu per satu.
+
+Versi disimpan di cache default Django, yang harus dipakai bersama semua worker (lihat CACHES
+di settings; default-nya tabel cache database). Dengan cache per proses (LocMemCache) versi
+yang dinaikkan hanya terlihat oleh proses yang menulis. Versi yang hilang (cull/restart cache)
+dibuat ulang sebagai versi baru, jadi turunannya kadaluarsa, tidak pernah basi.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+
+
+def _key(name):
+    return f'cache_version:{name}'
+
+
+def cache_version(name):
+    return cache_versions([name])[name]
+
+
+def cache_versions(names, default=None):
+    """
+    dict nama -> versi; nama yang belum punya versi dibuatkan sekaligus,
+    atau diberi `default` tanpa disimpan (untuk nama yang sangat banyak, mis. per tile)
+    """
+    keys = {_key(name): name for name in names}
+    found = cache.get_many(list(keys))
+    missing = {key: uuid.uuid4().hex for key in keys if key not in found}
+    if missing and default is not None:
+        found.update(dict.fromkeys(missing, default))
+    elif missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return {name: found[key] for key, name in keys.items()}
+
+
+def bump_cache_version(name):
+    """
+    Menandai semua turunan nama ini kadaluarsa, mengembalikan versi baru
+    """
+    version = uuid.uuid4().hex
+    cache.set(_key(name), version, None)
+    return version
+
+
+def bump_cache_versions(names, timeout=None):
+    """
+    bump_cache_version untuk banyak nama sekaligus. Versi dengan timeout harus hidup paling
+    tidak selama turunannya, karena setelah kadaluarsa nama kembali ke `default` cache_versions.
+    """
+    cache.set_many({_key(name): uuid.uuid4().hex for name in names}, timeout)
+
+
+def bump_cache_version_on_commit(*names):
+    """
+    bump_cache_version setelah transaksi berjalan selesai (langsung jika di luar transaksi)
+    """
+    transaction.on_commit(lambda: [bump_cache_version(name) for name in names])
+
+
+def create_cache_table(using='default', **kwargs):
+    """
+    Receiver post_migrate: tabel DatabaseCache tidak dibuat oleh migrate
+    """
+    call_command('createcachetable', database=using, verbosity=0)
@@ -0,0 +1,158 @@
+# crud/counters.py
+"""
+Penghitung denormalisasi (jumlah baris terkait yang disimpan sebagai kolom).
+
+Setiap penghitung didefinisikan sekali di COUNTERS: baris sumber menambah 1 pada
+kolom `field` milik baris target (lewat foreign key `fk`), opsional hanya jika
+kolom boolean `syarat` bernilai True. Signal menghitung selisih kontribusi baris
+sebelum dan sesudah disimpan/dihapus, lalu menerapkannya dengan UPDATE ... F() + n.
+Penghitung dengan `versi` menaikkan versi cache bernama itu setelah commit setiap kali
+nilainya berubah, agar validator ETag (ConditionalGetMixin.conditional_versions) ikut
+berubah tanpa join ke tabel sumber dan tanpa menyentuh tgl_update target.
+Save model sumber dibungkus transaction.atomic(), jadi penghitung ikut di-rollback.
+
+Operasi massal (bulk_create, queryset.update/delete) tidak mengirim signal;
+jalankan reconcile_counters setelahnya.
+"""
+from collections import Counter, defaultdict, namedtuple
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache_versions import bump_cache_version, bump_cache_version_on_commit
+from .models import KategoriProduk, LokasiPenjualan, Produk, ProdukTerjual
+from .snapshots import old_state, saved_attnames, track
+
+User = get_user_model()
+
+Penghitung = namedtuple('Penghitung', ['source', 'fk', 'target', 'field', 'syarat', 'versi'], defaults=[None])
+
+# total_penjualan di daftar lokasi penjualan dibaca dari LokasiPenjualan.jumlah_penjualan
+JUMLAH_PENJUALAN_VERSION = 'counter:lokasi_penjualan.jumlah_penjualan'
+
+COUNTERS = [
+    Penghitung(Produk, 'umkm_id', User, 'jumlah_produk', None),
+    Penghitung(Produk, 'umkm_id', User, 'jumlah_produk_aktif', 'aktif'),
+    Penghitung(Produk, 'kategori_id', KategoriProduk, 'jumlah_produk_aktif', 'aktif'),
+    Penghitung(LokasiPenjualan, 'umkm_id', User, 'jumlah_lokasi', None),
+    Penghitung(ProdukTerjual, 'lokasi_penjualan_id', LokasiPenjualan, 'jumlah_penjualan', None,
+               versi=JUMLAH_PENJUALAN_VERSION),
+]
+
+_COUNTERS_BY_SOURCE = defaultdict(list)
+for _counter in COUNTERS:
+    _COUNTERS_BY_SOURCE[_counter.source].append(_counter)
+
+# Kolom sumber yang memengaruhi penghitung, per model
+_TRACKED_FIELDS = {
+    source: sorted({c.fk for c in counters} | {c.syarat for c in counters if c.syarat})
+    for source, counters in _COUNTERS_BY_SOURCE.items()
+}
+for _source, _fields in _TRACKED_FIELDS.items():
+    track(_source, _fields)
+
+
+def _state(instance):
+    return {field: getattr(instance, field) for field in _TRACKED_FIELDS[type(instance)]}
+
+
+def _contributions(model, state):
+    contributions = Counter()
+    if state is None:
+        return contributions
+    for counter in _COUNTERS_BY_SOURCE[model]:
+        pk = state[counter.fk]
+        if pk is not None and (counter.syarat is None or state[counter.syarat]):
+            contributions[(counter.target, pk, counter.field)] += 1
+    return contributions
+
+
+def apply_delta(model, old_state, new_state):
+    """
+    Menerapkan selisih kontribusi baris sumber, satu UPDATE per baris target
+    """
+    delta = _contributions(model, new_state)
+    delta.subtract(_contributions(model, old_state))
+
+    versi = {(counter.target, counter.field): counter.versi for counter in _COUNTERS_BY_SOURCE[model] if counter.versi}
+    updates = defaultdict(dict)
+    berubah = set()
+    for (target, pk, field), amount in delta.items():
+        if amount:
+            updates[(target, pk)][field] = F(field) + amount
+            if (target, field) in versi:
+                berubah.add(versi[(target, field)])
+    for (target, pk), fields in updates.items():
+        target.objects.filter(pk=pk).update(**fields)
+    if berubah:
+        bump_cache_version_on_commit(*berubah)
+
+
+@receiver(pre_save, sender=Produk)
+@receiver(pre_save, sender=LokasiPenjualan)
+@receiver(pre_save, sender=ProdukTerjual)
+def counters_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    tracked = _TRACKED_FIELDS[sender]
+    if update_fields is not None and not set(tracked) & saved_attnames(sender, update_fields):
+        instance._counter_state = None
+        return
+    instance._counter_state = old_state(instance, tracked)
+
+
+@receiver(post_save, sender=Produk)
+@receiver(post_save, sender=LokasiPenjualan)
+@receiver(post_save, sender=ProdukTerjual)
+def counters_post_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_delta(sender, None, _state(instance))
+        return
+    old_state = getattr(instance, '_counter_state', None)
+    instance._counter_state = None
+    if old_state is None:
+        return
+    new_state = _state(instance)
+    if update_fields is not None:
+        # Kolom di luar update_fields tidak ikut tersimpan
+        saved = saved_attnames(sender, update_fields)
+        new_state = {field: new_state[field] if field in saved else old_state[field] for field in new_state}
+    apply_delta(sender, old_state, new_state)
+
+
+@receiver(post_delete, sender=Produk)
+@receiver(post_delete, sender=LokasiPenjualan)
+@receiver(post_delete, sender=ProdukTerjual)
+def counters_post_delete(sender, instance, **kwargs):
+    apply_delta(sender, _state(instance), None)
+
+
+def _expected(counter):
+    condition = Q(**{counter.syarat: True}) if counter.syarat else Q()
+    rows = counter.source.objects.filter(
+        condition, **{counter.fk: OuterRef('pk')}
+    ).order_by().values(counter.fk).annotate(jumlah=Count('pk')).values('jumlah')
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def reconcile_counters(perbaiki=True):
+    """
+    Menghitung ulang semua penghitung dari tabel sumber.
+    Mengembalikan list (penghitung, jumlah baris yang menyimpang).
+    """
+    hasil = []
+    for counter in COUNTERS:
+        drift = counter.target.objects.annotate(
+            seharusnya=_expected(counter)
+        ).exclude(**{counter.field: F('seharusnya')}).count()
+        if drift and perbaiki:
+            counter.target.objects.update(**{counter.field: _expected(counter)})
+            if counter.versi:
+                bump_cache_version(counter.versi)
+        hasil.append((counter, drift))
+    return hasil
@@ -0,0 +1,17 @@
+# crud/indexes.py
+from django.db import models
+
+
+class FullTextIndex(models.Index):
+    """
+    FULLTEXT index MySQL untuk MATCH ... AGAINST (crud.search.MySQLFullTextBackend).
+
+    Dideklarasikan di Meta.indexes sehingga dibuat/dihapus oleh migrate seperti index biasa.
+    Di database selain MySQL menjadi index biasa; pencarian di sana memakai InvertedIndexBackend.
+    """
+    sql_create_fulltext = 'CREATE FULLTEXT INDEX %(name)s ON %(table)s (%(columns)s)'
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor == 'mysql':
+            kwargs['sql'] = self.sql_create_fulltext
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
@@ -0,0 +1,160 @@
+# crud/inventory.py
+"""
+Stok dan kecepatan jual produk yang ikut berubah setiap ProdukTerjual disimpan/dihapus.
+
+Setiap penjualan mengurangi Produk.stok sebesar jumlah_terjual dan menambah
+Produk.bobot_penjualan sebesar
+jumlah_terjual * 2 ** ((tgl_penjualan - EPOCH) / WAKTU_PARUH_HARI).
+
+Bobot hanya bergantung pada tanggal penjualan itu sendiri. Jadi create, update (termasuk
+pindah produk/tanggal) dan delete cukup diterapkan sebagai selisih F() pada baris produk.
+Stok boleh menjadi negatif (penjualan dilaporkan melebihi stok yang tercatat, mis. UMKM
+yang belum pernah mengisi stok), sehingga penjualan tidak pernah ditolak dan setiap selisih
+bisa dibalik persis saat penjualan diubah atau dihapus.
+Kecepatan jual (unit/hari, rata-rata bergerak eksponensial) pada tanggal t adalah
+bobot_penjualan * faktor_kecepatan(t), tanpa membaca ulang tabel penjualan.
+
+Operasi massal (bulk_create penjualan) tidak mengirim signal; jalankan
+rebuild_bobot_penjualan (lewat command reconcile_counters). Stok tidak bisa direkonsiliasi
+karena tidak ada sumber lain selain nilainya sendiri.
+"""
+from collections import defaultdict
+from datetime import date
+
+from django.db.models import ExpressionWrapper, F, FloatField, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .katalog import refresh_katalog_later
+from .models import Produk, ProdukTerjual
+from .snapshots import old_state, saved_attnames, track
+
+# Bobot berlipat dua setiap WAKTU_PARUH_HARI sejak EPOCH; float64 cukup sampai ~38 tahun setelahnya
+EPOCH = date(2020, 1, 1)
+WAKTU_PARUH_HARI = 14
+# Produk yang hampir tidak pernah terjual tidak ikut peringatan stok
+KECEPATAN_MINIMUM = 0.01
+BATCH_SIZE = 1000
+
+_TRACKED_FIELDS = ('produk_id', 'jumlah_terjual', 'tgl_penjualan')
+_TGL_FIELD = ProdukTerjual._meta.get_field('tgl_penjualan')
+track(ProdukTerjual, _TRACKED_FIELDS)
+
+
+def bobot(tgl_penjualan):
+    return 2.0 ** ((tgl_penjualan - EPOCH).days / WAKTU_PARUH_HARI)
+
+
+def faktor_kecepatan(tanggal):
+    """
+    Pengali bobot_penjualan menjadi unit/hari pada tanggal tertentu.
+    Penjualan konstan r unit/hari menghasilkan kecepatan r.
+    """
+    return (1 - 2.0 ** (-1 / WAKTU_PARUH_HARI)) / bobot(tanggal)
+
+
+def _state(instance):
+    return {
+        'produk_id': instance.produk_id,
+        'jumlah_terjual': instance.jumlah_terjual,
+        # Tanggal bisa diisi string (mis. dari view), samakan dengan nilai dari database
+        'tgl_penjualan': _TGL_FIELD.to_python(instance.tgl_penjualan),
+    }
+
+
+def apply_delta(old_state, new_state):
+    """
+    Menerapkan selisih stok dan bobot penjualan, satu UPDATE per produk yang terdampak
+    """
+    delta = defaultdict(lambda: [0, 0.0])
+    for state, sign in ((new_state, 1), (old_state, -1)):
+        if state is None or state['produk_id'] is None:
+            continue
+        delta[state['produk_id']][0] += sign * state['jumlah_terjual']
+        delta[state['produk_id']][1] += sign * state['jumlah_terjual'] * bobot(state['tgl_penjualan'])
+
+    stok_berubah = []
+    for produk_id, (jumlah, nilai_bobot) in delta.items():
+        if not jumlah and not nilai_bobot:
+            continue
+        queryset = Produk.objects.filter(pk=produk_id)
+        fields = {'bobot_penjualan': F('bobot_penjualan') + nilai_bobot}
+        if jumlah:
+            # tgl_update ikut berubah agar ETag daftar produk tidak basi
+            fields.update(stok=F('stok') - jumlah, tgl_update=timezone.now())
+            stok_berubah.append(produk_id)
+        queryset.update(**fields)
+    refresh_katalog_later(stok_berubah)
+
+
+@receiver(pre_save, sender=ProdukTerjual)
+def inventory_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(_TRACKED_FIELDS) & saved_attnames(sender, update_fields):
+        instance._inventory_state = None
+        return
+    instance._inventory_state = old_state(instance, _TRACKED_FIELDS)
+
+
+@receiver(post_save, sender=ProdukTerjual)
+def inventory_post_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_delta(None, _state(instance))
+        return
+    old_state = getattr(instance, '_inventory_state', None)
+    instance._inventory_state = None
+    if old_state is None:
+        return
+    new_state = _state(instance)
+    if update_fields is not None:
+        saved = saved_attnames(sender, update_fields)
+        new_state = {field: new_state[field] if field in saved else old_state[field] for field in new_state}
+    apply_delta(old_state, new_state)
+
+
+@receiver(post_delete, sender=ProdukTerjual)
+def inventory_post_delete(sender, instance, **kwargs):
+    apply_delta(_state(instance), None)
+
+
+def rebuild_bobot_penjualan(perbaiki=True):
+    """
+    Menghitung ulang bobot_penjualan dari tabel penjualan.
+    Mengembalikan jumlah produk yang nilainya menyimpang.
+    """
+    seharusnya = defaultdict(float)
+    rows = ProdukTerjual.objects.order_by().values_list('produk_id', 'tgl_penjualan').annotate(
+        jumlah=Sum('jumlah_terjual')
+    )
+    for produk_id, tgl_penjualan, jumlah in rows.iterator():
+        seharusnya[produk_id] += jumlah * bobot(tgl_penjualan)
+
+    menyimpang = []
+    for produk_id, sekarang in Produk.objects.values_list('pk', 'bobot_penjualan').iterator():
+        nilai = seharusnya.get(produk_id, 0.0)
+        if abs(sekarang - nilai) > 1e-9 * max(abs(nilai), 1.0):
+            menyimpang.append(Produk(pk=produk_id, bobot_penjualan=nilai))
+
+    if menyimpang and perbaiki:
+        Produk.objects.bulk_update(menyimpang, ['bobot_penjualan'], batch_size=BATCH_SIZE)
+    return len(menyimpang)
+
+
+def stok_alerts(queryset, hari, tanggal=None):
+    """
+    Produk yang stoknya diperkirakan habis dalam `hari` hari berdasarkan kecepatan jual,
+    paling cepat habis lebih dulu
+    """
+    faktor = faktor_kecepatan(tanggal or date.today())
+    return queryset.filter(aktif=True).annotate(
+        kecepatan_jual=ExpressionWrapper(F('bobot_penjualan') * faktor, output_field=FloatField())
+    ).filter(
+        kecepatan_jual__gte=KECEPATAN_MINIMUM,
+        stok__lt=F('kecepatan_jual') * hari,
+    ).annotate(
+        perkiraan_hari_habis=ExpressionWrapper(F('stok') / F('kecepatan_jual'), output_field=FloatField())
+    ).order_by('perkiraan_hari_habis', 'nm_produk')
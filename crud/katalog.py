@@ -0,0 +1,114 @@
+# crud/katalog.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import KatalogProduk, KategoriProduk, Produk, ProfilUMKM
+from .pagination.counting import bump_count_version
+
+BATCH_SIZE = 500
+KATALOG_UPDATE_FIELDS = [
+    field.name for field in KatalogProduk._meta.concrete_fields if not field.primary_key
+]
+
+
+def katalog_row(produk):
+    """
+    Baris KatalogProduk untuk satu produk (produk sudah select_related kategori dan umkm__profil_umkm)
+    """
+    umkm = produk.umkm
+    profil = getattr(umkm, 'profil_umkm', None)
+    return KatalogProduk(
+        produk=produk,
+        nm_produk=produk.nm_produk,
+        desc=produk.desc,
+        harga=produk.harga,
+        # Stok negatif (penjualan melebihi stok tercatat) tampil sebagai habis
+        stok=max(produk.stok, 0),
+        satuan=produk.satuan,
+        gambar_utama=produk.gambar_utama.name or '',
+        aktif=produk.aktif,
+        tgl_dibuat=produk.tgl_dibuat,
+        tgl_update=produk.tgl_update,
+        kategori_id=produk.kategori_id,
+        nm_kategori=produk.kategori.nm_kategori,
+        desc_kategori=produk.kategori.desc or '',
+        umkm_id=umkm.id,
+        username=umkm.username,
+        umkm_aktif=umkm.is_active,
+        nm_bisnis=(profil.nm_bisnis if profil else None) or umkm.username,
+        alamat=(profil.alamat if profil else None) or '',
+        tlp=(profil.tlp if profil else None) or '',
+        desc_bisnis=(profil.desc_bisnis if profil else None) or '',
+    )
+
+
+def refresh_katalog(produk_ids):
+    """
+    Menulis ulang baris katalog untuk produk_ids (upsert)
+    """
+    produk_ids = list(produk_ids)
+    if not produk_ids:
+        return 0
+
+    produk_list = Produk.objects.filter(pk__in=produk_ids).select_related('kategori', 'umkm__profil_umkm')
+    rows = [katalog_row(produk) for produk in produk_list]
+    KatalogProduk.objects.bulk_create(
+        rows,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['produk'],
+        update_fields=KATALOG_UPDATE_FIELDS,
+    )
+    # bulk_create tidak mengirim post_save, cache count pagination ditandai manual
+    bump_count_version(KatalogProduk._meta.db_table)
+    return len(rows)
+
+
+def rebuild_katalog():
+    """
+    Membangun ulang seluruh katalog dari tabel produk
+    """
+    ids = list(Produk.objects.values_list('pk', flat=True))
+    with transaction.atomic():
+        KatalogProduk.objects.exclude(produk_id__in=ids).delete()
+        for start in range(0, len(ids), BATCH_SIZE):
+            refresh_katalog(ids[start:start + BATCH_SIZE])
+    return len(ids)
+
+
+def refresh_katalog_later(produk_ids):
+    """
+    Memperbarui katalog setelah transaksi selesai, agar tidak berisi data yang di-rollback
+    """
+    produk_ids = list(produk_ids)
+    if produk_ids:
+        transaction.on_commit(lambda: refresh_katalog(produk_ids))
+
+
+@receiver(post_save, sender=Produk)
+def katalog_produk(sender, instance, **kwargs):
+    refresh_katalog_later([instance.pk])
+
+
+@receiver(post_save, sender=KategoriProduk)
+def katalog_kategori(sender, instance, created, **kwargs):
+    if not created:
+        refresh_katalog_later(instance.produk.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=ProfilUMKM)
+@receiver(post_delete, sender=ProfilUMKM)
+def katalog_profil(sender, instance, **kwargs):
+    refresh_katalog_later(Produk.objects.filter(umkm_id=instance.user_id).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def katalog_user(sender, instance, created, update_fields=None, **kwargs):
+    # Katalog hanya menyimpan username dan is_active
+    if created or (update_fields is not None and not {'username', 'is_active'} & set(update_fields)):
+        return
+    if not instance.tracked_changed('username', 'is_active'):
+        return
+    refresh_katalog_later(instance.produk.values_list('pk', flat=True))
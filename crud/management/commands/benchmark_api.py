@@ -0,0 +1,317 @@
+# management/commands/benchmark_api.py
+
+import json
+import platform
+import time
+import tracemalloc
+
+import django
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from crud.models import ProdukTerjual
+
+User = get_user_model()
+
+BENCH_PREFIX = 'bench'
+BENCH_ADMIN = 'benchmark_admin'
+# Ukuran dataset tetap agar laporan dari mesin/commit berbeda bisa dibandingkan
+BENCH_DATASET = {
+    'umkm': 50,
+    'produk_per_umkm': 5,
+    'lokasi_per_umkm': 3,
+    'days': 365,
+    'sales_per_day': 100,
+    'sampai': '2025-12-31',
+    'seed': 42,
+}
+BENCH_TAHUN = 2025
+
+# (nama, role, path); {tahun} diisi tahun dataset
+ENDPOINTS = [
+    ('grafik-penjualan', 'umkm', '/api/grafik-penjualan/?tahun={tahun}'),
+    ('grafik-penjualan-admin', 'admin', '/api/grafik-penjualan/?tahun={tahun}'),
+    ('ringkasan-penjualan', 'umkm', '/api/ringkasan-penjualan/?tahun={tahun}'),
+    ('ringkasan-penjualan-admin', 'admin', '/api/ringkasan-penjualan/?tahun={tahun}'),
+    ('statistik-ringkasan', 'umkm', '/api/statistik/ringkasan/?tipe_periode=tahunan&tahun={tahun}'),
+    ('statistik-lokasi', 'umkm', '/api/statistik/lokasi/?tipe_periode=tahunan&tahun={tahun}'),
+    ('statistik-produk', 'umkm', '/api/statistik/produk/?tipe_periode=tahunan&tahun={tahun}'),
+    ('statistik-periode', 'umkm', '/api/statistik/periode/?tipe_periode=tahunan&tahun={tahun}'),
+    ('statistik-dashboard', 'umkm', '/api/statistik/dashboard/'),
+    ('statistik-wilayah-admin', 'admin', '/api/statistik/wilayah/?tipe_periode=tahunan&tahun={tahun}'),
+    ('promosi-products', 'anon', '/api/promosi/products/'),
+    ('promosi-products-cari', 'anon', '/api/promosi/products/?search=keripik'),
+    ('produk-terjual-my-sales', 'umkm', '/crud/produk-terjual/my_sales/'),
+    ('export-sales-report', 'umkm', '/api/export-excel/export_sales_report/'),
+    ('export-sales-analysis', 'umkm', '/api/export-excel/export_sales_analysis/'),
+    ('export-sales-report-admin', 'admin', '/api/export-excel/export_sales_report/'),
+]
+
+# Kenaikan metrik ini di atas threshold dianggap regresi
+COMPARED_METRICS = ('p50_ms', 'p95_ms', 'rows', 'peak_memory_kb')
+
+
+class _CountingCursor:
+    """
+    Membungkus cursor DB-API dan menghitung baris yang diambil dari database
+    """
+
+    def __init__(self, cursor, counter):
+        self._cursor = cursor
+        self._counter = counter
+
+    def _count(self, rows):
+        self._counter['rows'] += len(rows)
+        return rows
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._counter['rows'] += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        return self._count(self._cursor.fetchmany(*args, **kwargs))
+
+    def fetchall(self):
+        return self._count(self._cursor.fetchall())
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._counter['rows'] += 1
+            yield row
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark endpoint analitik dan katalog lewat test client: latensi p50/p95, '
+        'jumlah query, baris yang diambil dan memori puncak, disimpan sebagai laporan JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed-data', action='store_true',
+                            help=f"Membuat dataset benchmark (prefix '{BENCH_PREFIX}') jika belum ada")
+        parser.add_argument('--iterations', type=int, default=10, help='Jumlah request terukur per endpoint')
+        parser.add_argument('--warmup', type=int, default=2, help='Request pemanasan yang tidak diukur')
+        parser.add_argument('--cache-hangat', action='store_true',
+                            help='Tidak mengosongkan cache sebelum setiap request (mengukur jalur cache)')
+        parser.add_argument('--endpoint', action='append', default=[],
+                            help='Hanya endpoint dengan nama ini (boleh diulang)')
+        parser.add_argument('--output', type=str, default=None, help='Path file laporan JSON')
+        parser.add_argument('--compare', nargs=2, metavar=('BASE', 'BARU'),
+                            help='Membandingkan dua laporan tanpa menjalankan benchmark')
+        parser.add_argument('--baseline', type=str, default=None,
+                            help='Setelah benchmark, bandingkan hasilnya dengan laporan ini')
+        parser.add_argument('--threshold', type=float, default=0.10,
+                            help='Kenaikan relatif yang dianggap regresi (0.10 = 10%%)')
+        parser.add_argument('--min-ms', type=float, default=1.0,
+                            help='Selisih latensi di bawah ini diabaikan (noise)')
+
+    def handle(self, *args, **options):
+        if options['compare']:
+            base, baru = (self._load_report(path) for path in options['compare'])
+            self._compare(base, baru, options)
+            return
+
+        if options['iterations'] < 1:
+            raise CommandError('--iterations minimal 1')
+
+        if options['seed_data']:
+            self._seed_data()
+
+        umkm = self._bench_umkm()
+        clients = {
+            'umkm': self._client(umkm),
+            'admin': self._client(self._bench_admin()),
+            'anon': APIClient(raise_request_exception=False),
+        }
+
+        endpoints = ENDPOINTS
+        if options['endpoint']:
+            unknown = set(options['endpoint']) - {name for name, _, _ in ENDPOINTS}
+            if unknown:
+                raise CommandError(f"Endpoint tidak dikenal: {', '.join(sorted(unknown))}")
+            endpoints = [item for item in ENDPOINTS if item[0] in options['endpoint']]
+
+        results = {}
+        for name, role, path in endpoints:
+            path = path.format(tahun=BENCH_TAHUN)
+            results[name] = self._run(clients[role], path, options)
+            result = results[name]
+            self.stdout.write(
+                f"{name:28s} {result['status']} p50 {result['p50_ms']:8.2f} ms  "
+                f"p95 {result['p95_ms']:8.2f} ms  {result['queries']:4d} query  "
+                f"{result['rows']:7d} baris  {result['peak_memory_kb']:9.1f} KB"
+            )
+
+        report = {
+            'meta': {
+                'dibuat': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'iterations': options['iterations'],
+                'warmup': options['warmup'],
+                'cache_hangat': options['cache_hangat'],
+                'dataset': {
+                    'produk_terjual': ProdukTerjual.objects.count(),
+                    'produk_terjual_umkm': ProdukTerjual.objects.filter(produk__umkm=umkm).count(),
+                },
+            },
+            'endpoints': results,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Laporan disimpan ke {options['output']}"))
+
+        if options['baseline']:
+            self._compare(self._load_report(options['baseline']), report, options)
+
+    def _seed_data(self):
+        if User.objects.filter(username__startswith=f'{BENCH_PREFIX}_').exists():
+            self.stdout.write(f"Dataset benchmark (prefix '{BENCH_PREFIX}') sudah ada")
+            return
+        self.stdout.write('Membuat dataset benchmark...')
+        call_command(
+            'generate_papua_data', prefix=BENCH_PREFIX, stdout=self.stdout,
+            **BENCH_DATASET
+        )
+
+    def _bench_umkm(self):
+        umkm = User.objects.filter(
+            username__startswith=f'{BENCH_PREFIX}_', role='umkm'
+        ).order_by('username').first()
+        if umkm is None:
+            raise CommandError("Dataset benchmark belum ada, jalankan dengan --seed-data")
+        return umkm
+
+    def _bench_admin(self):
+        admin, _ = User.objects.get_or_create(
+            username=BENCH_ADMIN,
+            defaults={'email': f'{BENCH_ADMIN}@example.com', 'role': 'admin', 'is_staff': True}
+        )
+        return admin
+
+    def _client(self, user):
+        # Endpoint yang error tercatat sebagai status 500, benchmark tetap berlanjut
+        client = APIClient(raise_request_exception=False)
+        client.force_authenticate(user=user)
+        return client
+
+    def _request(self, client, path, options):
+        if not options['cache_hangat']:
+            cache.clear()
+        return client.get(path)
+
+    def _run(self, client, path, options):
+        for _ in range(options['warmup']):
+            self._request(client, path, options)
+
+        timings = []
+        for _ in range(options['iterations']):
+            start = time.perf_counter()
+            response = self._request(client, path, options)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        # Query dan baris dihitung pada request terpisah agar tidak membebani pengukuran waktu.
+        # Tidak memakai CaptureQueriesContext: sinyal request_started mengosongkan queries_log.
+        counter = {'queries': 0, 'rows': 0}
+
+        def count_rows(execute, sql, params, many, context):
+            counter['queries'] += 1
+            result = execute(sql, params, many, context)
+            wrapper = context['cursor']
+            if not isinstance(wrapper.cursor, _CountingCursor):
+                wrapper.cursor = _CountingCursor(wrapper.cursor, counter)
+            return result
+
+        with connection.execute_wrapper(count_rows):
+            self._request(client, path, options)
+
+        tracemalloc.start()
+        try:
+            self._request(client, path, options)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        p50, p95 = np.percentile(timings, [50, 95])
+        return {
+            'path': path,
+            'status': response.status_code,
+            'bytes': len(response.content),
+            'p50_ms': round(float(p50), 3),
+            'p95_ms': round(float(p95), 3),
+            'mean_ms': round(float(np.mean(timings)), 3),
+            'min_ms': round(min(timings), 3),
+            'max_ms': round(max(timings), 3),
+            'queries': counter['queries'],
+            'rows': counter['rows'],
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def _load_report(self, path):
+        try:
+            with open(path) as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Laporan {path} tidak bisa dibaca: {e}')
+        if 'endpoints' not in report:
+            raise CommandError(f'{path} bukan laporan benchmark_api')
+        return report
+
+    def _compare(self, base, baru, options):
+        threshold = options['threshold']
+        regresi = []
+
+        for key in ('database', 'dataset', 'cache_hangat'):
+            if base['meta'].get(key) != baru['meta'].get(key):
+                self.stdout.write(self.style.WARNING(
+                    f"{key} berbeda ({base['meta'].get(key)} vs {baru['meta'].get(key)}), hasil mungkin tidak sebanding"
+                ))
+
+        for name, new in baru['endpoints'].items():
+            old = base['endpoints'].get(name)
+            if old is None:
+                self.stdout.write(f'{name:28s} baru (tidak ada di laporan dasar)')
+                continue
+
+            catatan = []
+            if new['status'] != old['status']:
+                catatan.append(f"status {old['status']} -> {new['status']}")
+            if new['queries'] > old['queries']:
+                catatan.append(f"query {old['queries']} -> {new['queries']}")
+            for metric in COMPARED_METRICS:
+                if metric.endswith('_ms') and new[metric] - old[metric] < options['min_ms']:
+                    continue
+                if new[metric] > old[metric] * (1 + threshold):
+                    change = (new[metric] / old[metric] - 1) * 100 if old[metric] else float('inf')
+                    catatan.append(f'{metric} {old[metric]} -> {new[metric]} (+{change:.0f}%)')
+
+            line = (
+                f"{name:28s} p50 {old['p50_ms']:8.2f} -> {new['p50_ms']:8.2f} ms  "
+                f"query {old['queries']:4d} -> {new['queries']:4d}"
+            )
+            if catatan:
+                regresi.append(name)
+                self.stdout.write(self.style.ERROR(f"{line}  REGRESI: {'; '.join(catatan)}"))
+            else:
+                self.stdout.write(line)
+
+        for name in base['endpoints'].keys() - baru['endpoints'].keys():
+            self.stdout.write(self.style.WARNING(f'{name:28s} tidak ada di laporan baru'))
+
+        if regresi:
+            raise CommandError(f"Regresi pada {len(regresi)} endpoint: {', '.join(regresi)}")
+        self.stdout.write(self.style.SUCCESS('Tidak ada regresi'))
@@ -0,0 +1,131 @@
+# management/commands/benchmark_onboarding.py
+
+import time
+import uuid
+from collections import Counter
+from contextlib import nullcontext
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from crud.models import ProfilUMKM
+
+User = get_user_model()
+
+# Hasher cepat agar yang terukur adalah query, bukan PBKDF2
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+QUERY_KINDS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.kinds = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        kind = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+        self.kinds[kind if kind in QUERY_KINDS else 'lainnya'] += 1
+        return execute(sql, params, many, context)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Mengukur biaya onboarding massal user UMKM (query dan waktu per user); data di-rollback'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jumlah', type=int, default=2000, help='Jumlah user UMKM yang dibuat')
+        parser.add_argument('--mode', choices=['orm', 'api', 'semua'], default='semua',
+                            help='orm: create_user + save ulang; api: POST /crud/user/ dengan profil')
+        parser.add_argument('--hasher-asli', action='store_true',
+                            help='Gunakan PASSWORD_HASHERS dari settings (lambat, didominasi hashing)')
+
+    def handle(self, *args, **options):
+        jumlah = options['jumlah']
+        modes = ['orm', 'api'] if options['mode'] == 'semua' else [options['mode']]
+        hashers = None if options['hasher_asli'] else FAST_HASHERS
+
+        for mode in modes:
+            with override_settings(PASSWORD_HASHERS=hashers) if hashers else nullcontext():
+                try:
+                    with transaction.atomic():
+                        getattr(self, f'_run_{mode}')(jumlah, f'onb{uuid.uuid4().hex[:8]}')
+                        raise _Rollback
+                except _Rollback:
+                    pass
+
+    def _run_orm(self, jumlah, prefix):
+        def create(i):
+            User.objects.create_user(
+                username=f'{prefix}_{i}', email=f'{prefix}_{i}@example.com', password='password123',
+                role='umkm', show_password='password123'
+            )
+
+        self._phase('orm create_user', jumlah, create)
+        self._check_profiles(prefix, jumlah)
+
+        users = list(User.objects.filter(username__startswith=f'{prefix}_'))
+        self._phase('orm save ulang (full)', len(users), lambda i: users[i].save())
+        self._phase('orm save last_login', len(users), lambda i: users[i].save(update_fields=['last_login']))
+        self._check_profiles(prefix, jumlah)
+
+    def _run_api(self, jumlah, prefix):
+        admin = User.objects.create_user(
+            username=f'{prefix}_admin', password='password123', role='admin', is_staff=True
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        failed = []
+
+        def create(i):
+            response = client.post('/crud/user/', {
+                'username': f'{prefix}_{i}',
+                'email': f'{prefix}_{i}@example.com',
+                'password': 'password123',
+                'password_confirmation': 'password123',
+                'profile': {'nm_bisnis': f'Usaha {i}', 'alamat': 'Jayapura', 'tlp': '0811'},
+            }, format='json')
+            if response.status_code != 201 or 'profile' not in response.data:
+                failed.append(response.status_code)
+
+        self._phase('api POST /crud/user/', jumlah, create)
+        if failed:
+            self.stdout.write(self.style.ERROR(f'  {len(failed)} request gagal (status {Counter(failed)})'))
+        self._check_profiles(prefix, jumlah, terisi=True)
+
+    def _phase(self, name, jumlah, func):
+        counter = _QueryCounter()
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            for i in range(jumlah):
+                func(i)
+            elapsed = time.perf_counter() - start
+
+        per_user = ', '.join(
+            f'{kind} {counter.kinds[kind] / jumlah:.2f}' for kind in QUERY_KINDS + ('lainnya',)
+            if counter.kinds[kind]
+        )
+        self.stdout.write(f'[{name}] {jumlah} user')
+        self.stdout.write(
+            f'  {elapsed * 1000 / jumlah:8.3f} ms/user, {jumlah / elapsed:8.1f} user/detik'
+        )
+        self.stdout.write(f'  query per user: {per_user or "-"}')
+
+    def _check_profiles(self, prefix, jumlah, terisi=False):
+        users = User.objects.filter(username__regex=rf'^{prefix}_[0-9]+$')
+        profiles = ProfilUMKM.objects.filter(user__in=users)
+        if terisi:
+            profiles = profiles.exclude(nm_bisnis__isnull=True).exclude(nm_bisnis='')
+        tanpa_show_password = users.filter(show_password__isnull=True).count()
+        total_profiles = profiles.count()
+        if total_profiles == jumlah and not tanpa_show_password:
+            self.stdout.write(self.style.SUCCESS(f'  {total_profiles} profil UMKM, show_password tersimpan'))
+        else:
+            self.stdout.write(self.style.ERROR(
+                f'  {total_profiles}/{jumlah} profil UMKM, {tanpa_show_password} user tanpa show_password'
+            ))
+
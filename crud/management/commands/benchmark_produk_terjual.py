@@ -0,0 +1,92 @@
+# management/commands/benchmark_produk_terjual.py
+
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+from rest_framework.utils.encoders import JSONEncoder
+
+from crud.models import ProdukTerjual
+from crud.serializers.produk_terjual_serializer import (
+    ProdukTerjualSerializer, ProdukTerjualListSerializer,
+    produk_terjual_list_rows, render_produk_terjual_list, render_produk_terjual_detail_list
+)
+
+
+class Command(BaseCommand):
+    help = 'Membandingkan waktu serialisasi ProdukTerjual (ModelSerializer vs render .values())'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Jumlah baris yang diserialisasi')
+        parser.add_argument('--repeat', type=int, default=5, help='Jumlah pengulangan, diambil waktu terbaik')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+
+        base = ProdukTerjual.objects.order_by('-tgl_penjualan', 'pk')
+        available = base.count()
+        if not available:
+            self.stdout.write(self.style.WARNING('Tidak ada data ProdukTerjual untuk diukur'))
+            return
+        if available < rows:
+            self.stdout.write(self.style.WARNING(f'Hanya tersedia {available} baris'))
+            rows = available
+
+        model_queryset = base.select_related(
+            'produk__umkm__profil_umkm',
+            'produk__kategori',
+            'lokasi_penjualan__kecamatan__kabupaten__provinsi'
+        )[:rows]
+
+        cases = [
+            ('list', ProdukTerjualListSerializer, False, render_produk_terjual_list),
+            ('detail', ProdukTerjualSerializer, True, render_produk_terjual_detail_list),
+        ]
+
+        for name, serializer_class, detail, render in cases:
+            serializer_time, serializer_queries, serializer_data = self._measure(
+                repeat, lambda: serializer_class(list(model_queryset.all()), many=True).data
+            )
+            values_time, values_queries, values_data = self._measure(
+                repeat, lambda: render(list(produk_terjual_list_rows(base, detail=detail)[:rows]))
+            )
+
+            identical = self._dump(serializer_data) == self._dump(values_data)
+            per_1000 = 1000.0 / rows
+
+            self.stdout.write(f'[{name}] {rows} baris, terbaik dari {repeat}x')
+            self.stdout.write(
+                f'  ModelSerializer : {serializer_time * per_1000 * 1000:8.2f} ms/1000 baris, '
+                f'{serializer_queries} query'
+            )
+            self.stdout.write(
+                f'  .values() render: {values_time * per_1000 * 1000:8.2f} ms/1000 baris, '
+                f'{values_queries} query'
+            )
+            if identical:
+                self.stdout.write(self.style.SUCCESS('  Output identik'))
+            else:
+                self.stdout.write(self.style.ERROR('  Output BERBEDA'))
+
+    def _measure(self, repeat, func):
+        """
+        Menjalankan func beberapa kali (termasuk query database) dan mengambil waktu terbaik
+        """
+        best = None
+        data = None
+        queries = 0
+        for _ in range(repeat):
+            reset_queries()
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                data = func()
+                elapsed = time.perf_counter() - start
+            queries = len(ctx.captured_queries)
+            best = elapsed if best is None else min(best, elapsed)
+        return best, queries, data
+
+    def _dump(self, data):
+        return json.dumps(data, cls=JSONEncoder)
@@ -0,0 +1,126 @@
+# management/commands/check_list_queries.py
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Memastikan jumlah query endpoint list tidak bertambah mengikuti jumlah baris (deteksi N+1): '
+        'page_size untuk endpoint berpaginasi, jumlah baris queryset untuk yang tidak. '
+        'Gagal dengan exit code 1 jika ada endpoint yang jumlah query-nya tumbuh.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=10, help='page_size pembanding (default 10)')
+        parser.add_argument('--username', help='Jalankan sebagai user ini (default: superuser sementara)')
+        parser.add_argument('--prefix', action='append', default=[],
+                            help='Hanya cek endpoint dengan awalan URL ini, mis. /crud/produk/')
+
+    def get_routers(self):
+        from crud.urls import router as crud_router
+        from api.urls import router as api_router
+        from api.promosi_urls import promosi_router
+
+        return [('/crud/', crud_router), ('/api/', api_router), ('/api/promosi/', promosi_router)]
+
+    def get_list_endpoints(self):
+        for base, router in self.get_routers():
+            for prefix, viewset, basename in router.registry:
+                if hasattr(viewset, 'list'):
+                    yield f'{base}{prefix}/', viewset
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        failures = []
+
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['*']):
+            if options['username']:
+                user = User.objects.get(username=options['username'])
+            else:
+                user = User.objects.create(
+                    username='__check_list_queries__', role='admin', is_staff=True, is_superuser=True
+                )
+
+            client = APIClient()
+            client.raise_request_exception = False
+            client.force_authenticate(user)
+
+            for url, viewset in self.get_list_endpoints():
+                if options['prefix'] and not any(url.startswith(p) for p in options['prefix']):
+                    continue
+
+                param = getattr(viewset.pagination_class, 'page_size_query_param', None)
+                if param:
+                    # Request pertama untuk mengisi cache (count, dll) agar kedua pengukuran setara
+                    self._measure(client, url, {param: 1})
+                    small, small_rows = self._measure(client, url, {param: 1})
+                    large, large_rows = self._measure(client, url, {param: page_size})
+                else:
+                    # Tanpa paginasi: jumlah baris dibatasi lewat filter_queryset viewset
+                    with self._limit_rows(viewset, 1):
+                        self._measure(client, url, {})
+                        small, small_rows = self._measure(client, url, {})
+                    with self._limit_rows(viewset, page_size):
+                        large, large_rows = self._measure(client, url, {})
+                if small is None or large is None:
+                    self.stdout.write(f'  lewati {url} (status bukan 200)')
+                    continue
+                if large_rows <= small_rows:
+                    self.stdout.write(f'  lewati {url} (jumlah baris tidak bisa dibedakan: {small_rows})')
+                    continue
+
+                line = f'{url}: {small} query (1 baris) / {large} query ({large_rows} baris)'
+                if large > small and large_rows > small_rows:
+                    failures.append(url)
+                    self.stdout.write(self.style.ERROR(f'N+1  {line}'))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f'OK   {line}'))
+
+            # Semua data sementara (termasuk superuser) dibatalkan
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f'Jumlah query bertambah mengikuti page_size pada: {", ".join(failures)}')
+
+    @contextmanager
+    def _limit_rows(self, viewset, limit):
+        """
+        Membatasi hasil filter_queryset viewset ke `limit` baris pertama. Dibatasi lewat pk__in
+        (bukan slice) agar queryset tetap bisa difilter/diagregasi oleh view.
+        """
+        original = viewset.filter_queryset
+
+        def filter_queryset(view, queryset):
+            queryset = original(view, queryset)
+            pks = list(queryset.values_list('pk', flat=True)[:limit])
+            return queryset.filter(pk__in=pks)
+
+        viewset.filter_queryset = filter_queryset
+        try:
+            yield
+        finally:
+            viewset.filter_queryset = original
+
+    def _measure(self, client, url, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url, params)
+        if response.status_code != 200:
+            return None, 0
+        return len(ctx.captured_queries), self._count_rows(response.json())
+
+    def _count_rows(self, payload):
+        """
+        Menghitung jumlah baris pada halaman, untuk format respons dengan atau tanpa pembungkus status
+        """
+        while isinstance(payload, dict):
+            if 'data' not in payload:
+                return 0
+            payload = payload['data']
+        return len(payload) if isinstance(payload, list) else 0
@@ -0,0 +1,363 @@
+# management/commands/generate_papua_data.py
+
+import multiprocessing
+import time
+import uuid
+import zlib
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from api.utils.forecast_utils import invalidate_forecast
+from api.utils.promosi_cache import invalidate_landing_blocks
+from api.utils.statistik_utils import invalidate_statistik_wilayah
+from api.utils.umkm_cache import invalidate_umkm_list
+from crud.counters import reconcile_counters
+from crud.inventory import rebuild_bobot_penjualan
+from crud.katalog import rebuild_katalog
+from crud.models import (
+    Provinsi, Kabupaten, Kecamatan, KategoriProduk,
+    KategoriLokasi, LokasiPenjualan, ProfilUMKM, LokasiUMKM,
+    Produk, ProdukTerjual
+)
+from crud.pagination.counting import bump_count_version
+from crud.peta import invalidate_peta
+from crud.search import get_search_backend
+from crud.spatial import grid_cell
+from .populate_papua_data import (
+    KABUPATEN_DATA, KECAMATAN_DATA, KATEGORI_PRODUK_DATA, KATEGORI_LOKASI_DATA,
+    BISNIS_NAMES, LOKASI_PENJUALAN_TEMPLATES, PRODUK_DATA
+)
+
+User = get_user_model()
+
+PASSWORD = 'password123'
+
+# Data yang dibagikan ke proses worker (diwarisi lewat fork)
+_SALES_STATE = {}
+
+
+def _uuids(rng, n):
+    """
+    n UUID versi 4 dari rng, agar id ikut reproducible untuk seed yang sama
+    """
+    raw = rng.bytes(16 * n)
+    return [uuid.UUID(bytes=raw[i * 16:(i + 1) * 16], version=4) for i in range(n)]
+
+
+def _zipf_weights(rng, n, exponent):
+    """
+    Probabilitas Zipf untuk n item; peringkat popularitas diacak agar tidak mengikuti urutan pembuatan
+    """
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def _insert_sales_chunk(chunk_index):
+    """
+    Membuat satu chunk ProdukTerjual. Setiap chunk punya seed sendiri (seed + chunk_index),
+    jadi hasilnya sama berapa pun jumlah worker-nya.
+    """
+    state = _SALES_STATE
+    start = chunk_index * state['chunk_size']
+    size = min(state['chunk_size'], state['total'] - start)
+    rng = np.random.default_rng(state['seed'] + [chunk_index])
+
+    produk_idx = rng.choice(len(state['produk_ids']), size=size, p=state['produk_p'])
+    lokasi_offset = rng.choice(state['lokasi_per_umkm'], size=size, p=state['lokasi_p'])
+    lokasi_idx = state['produk_umkm'][produk_idx] * state['lokasi_per_umkm'] + lokasi_offset
+    day_offset = rng.integers(0, state['days'], size=size)
+    jumlah = rng.geometric(0.35, size=size)
+    harga_jual = (state['produk_harga'][produk_idx] * rng.uniform(0.9, 1.1, size=size)).astype(np.int64)
+    total = jumlah * harga_jual
+    ids = _uuids(rng, size)
+
+    start_date = state['start_date']
+    produk_ids = state['produk_ids']
+    lokasi_ids = state['lokasi_ids']
+    rows = [
+        ProdukTerjual(
+            id=ids[i],
+            produk_id=produk_ids[produk_idx[i]],
+            lokasi_penjualan_id=lokasi_ids[lokasi_idx[i]],
+            tgl_penjualan=start_date + timedelta(days=int(day_offset[i])),
+            jumlah_terjual=int(jumlah[i]),
+            harga_jual=int(harga_jual[i]),
+            total_penjualan=int(total[i]),
+        )
+        for i in range(size)
+    ]
+    with transaction.atomic():
+        ProdukTerjual.objects.bulk_create(rows, batch_size=state['batch_size'])
+    return size
+
+
+class Command(BaseCommand):
+    help = ('Membuat data sintetis UMKM Papua dalam jumlah besar (bulk_create, NumPy, distribusi Zipf) '
+            'untuk reproduksi masalah performa')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--umkm', type=int, default=1000, help='Jumlah UMKM baru')
+        parser.add_argument('--produk-per-umkm', type=int, default=5)
+        parser.add_argument('--lokasi-per-umkm', type=int, default=3)
+        parser.add_argument('--days', type=int, default=365, help='Rentang hari penjualan')
+        parser.add_argument('--sales-per-day', type=int, default=1000, help='Rata-rata penjualan per hari')
+        parser.add_argument('--sampai', type=str, default=None,
+                            help='Tanggal penjualan terakhir (YYYY-MM-DD, default hari ini)')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Kombinasi --seed dan --prefix yang sama menghasilkan data (termasuk id) yang sama')
+        parser.add_argument('--zipf', type=float, default=1.1,
+                            help='Eksponen Zipf popularitas produk dan lokasi penjualan')
+        parser.add_argument('--prefix', type=str, default='sintetis', help='Prefix username UMKM')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Ukuran batch bulk_create')
+        parser.add_argument('--chunk-size', type=int, default=100000, help='Penjualan per transaksi')
+        parser.add_argument('--workers', type=int, default=1, help='Jumlah proses untuk insert penjualan')
+        parser.add_argument('--tanpa-indeks', action='store_true',
+                            help='Tidak membangun ulang katalog promosi dan indeks pencarian')
+
+    def handle(self, *args, **options):
+        if options['umkm'] < 1 or options['produk_per_umkm'] < 1 or options['lokasi_per_umkm'] < 1:
+            raise CommandError('--umkm, --produk-per-umkm dan --lokasi-per-umkm minimal 1')
+        if User.objects.filter(username__startswith=f"{options['prefix']}_").exists():
+            raise CommandError(f"Data dengan prefix '{options['prefix']}' sudah ada, gunakan --prefix lain")
+
+        try:
+            sampai = datetime.strptime(options['sampai'], '%Y-%m-%d').date() if options['sampai'] else date.today()
+        except ValueError:
+            raise CommandError('--sampai harus berformat YYYY-MM-DD')
+
+        started = time.monotonic()
+        # Prefix ikut menentukan seed agar id tidak bentrok dengan data prefix lain
+        seed = [options['seed'], zlib.crc32(options['prefix'].encode())]
+        rng = np.random.default_rng(seed)
+
+        kecamatan, kategori, kategori_lokasi = self._reference_data()
+        self.stdout.write(f'Data referensi: {len(kecamatan)} kecamatan, {len(kategori)} kategori produk')
+
+        with transaction.atomic():
+            umkm_ids = self._create_umkm(rng, options, kecamatan)
+            lokasi_ids = self._create_lokasi_penjualan(rng, options, umkm_ids, kecamatan, kategori_lokasi)
+            produk_ids, produk_umkm, produk_harga = self._create_produk(rng, options, umkm_ids, kategori)
+        self.stdout.write(
+            f'{len(umkm_ids)} UMKM, {len(lokasi_ids)} lokasi penjualan, {len(produk_ids)} produk '
+            f'({time.monotonic() - started:.1f} dtk)'
+        )
+
+        total = options['days'] * options['sales_per_day']
+        _SALES_STATE.update({
+            'seed': seed,
+            'total': total,
+            'chunk_size': options['chunk_size'],
+            'batch_size': options['batch_size'],
+            'days': options['days'],
+            'start_date': sampai - timedelta(days=options['days'] - 1),
+            'produk_ids': produk_ids,
+            'produk_umkm': produk_umkm,
+            'produk_harga': produk_harga,
+            'produk_p': _zipf_weights(rng, len(produk_ids), options['zipf']),
+            'lokasi_ids': lokasi_ids,
+            'lokasi_per_umkm': options['lokasi_per_umkm'],
+            'lokasi_p': _zipf_weights(rng, options['lokasi_per_umkm'], options['zipf']),
+        })
+        self._create_sales(total, options['workers'])
+
+        # bulk_create melewati signal penghitung denormalisasi
+        reconcile_counters()
+        rebuild_bobot_penjualan()
+        for model in (User, ProfilUMKM, LokasiUMKM, LokasiPenjualan, Produk, ProdukTerjual):
+            bump_count_version(model._meta.db_table)
+        invalidate_peta()
+        invalidate_statistik_wilayah()
+        invalidate_landing_blocks()
+        invalidate_umkm_list()
+        invalidate_forecast()
+
+        if not options['tanpa_indeks']:
+            self.stdout.write('Membangun ulang katalog promosi dan indeks pencarian...')
+            rebuild_katalog()
+            get_search_backend().rebuild()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Selesai dalam {time.monotonic() - started:.1f} dtk: {total} penjualan sintetis '
+            f'dengan prefix {options["prefix"]}'
+        ))
+
+    def _reference_data(self):
+        """
+        Wilayah dan kategori Papua yang sama dengan populate_papua_data (dibuat jika belum ada)
+        """
+        papua, _ = Provinsi.objects.get_or_create(nm_provinsi='Papua')
+
+        kecamatan = []
+        for kab_data in KABUPATEN_DATA:
+            kabupaten, _ = Kabupaten.objects.get_or_create(
+                provinsi=papua,
+                nm_kabupaten=kab_data['nm_kabupaten'],
+                defaults={'kode': kab_data['kode'], 'is_kota': kab_data['is_kota']}
+            )
+            for idx, kec_name in enumerate(KECAMATAN_DATA[kabupaten.nm_kabupaten]):
+                kec, _ = Kecamatan.objects.get_or_create(
+                    kabupaten=kabupaten,
+                    nm_kecamatan=kec_name,
+                    defaults={'kode': f'{kabupaten.kode[:2]}{idx + 10}'}
+                )
+                kecamatan.append(kec.id)
+
+        kategori = {
+            kat_data['nm_kategori']: KategoriProduk.objects.get_or_create(
+                nm_kategori=kat_data['nm_kategori'], defaults={'desc': kat_data['desc']}
+            )[0].id
+            for kat_data in KATEGORI_PRODUK_DATA
+        }
+        kategori_lokasi = [
+            KategoriLokasi.objects.get_or_create(
+                nm_kategori_lokasi=kat_lok_data['nm_kategori_lokasi'], defaults={'desc': kat_lok_data['desc']}
+            )[0].id
+            for kat_lok_data in KATEGORI_LOKASI_DATA
+        ]
+        return kecamatan, kategori, kategori_lokasi
+
+    def _points(self, rng, n, kecamatan_idx, centers, spread):
+        latitudes = centers[kecamatan_idx, 0] + rng.normal(0, spread, n)
+        longitudes = centers[kecamatan_idx, 1] + rng.normal(0, spread, n)
+        return latitudes, longitudes
+
+    def _create_umkm(self, rng, options, kecamatan):
+        n = options['umkm']
+        prefix = options['prefix']
+        password = make_password(PASSWORD)
+        ids = _uuids(rng, n)
+
+        User.objects.bulk_create([
+            User(
+                id=ids[i],
+                username=f'{prefix}_{i + 1:06d}',
+                email=f'{prefix}_{i + 1:06d}@example.com',
+                first_name='UMKM',
+                last_name=f'{prefix.title()} {i + 1}',
+                role='umkm',
+                is_active=True,
+                password=password,
+                show_password=PASSWORD,
+            )
+            for i in range(n)
+        ], batch_size=options['batch_size'])
+
+        # Titik-titik mengumpul di sekitar pusat kecamatan, seperti sebaran UMKM sebenarnya
+        self.kecamatan_centers = np.column_stack([
+            rng.uniform(-8.5, -1.0, len(kecamatan)),
+            rng.uniform(135.5, 141.0, len(kecamatan)),
+        ])
+        kecamatan_idx = rng.integers(0, len(kecamatan), n)
+        latitudes, longitudes = self._points(rng, n, kecamatan_idx, self.kecamatan_centers, 0.05)
+        profil_ids, lokasi_ids = _uuids(rng, n), _uuids(rng, n)
+
+        ProfilUMKM.objects.bulk_create([
+            ProfilUMKM(
+                id=profil_ids[i],
+                user_id=ids[i],
+                nm_bisnis=f'{BISNIS_NAMES[i % len(BISNIS_NAMES)]} {i + 1}',
+                alamat=f'Alamat usaha {i + 1}',
+                tlp=f'081{rng.integers(10000000, 100000000)}',
+                desc_bisnis=f'Usaha {BISNIS_NAMES[i % len(BISNIS_NAMES)]} (data sintetis)',
+            )
+            for i in range(n)
+        ], batch_size=options['batch_size'])
+
+        LokasiUMKM.objects.bulk_create([
+            LokasiUMKM(
+                id=lokasi_ids[i],
+                pengguna_id=ids[i],
+                latitude=float(latitudes[i]),
+                longitude=float(longitudes[i]),
+                grid_cell=grid_cell(float(latitudes[i]), float(longitudes[i])),
+                alamat_lengkap=f'Jl. Sintetis No.{i + 1}',
+                kecamatan_id=kecamatan[kecamatan_idx[i]],
+                kode_pos=f'9{rng.integers(1000, 10000)}',
+            )
+            for i in range(n)
+        ], batch_size=options['batch_size'])
+        return ids
+
+    def _create_lokasi_penjualan(self, rng, options, umkm_ids, kecamatan, kategori_lokasi):
+        per_umkm = options['lokasi_per_umkm']
+        n = len(umkm_ids) * per_umkm
+        ids = _uuids(rng, n)
+        kecamatan_idx = rng.integers(0, len(kecamatan), n)
+        kategori_idx = rng.integers(0, len(kategori_lokasi), n)
+        latitudes, longitudes = self._points(rng, n, kecamatan_idx, self.kecamatan_centers, 0.1)
+
+        # Urutan baris = umkm_index * per_umkm + offset, dipakai saat memilih lokasi untuk penjualan
+        rows = []
+        for i in range(n):
+            umkm_index, offset = divmod(i, per_umkm)
+            template = LOKASI_PENJUALAN_TEMPLATES[offset % len(LOKASI_PENJUALAN_TEMPLATES)]
+            rows.append(LokasiPenjualan(
+                id=ids[i],
+                umkm_id=umkm_ids[umkm_index],
+                nm_lokasi=f"{template['nm_lokasi']} {offset + 1}",
+                alamat=template['alamat'],
+                latitude=float(latitudes[i]),
+                longitude=float(longitudes[i]),
+                grid_cell=grid_cell(float(latitudes[i]), float(longitudes[i])),
+                kecamatan_id=kecamatan[kecamatan_idx[i]],
+                kategori_lokasi_id=kategori_lokasi[kategori_idx[i]],
+                aktif=True,
+            ))
+        LokasiPenjualan.objects.bulk_create(rows, batch_size=options['batch_size'])
+        return ids
+
+    def _create_produk(self, rng, options, umkm_ids, kategori):
+        per_umkm = options['produk_per_umkm']
+        n = len(umkm_ids) * per_umkm
+        ids = _uuids(rng, n)
+        template_idx = rng.integers(0, len(PRODUK_DATA), n)
+        harga_range = np.array([PRODUK_DATA[t]['harga_range'] for t in template_idx])
+        harga = rng.integers(harga_range[:, 0], harga_range[:, 1] + 1)
+        stok = rng.integers(0, 200, n)
+        produk_umkm = np.arange(n) // per_umkm
+
+        rows = []
+        for i in range(n):
+            template = PRODUK_DATA[template_idx[i]]
+            rows.append(Produk(
+                id=ids[i],
+                umkm_id=umkm_ids[produk_umkm[i]],
+                kategori_id=kategori[template['kategori']],
+                nm_produk=f"{template['nm_produk']} {i % per_umkm + 1}",
+                desc=f"Produk {template['nm_produk']} (data sintetis)",
+                harga=int(harga[i]),
+                stok=int(stok[i]),
+                satuan=template['satuan'],
+                aktif=True,
+            ))
+        Produk.objects.bulk_create(rows, batch_size=options['batch_size'])
+        return ids, produk_umkm, harga
+
+    def _create_sales(self, total, workers):
+        chunk_count = -(-total // _SALES_STATE['chunk_size'])
+        started = time.monotonic()
+        done = 0
+
+        def report(size):
+            nonlocal done
+            done += size
+            elapsed = time.monotonic() - started
+            self.stdout.write(f'  {done}/{total} penjualan ({done / max(elapsed, 1e-9):,.0f} baris/dtk)')
+
+        if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            # Koneksi induk tidak boleh dipakai bersama oleh proses anak
+            connections.close_all()
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                for size in pool.imap_unordered(_insert_sales_chunk, range(chunk_count)):
+                    report(size)
+        else:
+            if workers > 1:
+                self.stdout.write(self.style.WARNING('Multiprocessing butuh fork, dijalankan dengan 1 proses'))
+            for chunk_index in range(chunk_count):
+                report(_insert_sales_chunk(chunk_index))
@@ -0,0 +1,54 @@
+# management/commands/onboarding_umkm.py
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.utils.onboarding import DEFAULT_WORKERS, OnboardingError, baca_file, onboard_umkm
+
+
+class Command(BaseCommand):
+    help = 'Onboarding UMKM massal dari file CSV/XLSX (kolom sama dengan endpoint /api/onboarding-umkm/)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help='Path file .csv atau .xlsx')
+        parser.add_argument('--cek', action='store_true', help='Hanya memvalidasi, tanpa menyimpan')
+        parser.add_argument('--simpan-sebagian', action='store_true',
+                            help='Simpan baris yang valid walaupun ada baris bermasalah')
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                            help='Jumlah proses untuk hashing password')
+        parser.add_argument('--output', help='Tulis hasil lengkap (termasuk password acak) ke file JSON')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            with open(options['file'], 'rb') as f:
+                rows = baca_file(f, options['file'])
+            hasil = onboard_umkm(
+                rows, simpan_sebagian=options['simpan_sebagian'], cek=options['cek'], workers=options['workers']
+            )
+        except OSError as e:
+            raise CommandError(f'File tidak dapat dibuka: {e}')
+        except OnboardingError as e:
+            raise CommandError(str(e))
+
+        for error in hasil['errors']:
+            detail = '; '.join(
+                f'{field}: {" ".join(str(message) for message in messages)}'
+                for field, messages in error['errors'].items()
+            )
+            self.stdout.write(self.style.WARNING(f"Baris {error['baris']} ({error['username']}): {detail}"))
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(hasil, f, cls=JSONEncoder, ensure_ascii=False, indent=2)
+
+        summary = (
+            f"{hasil['total_baris']} baris, {hasil['valid']} valid, {len(hasil['errors'])} bermasalah, "
+            f"{hasil['dibuat']} UMKM dibuat ({time.monotonic() - started:.1f} dtk)"
+        )
+        if hasil['errors'] and not hasil['dibuat'] and not options['cek']:
+            raise CommandError(f'{summary}. Tidak ada yang disimpan, perbaiki file atau gunakan --simpan-sebagian')
+        self.stdout.write(self.style.SUCCESS(summary) if not hasil['errors'] else summary)
@@ -6,6 +6,7 @@ from datetime import date, timedelta
 
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.utils import timezone
 
 from crud.models import (
@@ -16,6 +17,124 @@ from crud.models import (
 
 User = get_user_model()
 
+# Data referensi Papua, dipakai juga oleh generate_papua_data
+KABUPATEN_DATA = [
+    {'nm_kabupaten': 'Jayapura', 'kode': '9471', 'is_kota': True},
+    {'nm_kabupaten': 'Biak Numfor', 'kode': '9403', 'is_kota': False},
+    {'nm_kabupaten': 'Sarmi', 'kode': '9406', 'is_kota': False},
+    {'nm_kabupaten': 'Keerom', 'kode': '9407', 'is_kota': False},
+    {'nm_kabupaten': 'Tolikara', 'kode': '9417', 'is_kota': False},
+    {'nm_kabupaten': 'Mimika', 'kode': '9410', 'is_kota': False},
+    {'nm_kabupaten': 'Paniai', 'kode': '9415', 'is_kota': False},
+    {'nm_kabupaten': 'Merauke', 'kode': '9401', 'is_kota': False},
+    {'nm_kabupaten': 'Nabire', 'kode': '9408', 'is_kota': False},
+    {'nm_kabupaten': 'Yahukimo', 'kode': '9459', 'is_kota': False},
+]
+
+KECAMATAN_DATA = {
+    'Jayapura': ['Abepura', 'Heram', 'Muara Tami', 'Sentani'],
+    'Biak Numfor': ['Biak Kota', 'Numfor Barat', 'Biak Timur', 'Yendidori'],
+    'Sarmi': ['Sarmi', 'Pantai Barat', 'Bonggo', 'Tor Atas'],
+    'Keerom': ['Arso', 'Waris', 'Senggi', 'Skanto'],
+    'Tolikara': ['Karubaga', 'Wouma', 'Kanggime', 'Bokondini'],
+    'Mimika': ['Mimika Baru', 'Kuala Kencana', 'Tembagapura', 'Agimuga'],
+    'Paniai': ['Paniai Timur', 'Paniai Barat', 'Aradide', 'Bogabaida'],
+    'Merauke': ['Merauke', 'Muting', 'Kurik', 'Jagebob'],
+    'Nabire': ['Nabire', 'Teluk Umar', 'Uwapa', 'Makimi'],
+    'Yahukimo': ['Sumohai', 'Yahukimo', 'Kurulu', 'Anggruk'],
+}
+
+KATEGORI_PRODUK_DATA = [
+    {'nm_kategori': 'Kerajinan Tangan', 'desc': 'Produk kerajinan tradisional Papua'},
+    {'nm_kategori': 'Makanan Tradisional', 'desc': 'Makanan khas Papua'},
+    {'nm_kategori': 'Minuman Tradisional', 'desc': 'Minuman khas daerah'},
+    {'nm_kategori': 'Pakaian & Aksesoris', 'desc': 'Pakaian dan aksesoris tradisional'},
+    {'nm_kategori': 'Produk Pertanian', 'desc': 'Hasil pertanian dan perkebunan'},
+    {'nm_kategori': 'Produk Perikanan', 'desc': 'Hasil laut dan perikanan'},
+    {'nm_kategori': 'Obat Tradisional', 'desc': 'Jamu dan obat herbal tradisional'},
+    {'nm_kategori': 'Hasil Hutan', 'desc': 'Produk dari hasil hutan'},
+]
+
+KATEGORI_LOKASI_DATA = [
+    {'nm_kategori_lokasi': 'Pasar Tradisional', 'desc': 'Pasar tradisional dan pasar rakyat'},
+    {'nm_kategori_lokasi': 'Toko Retail', 'desc': 'Toko eceran dan retail modern'},
+    {'nm_kategori_lokasi': 'Online Marketplace', 'desc': 'Platform penjualan online'},
+    {'nm_kategori_lokasi': 'Galeri & Showroom', 'desc': 'Galeri seni dan showroom produk'},
+    {'nm_kategori_lokasi': 'Koperasi', 'desc': 'Koperasi dan unit usaha bersama'},
+    {'nm_kategori_lokasi': 'Supermarket', 'desc': 'Supermarket dan hypermarket'},
+    {'nm_kategori_lokasi': 'Event & Pameran', 'desc': 'Pameran temporer dan event'},
+    {'nm_kategori_lokasi': 'Direct Selling', 'desc': 'Penjualan langsung door to door'},
+]
+
+BISNIS_NAMES = [
+    'Kerajinan Tangan Papua Asli',
+    'Makanan Tradisional Sentani',
+    'Batik Papua Modern',
+    'Keripik Sagu Krispi',
+    'Tas Noken Tradisional',
+    'Kopi Arabica Baliem',
+    'Madu Hutan Papua',
+    'Kerajinan Kulit Kayu',
+    'Teh Herbal Papua',
+    'Souvenir Papua Authentic',
+    'Makanan Ringan Ubi',
+    'Kerajinan Batu Akik',
+    'Sambal Roa Khas Papua',
+    'Anyaman Pandan',
+    'Minuman Tradisional Sagu',
+]
+
+LOKASI_PENJUALAN_TEMPLATES = [
+    {'nm_lokasi': 'Outlet Utama', 'alamat': 'Jl. Raya Sentani, Jayapura'},
+    {'nm_lokasi': 'Cabang Pasar', 'alamat': 'Pasar Tradisional'},
+    {'nm_lokasi': 'Toko Online', 'alamat': 'Platform Digital'},
+    {'nm_lokasi': 'Stand Pameran', 'alamat': 'Event Center'},
+    {'nm_lokasi': 'Kios Pasar', 'alamat': 'Pasar Rakyat'},
+]
+
+PRODUK_DATA = [
+    {'nm_produk': 'Tas Noken Asli', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
+     'harga_range': (150000, 500000)},
+    {'nm_produk': 'Keripik Sagu Original', 'kategori': 'Makanan Tradisional', 'satuan': 'pack',
+     'harga_range': (25000, 50000)},
+    {'nm_produk': 'Topi Cendrawasih', 'kategori': 'Pakaian & Aksesoris', 'satuan': 'buah',
+     'harga_range': (100000, 200000)},
+    {'nm_produk': 'Kopi Arabica Baliem', 'kategori': 'Produk Pertanian', 'satuan': 'kg',
+     'harga_range': (120000, 180000)},
+    {'nm_produk': 'Madu Hutan Murni', 'kategori': 'Hasil Hutan', 'satuan': 'botol',
+     'harga_range': (80000, 150000)},
+    {'nm_produk': 'Sambal Roa Khas', 'kategori': 'Makanan Tradisional', 'satuan': 'botol',
+     'harga_range': (35000, 60000)},
+    {'nm_produk': 'Teh Herbal Daun Wati', 'kategori': 'Obat Tradisional', 'satuan': 'pack',
+     'harga_range': (40000, 80000)},
+    {'nm_produk': 'Kerajinan Kulit Kayu', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
+     'harga_range': (200000, 400000)},
+    {'nm_produk': 'Ikan Asin Kering', 'kategori': 'Produk Perikanan', 'satuan': 'kg',
+     'harga_range': (60000, 100000)},
+    {'nm_produk': 'Batik Papua Motif Cendrawasih', 'kategori': 'Pakaian & Aksesoris', 'satuan': 'buah',
+     'harga_range': (250000, 450000)},
+    {'nm_produk': 'Anyaman Pandan Mini', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
+     'harga_range': (50000, 100000)},
+    {'nm_produk': 'Dodol Sagu', 'kategori': 'Makanan Tradisional', 'satuan': 'pack',
+     'harga_range': (30000, 50000)},
+    {'nm_produk': 'Gelang Manik Tradisional', 'kategori': 'Pakaian & Aksesoris', 'satuan': 'buah',
+     'harga_range': (75000, 150000)},
+    {'nm_produk': 'Gula Aren Organik', 'kategori': 'Produk Pertanian', 'satuan': 'kg',
+     'harga_range': (45000, 70000)},
+    {'nm_produk': 'Kerupuk Ikan Mas', 'kategori': 'Makanan Tradisional', 'satuan': 'pack',
+     'harga_range': (20000, 35000)},
+    {'nm_produk': 'Kalung Kerang Laut', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
+     'harga_range': (80000, 120000)},
+    {'nm_produk': 'Minuman Sagu Tradisional', 'kategori': 'Minuman Tradisional', 'satuan': 'botol',
+     'harga_range': (15000, 25000)},
+    {'nm_produk': 'Ukiran Kayu Ironwood', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
+     'harga_range': (300000, 800000)},
+    {'nm_produk': 'Beras Merah Organik', 'kategori': 'Produk Pertanian', 'satuan': 'kg',
+     'harga_range': (25000, 40000)},
+    {'nm_produk': 'Jamu Tradisional Papua', 'kategori': 'Obat Tradisional', 'satuan': 'botol',
+     'harga_range': (50000, 100000)},
+]
+
 
 class Command(BaseCommand):
     help = 'Populate database with Papua-focused UMKM data'
@@ -31,21 +150,8 @@ class Command(BaseCommand):
             self.stdout.write(f'Created: {papua}')
 
         # 2. Create Kabupaten/Kota di Papua
-        kabupaten_data = [
-            {'nm_kabupaten': 'Jayapura', 'kode': '9471', 'is_kota': True},
-            {'nm_kabupaten': 'Biak Numfor', 'kode': '9403', 'is_kota': False},
-            {'nm_kabupaten': 'Sarmi', 'kode': '9406', 'is_kota': False},
-            {'nm_kabupaten': 'Keerom', 'kode': '9407', 'is_kota': False},
-            {'nm_kabupaten': 'Tolikara', 'kode': '9417', 'is_kota': False},
-            {'nm_kabupaten': 'Mimika', 'kode': '9410', 'is_kota': False},
-            {'nm_kabupaten': 'Paniai', 'kode': '9415', 'is_kota': False},
-            {'nm_kabupaten': 'Merauke', 'kode': '9401', 'is_kota': False},
-            {'nm_kabupaten': 'Nabire', 'kode': '9408', 'is_kota': False},
-            {'nm_kabupaten': 'Yahukimo', 'kode': '9459', 'is_kota': False},
-        ]
-
         kabupaten_objects = []
-        for kab_data in kabupaten_data:
+        for kab_data in KABUPATEN_DATA:
             kabupaten, created = Kabupaten.objects.get_or_create(
                 provinsi=papua,
                 nm_kabupaten=kab_data['nm_kabupaten'],
@@ -59,23 +165,10 @@ class Command(BaseCommand):
                 self.stdout.write(f'Created: {kabupaten}')
 
         # 3. Create Kecamatan
-        kecamatan_data = {
-            'Jayapura': ['Abepura', 'Heram', 'Muara Tami', 'Sentani'],
-            'Biak Numfor': ['Biak Kota', 'Numfor Barat', 'Biak Timur', 'Yendidori'],
-            'Sarmi': ['Sarmi', 'Pantai Barat', 'Bonggo', 'Tor Atas'],
-            'Keerom': ['Arso', 'Waris', 'Senggi', 'Skanto'],
-            'Tolikara': ['Karubaga', 'Wouma', 'Kanggime', 'Bokondini'],
-            'Mimika': ['Mimika Baru', 'Kuala Kencana', 'Tembagapura', 'Agimuga'],
-            'Paniai': ['Paniai Timur', 'Paniai Barat', 'Aradide', 'Bogabaida'],
-            'Merauke': ['Merauke', 'Muting', 'Kurik', 'Jagebob'],
-            'Nabire': ['Nabire', 'Teluk Umar', 'Uwapa', 'Makimi'],
-            'Yahukimo': ['Sumohai', 'Yahukimo', 'Kurulu', 'Anggruk'],
-        }
-
         kecamatan_objects = []
         for kabupaten in kabupaten_objects:
-            if kabupaten.nm_kabupaten in kecamatan_data:
-                for kec_name in kecamatan_data[kabupaten.nm_kabupaten]:
+            if kabupaten.nm_kabupaten in KECAMATAN_DATA:
+                for kec_name in KECAMATAN_DATA[kabupaten.nm_kabupaten]:
                     kecamatan, created = Kecamatan.objects.get_or_create(
                         kabupaten=kabupaten,
                         nm_kecamatan=kec_name,
@@ -86,19 +179,8 @@ class Command(BaseCommand):
                         self.stdout.write(f'Created: {kecamatan}')
 
         # 4. Create Kategori Produk
-        kategori_data = [
-            {'nm_kategori': 'Kerajinan Tangan', 'desc': 'Produk kerajinan tradisional Papua'},
-            {'nm_kategori': 'Makanan Tradisional', 'desc': 'Makanan khas Papua'},
-            {'nm_kategori': 'Minuman Tradisional', 'desc': 'Minuman khas daerah'},
-            {'nm_kategori': 'Pakaian & Aksesoris', 'desc': 'Pakaian dan aksesoris tradisional'},
-            {'nm_kategori': 'Produk Pertanian', 'desc': 'Hasil pertanian dan perkebunan'},
-            {'nm_kategori': 'Produk Perikanan', 'desc': 'Hasil laut dan perikanan'},
-            {'nm_kategori': 'Obat Tradisional', 'desc': 'Jamu dan obat herbal tradisional'},
-            {'nm_kategori': 'Hasil Hutan', 'desc': 'Produk dari hasil hutan'},
-        ]
-
         kategori_objects = []
-        for kat_data in kategori_data:
+        for kat_data in KATEGORI_PRODUK_DATA:
             kategori, created = KategoriProduk.objects.get_or_create(
                 nm_kategori=kat_data['nm_kategori'],
                 defaults={'desc': kat_data['desc']}
@@ -108,19 +190,8 @@ class Command(BaseCommand):
                 self.stdout.write(f'Created: {kategori}')
 
         # 5. Create Kategori Lokasi (NEW)
-        kategori_lokasi_data = [
-            {'nm_kategori_lokasi': 'Pasar Tradisional', 'desc': 'Pasar tradisional dan pasar rakyat'},
-            {'nm_kategori_lokasi': 'Toko Retail', 'desc': 'Toko eceran dan retail modern'},
-            {'nm_kategori_lokasi': 'Online Marketplace', 'desc': 'Platform penjualan online'},
-            {'nm_kategori_lokasi': 'Galeri & Showroom', 'desc': 'Galeri seni dan showroom produk'},
-            {'nm_kategori_lokasi': 'Koperasi', 'desc': 'Koperasi dan unit usaha bersama'},
-            {'nm_kategori_lokasi': 'Supermarket', 'desc': 'Supermarket dan hypermarket'},
-            {'nm_kategori_lokasi': 'Event & Pameran', 'desc': 'Pameran temporer dan event'},
-            {'nm_kategori_lokasi': 'Direct Selling', 'desc': 'Penjualan langsung door to door'},
-        ]
-
         kategori_lokasi_objects = []
-        for kat_lok_data in kategori_lokasi_data:
+        for kat_lok_data in KATEGORI_LOKASI_DATA:
             kategori_lokasi, created = KategoriLokasi.objects.get_or_create(
                 nm_kategori_lokasi=kat_lok_data['nm_kategori_lokasi'],
                 defaults={'desc': kat_lok_data['desc']}
@@ -159,39 +230,19 @@ class Command(BaseCommand):
                     'last_name': user_data['last_name'],
                     'role': 'umkm',  # Assuming you have a role field
                     'is_active': True,
-                    'show_password': 'password123'  # Updated field name
+                    'show_password': 'password123',  # Updated field name
+                    'password': make_password('password123')
                 }
             )
-            if created:
-                user.set_password('password123')
-                user.save()
             umkm_users.append(user)
             if created:
                 self.stdout.write(f'Created user: {user}')
 
         # 7. Update ProfilUMKM (akan dibuat otomatis oleh signal, tapi kita update)
-        bisnis_names = [
-            'Kerajinan Tangan Papua Asli',
-            'Makanan Tradisional Sentani',
-            'Batik Papua Modern',
-            'Keripik Sagu Krispi',
-            'Tas Noken Tradisional',
-            'Kopi Arabica Baliem',
-            'Madu Hutan Papua',
-            'Kerajinan Kulit Kayu',
-            'Teh Herbal Papua',
-            'Souvenir Papua Authentic',
-            'Makanan Ringan Ubi',
-            'Kerajinan Batu Akik',
-            'Sambal Roa Khas Papua',
-            'Anyaman Pandan',
-            'Minuman Tradisional Sagu',
-        ]
-
         for i, user in enumerate(umkm_users):
             try:
                 profil = user.profil_umkm
-                profil.nm_bisnis = bisnis_names[i % len(bisnis_names)]
+                profil.nm_bisnis = BISNIS_NAMES[i % len(BISNIS_NAMES)]
                 profil.alamat = f'Alamat lengkap di {random.choice(kecamatan_objects).nm_kecamatan}'
                 profil.tlp = f'081{random.randint(10000000, 99999999)}'
                 profil.desc_bisnis = f'Usaha {profil.nm_bisnis} yang telah berjalan sejak beberapa tahun dengan produk berkualitas tinggi.'
@@ -201,10 +252,10 @@ class Command(BaseCommand):
                 # Create manually if signal didn't work
                 profil = ProfilUMKM.objects.create(
                     user=user,
-                    nm_bisnis=bisnis_names[i % len(bisnis_names)],
+                    nm_bisnis=BISNIS_NAMES[i % len(BISNIS_NAMES)],
                     alamat=f'Alamat lengkap di {random.choice(kecamatan_objects).nm_kecamatan}',
                     tlp=f'081{random.randint(10000000, 99999999)}',
-                    desc_bisnis=f'Usaha {bisnis_names[i % len(bisnis_names)]} yang telah berjalan sejak beberapa tahun.'
+                    desc_bisnis=f'Usaha {BISNIS_NAMES[i % len(BISNIS_NAMES)]} yang telah berjalan sejak beberapa tahun.'
                 )
                 self.stdout.write(f'Created profil: {profil}')
 
@@ -225,21 +276,13 @@ class Command(BaseCommand):
                 self.stdout.write(f'Created lokasi UMKM: {lokasi_umkm}')
 
         # 9. Create Lokasi Penjualan (UPDATED - now assigned to specific UMKM)
-        lokasi_penjualan_templates = [
-            {'nm_lokasi': 'Outlet Utama', 'alamat': 'Jl. Raya Sentani, Jayapura'},
-            {'nm_lokasi': 'Cabang Pasar', 'alamat': 'Pasar Tradisional'},
-            {'nm_lokasi': 'Toko Online', 'alamat': 'Platform Digital'},
-            {'nm_lokasi': 'Stand Pameran', 'alamat': 'Event Center'},
-            {'nm_lokasi': 'Kios Pasar', 'alamat': 'Pasar Rakyat'},
-        ]
-
         lokasi_penjualan_objects = []
         # Create lokasi penjualan for each UMKM
         for user in umkm_users:
             # Each UMKM gets 1-3 lokasi penjualan
             num_lokasi = random.randint(1, 3)
             for i in range(num_lokasi):
-                template = random.choice(lokasi_penjualan_templates)
+                template = random.choice(LOKASI_PENJUALAN_TEMPLATES)
                 kecamatan = random.choice(kecamatan_objects)
                 kategori_lokasi = random.choice(kategori_lokasi_objects)
 
@@ -264,52 +307,9 @@ class Command(BaseCommand):
                     self.stdout.write(f'Created: {lokasi}')
 
         # 10. Create Produk
-        produk_data = [
-            {'nm_produk': 'Tas Noken Asli', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
-             'harga_range': (150000, 500000)},
-            {'nm_produk': 'Keripik Sagu Original', 'kategori': 'Makanan Tradisional', 'satuan': 'pack',
-             'harga_range': (25000, 50000)},
-            {'nm_produk': 'Topi Cendrawasih', 'kategori': 'Pakaian & Aksesoris', 'satuan': 'buah',
-             'harga_range': (100000, 200000)},
-            {'nm_produk': 'Kopi Arabica Baliem', 'kategori': 'Produk Pertanian', 'satuan': 'kg',
-             'harga_range': (120000, 180000)},
-            {'nm_produk': 'Madu Hutan Murni', 'kategori': 'Hasil Hutan', 'satuan': 'botol',
-             'harga_range': (80000, 150000)},
-            {'nm_produk': 'Sambal Roa Khas', 'kategori': 'Makanan Tradisional', 'satuan': 'botol',
-             'harga_range': (35000, 60000)},
-            {'nm_produk': 'Teh Herbal Daun Wati', 'kategori': 'Obat Tradisional', 'satuan': 'pack',
-             'harga_range': (40000, 80000)},
-            {'nm_produk': 'Kerajinan Kulit Kayu', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
-             'harga_range': (200000, 400000)},
-            {'nm_produk': 'Ikan Asin Kering', 'kategori': 'Produk Perikanan', 'satuan': 'kg',
-             'harga_range': (60000, 100000)},
-            {'nm_produk': 'Batik Papua Motif Cendrawasih', 'kategori': 'Pakaian & Aksesoris', 'satuan': 'buah',
-             'harga_range': (250000, 450000)},
-            {'nm_produk': 'Anyaman Pandan Mini', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
-             'harga_range': (50000, 100000)},
-            {'nm_produk': 'Dodol Sagu', 'kategori': 'Makanan Tradisional', 'satuan': 'pack',
-             'harga_range': (30000, 50000)},
-            {'nm_produk': 'Gelang Manik Tradisional', 'kategori': 'Pakaian & Aksesoris', 'satuan': 'buah',
-             'harga_range': (75000, 150000)},
-            {'nm_produk': 'Gula Aren Organik', 'kategori': 'Produk Pertanian', 'satuan': 'kg',
-             'harga_range': (45000, 70000)},
-            {'nm_produk': 'Kerupuk Ikan Mas', 'kategori': 'Makanan Tradisional', 'satuan': 'pack',
-             'harga_range': (20000, 35000)},
-            {'nm_produk': 'Kalung Kerang Laut', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
-             'harga_range': (80000, 120000)},
-            {'nm_produk': 'Minuman Sagu Tradisional', 'kategori': 'Minuman Tradisional', 'satuan': 'botol',
-             'harga_range': (15000, 25000)},
-            {'nm_produk': 'Ukiran Kayu Ironwood', 'kategori': 'Kerajinan Tangan', 'satuan': 'buah',
-             'harga_range': (300000, 800000)},
-            {'nm_produk': 'Beras Merah Organik', 'kategori': 'Produk Pertanian', 'satuan': 'kg',
-             'harga_range': (25000, 40000)},
-            {'nm_produk': 'Jamu Tradisional Papua', 'kategori': 'Obat Tradisional', 'satuan': 'botol',
-             'harga_range': (50000, 100000)},
-        ]
-
         produk_objects = []
         # Distribute products among UMKMs
-        for i, prod_data in enumerate(produk_data):
+        for i, prod_data in enumerate(PRODUK_DATA):
             umkm = umkm_users[i % len(umkm_users)]
             kategori = next((k for k in kategori_objects if k.nm_kategori == prod_data['kategori']),
                             random.choice(kategori_objects))
@@ -339,7 +339,7 @@ class Command(BaseCommand):
             if len(user_products) < 2:
                 # Create additional products for this UMKM
                 for j in range(2 - len(user_products)):
-                    template = random.choice(produk_data)
+                    template = random.choice(PRODUK_DATA)
                     kategori = next((k for k in kategori_objects if k.nm_kategori == template['kategori']),
                                     random.choice(kategori_objects))
                     harga = random.randint(template['harga_range'][0], template['harga_range'][1])
@@ -370,9 +370,14 @@ class Command(BaseCommand):
             if umkm_lokasi:  # Only create sales if UMKM has lokasi
                 # Create 3-8 sales records per product
                 num_sales = random.randint(3, 8)
+                # Penjualan mengurangi stok dan tidak boleh melebihinya
+                sisa_stok = produk.stok
                 for _ in range(num_sales):
                     tgl_penjualan = start_date + timedelta(days=random.randint(0, 90))
-                    jumlah_terjual = random.randint(1, 10)
+                    jumlah_terjual = min(random.randint(1, 10), sisa_stok)
+                    if not jumlah_terjual:
+                        break
+                    sisa_stok -= jumlah_terjual
                     harga_jual = int(produk.harga * random.uniform(0.9, 1.1))  # Price variation ±10%
 
                     # Use lokasi from same UMKM
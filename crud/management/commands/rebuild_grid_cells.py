@@ -0,0 +1,17 @@
+# management/commands/rebuild_grid_cells.py
+
+from django.core.management.base import BaseCommand
+
+from crud.models import LokasiPenjualan, LokasiUMKM
+from crud.spatial import rebuild_grid_cells
+
+
+class Command(BaseCommand):
+    help = 'Mengisi ulang kolom grid_cell LokasiPenjualan dan LokasiUMKM untuk pencarian lokasi terdekat'
+
+    def handle(self, *args, **options):
+        for model in (LokasiPenjualan, LokasiUMKM):
+            total = rebuild_grid_cells(model)
+            self.stdout.write(self.style.SUCCESS(
+                f'{model._meta.verbose_name_plural}: {total} baris diperbarui'
+            ))
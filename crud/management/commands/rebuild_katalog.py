@@ -0,0 +1,14 @@
+# management/commands/rebuild_katalog.py
+
+from django.core.management.base import BaseCommand
+
+from crud.katalog import rebuild_katalog
+
+
+class Command(BaseCommand):
+    help = 'Membangun ulang read model katalog promosi (tabel katalog_produk) dari tabel produk'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Membangun ulang katalog produk...')
+        total = rebuild_katalog()
+        self.stdout.write(self.style.SUCCESS(f'Selesai, {total} produk masuk katalog'))
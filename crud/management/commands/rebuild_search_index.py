@@ -0,0 +1,15 @@
+# management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+
+from crud.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Membangun ulang indeks pencarian katalog produk'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        self.stdout.write('Membangun ulang indeks pencarian...')
+        total = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Selesai, {total or 0} produk diindeks'))
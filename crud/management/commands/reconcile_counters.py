@@ -0,0 +1,47 @@
+# management/commands/reconcile_counters.py
+
+from django.core.management.base import BaseCommand
+
+from api.utils.promosi_cache import invalidate_landing_blocks
+from api.utils.umkm_cache import invalidate_umkm_list
+from crud.counters import reconcile_counters
+from crud.inventory import rebuild_bobot_penjualan
+
+
+class Command(BaseCommand):
+    help = (
+        'Menghitung ulang penghitung denormalisasi (jumlah produk/lokasi UMKM, produk aktif '
+        'per kategori, transaksi per lokasi penjualan, bobot kecepatan jual produk) dari tabel sumber'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cek', action='store_true',
+                            help='Hanya melaporkan baris yang menyimpang, tanpa memperbaiki')
+
+    def handle(self, *args, **options):
+        perbaiki = not options['cek']
+        hasil = reconcile_counters(perbaiki=perbaiki)
+
+        total = 0
+        for counter, drift in hasil:
+            total += drift
+            label = f'{counter.target._meta.db_table}.{counter.field}'
+            if drift:
+                self.stdout.write(self.style.WARNING(f'{label}: {drift} baris menyimpang'))
+            else:
+                self.stdout.write(f'{label}: sesuai')
+
+        drift = rebuild_bobot_penjualan(perbaiki=perbaiki)
+        total += drift
+        if drift:
+            self.stdout.write(self.style.WARNING(f'produk.bobot_penjualan: {drift} baris menyimpang'))
+        else:
+            self.stdout.write('produk.bobot_penjualan: sesuai')
+
+        if total and perbaiki:
+            # Perbaikan lewat queryset.update() tidak mengirim signal invalidasi cache
+            invalidate_umkm_list()
+            invalidate_landing_blocks()
+            self.stdout.write(self.style.SUCCESS(f'{total} baris diperbaiki'))
+        elif not total:
+            self.stdout.write(self.style.SUCCESS('Semua penghitung sesuai'))
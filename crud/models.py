@@ -2,8 +2,7 @@
 import os
 import uuid
 
-from django.db import models
-from django.contrib.auth.models import User
+from django.db import models, transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
@@ -12,6 +11,8 @@ from PIL import Image  # Tambahkan ini di bagian import
 
 
 from thobias import settings
+from . import spatial
+from .indexes import FullTextIndex
 
 
 class Provinsi(models.Model):
@@ -84,6 +85,7 @@ class ProfilUMKM(models.Model):
     fb_link = models.URLField(blank=True, null=True)
     ig_link = models.URLField(blank=True, null=True)
     tiktok_link = models.URLField(blank=True, null=True)
+    tgl_update = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.user.username} - {self.nm_bisnis}"
@@ -93,19 +95,17 @@ class ProfilUMKM(models.Model):
         ordering = ['user', 'nm_bisnis']
 
 
-# Signal untuk membuat profil UMKM otomatis saat user dengan role='umkm' dibuat
-@receiver(post_save, sender=User)
-def create_or_update_user_profile(sender, instance, created, **kwargs):
-    # Hanya buat profil jika user adalah UMKM
-    if instance.role == 'umkm':
-        if created:
-            ProfilUMKM.objects.create(user=instance)
-        else:
-            # Jika user sudah ada, pastikan profil juga ada
-            try:
-                instance.profil_umkm.save()
-            except ProfilUMKM.DoesNotExist:
-                ProfilUMKM.objects.create(user=instance)
+# Signal untuk membuat profil UMKM otomatis saat user dengan role='umkm' disimpan
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def create_user_profile(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or instance.role != 'umkm':
+        return
+    # Save parsial tanpa kolom role (mis. last_login saat login) tidak mengubah kebutuhan profil
+    if not created and update_fields is not None and 'role' not in update_fields:
+        return
+    # Satu INSERT ... ON CONFLICT DO NOTHING (INSERT IGNORE di MySQL): profil yang sudah ada tidak disentuh.
+    # bulk_create tidak mengirim signal; profil kosong tidak mengubah katalog/daftar UMKM.
+    ProfilUMKM.objects.bulk_create([ProfilUMKM(user=instance)], ignore_conflicts=True)
 
 
 class LokasiUMKM(models.Model):
@@ -116,11 +116,19 @@ class LokasiUMKM(models.Model):
     pengguna = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='lokasi_umkm')
     latitude = models.FloatField()
     longitude = models.FloatField()
+    grid_cell = models.BigIntegerField(null=True, blank=True, editable=False, db_index=True,
+                                       help_text="Sel grid koordinat untuk pencarian lokasi terdekat")
     alamat_lengkap = models.TextField()
     kecamatan = models.ForeignKey(Kecamatan, on_delete=models.PROTECT, related_name='lokasi_umkm')
     kode_pos = models.CharField(max_length=10, blank=True, null=True)
     tgl_update = models.DateTimeField(auto_now=True)
 
+    def save(self, *args, **kwargs):
+        self.grid_cell = spatial.grid_cell(self.latitude, self.longitude)
+        if 'update_fields' in kwargs:
+            kwargs['update_fields'] = spatial.grid_update_fields(kwargs['update_fields'])
+        super().save(*args, **kwargs)
+
     def __str__(self):
         nm_bisnis = getattr(getattr(self.pengguna, 'profil_umkm', None), 'nm_bisnis', self.pengguna.username)
         return f"Lokasi {nm_bisnis} - {self.alamat_lengkap}"
@@ -139,6 +147,9 @@ class KategoriProduk(models.Model):
     nm_kategori = models.CharField(max_length=100)
     jasa=models.TextField(blank=True, null=True)
     desc = models.TextField(blank=True, null=True)
+    # Dijaga oleh crud/counters.py
+    jumlah_produk_aktif = models.IntegerField(default=0, editable=False)
+    tgl_update = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.nm_kategori
@@ -186,7 +197,8 @@ class Produk(models.Model):
     nm_produk = models.CharField(max_length=255)
     desc = models.TextField()
     harga = models.IntegerField()
-    stok = models.PositiveIntegerField(default=0)
+    # Boleh negatif: penjualan tidak ditolak walau melebihi stok tercatat (crud/inventory.py)
+    stok = models.IntegerField(default=0)
     satuan = models.CharField(max_length=50)
     bahan_baku = models.TextField(blank=True, null=True)
     biaya_upah =models.IntegerField(default=0)
@@ -201,12 +213,17 @@ class Produk(models.Model):
         help_text="Gambar utama produk"
     )
     aktif = models.BooleanField(default=True)
+    bobot_penjualan = models.FloatField(default=0, editable=False,
+                                        help_text="Jumlah terjual berbobot peluruhan (kecepatan jual), "
+                                                  "dijaga oleh crud/inventory.py")
     tgl_dibuat = models.DateTimeField(auto_now_add=True)
     tgl_update = models.DateTimeField(auto_now=True)
 
     def save(self, *args, **kwargs):
         """Override save untuk optimasi gambar"""
-        super().save(*args, **kwargs)
+        # Penghitung denormalisasi (signal crud/counters.py) ikut dalam transaksi save
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
         # Optimasi ukuran gambar jika ada
         if self.gambar_utama:
@@ -241,6 +258,10 @@ class Produk(models.Model):
         db_table = "produk"
         verbose_name_plural = "Produk"
         ordering = ['nm_produk']
+        indexes = [
+            # Dipakai MySQLFullTextBackend (crud/search/backends.py)
+            FullTextIndex(fields=['nm_produk', 'desc', 'bahan_baku', 'metode_produksi'], name='produk_fulltext'),
+        ]
 
 
 class KategoriLokasi(models.Model):
@@ -277,6 +298,8 @@ class LokasiPenjualan(models.Model):
     alamat = models.TextField()
     latitude = models.FloatField(blank=True, null=True)
     longitude = models.FloatField(blank=True, null=True)
+    grid_cell = models.BigIntegerField(null=True, blank=True, editable=False,
+                                       help_text="Sel grid koordinat untuk pencarian lokasi terdekat")
     tlp_pengelola = models.CharField(max_length=20, blank=True, null=True)
     kecamatan = models.ForeignKey(
         Kecamatan,
@@ -293,9 +316,18 @@ class LokasiPenjualan(models.Model):
         blank=True
     )
     aktif = models.BooleanField(default=True, help_text="Status aktif lokasi penjualan")
+    jumlah_penjualan = models.IntegerField(default=0, editable=False,
+                                           help_text="Jumlah transaksi penjualan, dijaga oleh crud/counters.py")
     tgl_dibuat = models.DateTimeField(auto_now_add=True)
     tgl_update = models.DateTimeField(auto_now=True)
 
+    def save(self, *args, **kwargs):
+        self.grid_cell = spatial.grid_cell(self.latitude, self.longitude)
+        if 'update_fields' in kwargs:
+            kwargs['update_fields'] = spatial.grid_update_fields(kwargs['update_fields'])
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         kab_name = self.kecamatan.kabupaten.nm_kabupaten if self.kecamatan else "Tidak diketahui"
         umkm_name = getattr(getattr(self.umkm, 'profil_umkm', None), 'nm_bisnis', self.umkm.username)
@@ -305,6 +337,9 @@ class LokasiPenjualan(models.Model):
         db_table = "lokasi_penjualan"
         verbose_name_plural = "Lokasi Penjualan"
         ordering = ['umkm', 'nm_lokasi']
+        indexes = [
+            models.Index(fields=['aktif', 'grid_cell'], name='lokasi_penjualan_grid_idx'),
+        ]
         # Constraint untuk memastikan UMKM tidak membuat lokasi dengan nama sama
         constraints = [
             models.UniqueConstraint(
@@ -332,6 +367,7 @@ class ProdukTerjual(models.Model):
     total_penjualan = models.IntegerField()
     catatan = models.TextField(blank=True, null=True)
     tgl_pelaporan = models.DateTimeField(auto_now_add=True)
+    tgl_update = models.DateTimeField(auto_now=True)
 
     def clean(self):
         """
@@ -350,7 +386,8 @@ class ProdukTerjual(models.Model):
         self.clean()
         # Hitung total penjualan
         self.total_penjualan = self.jumlah_terjual * self.harga_jual
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.produk.nm_produk} - {self.tgl_penjualan} - {self.jumlah_terjual} {self.produk.satuan}"
@@ -421,4 +458,72 @@ class FilePenjualan(models.Model):
     class Meta:
         db_table = "file_penjualan"
         verbose_name_plural = "File Penjualan"
-        ordering = ['-tgl_upload']
\ No newline at end of file
+        ordering = ['-tgl_upload']
+
+class IndeksPencarianProduk(models.Model):
+    """
+    Inverted index untuk pencarian katalog produk.
+    Satu baris per (produk, term) berisi bobot term tersebut di teks produk, kategori dan bisnis UMKM.
+    Diisi oleh crud.search, jangan diubah manual.
+    """
+    produk = models.ForeignKey(Produk, on_delete=models.CASCADE, related_name='indeks_pencarian')
+    term = models.CharField(max_length=64, help_text="Kata dasar hasil normalisasi dan stemming")
+    kata = models.CharField(max_length=64, help_text="Bentuk kata asli (ternormalisasi) untuk autocomplete")
+    bobot = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.term} - {self.produk_id} ({self.bobot})"
+
+    class Meta:
+        db_table = "indeks_pencarian_produk"
+        verbose_name_plural = "Indeks Pencarian Produk"
+        unique_together = ['produk', 'term']
+        indexes = [
+            models.Index(fields=['term', 'produk']),
+            models.Index(fields=['kata']),
+        ]
+
+
+class KatalogProduk(models.Model):
+    """
+    Read model katalog promosi: satu baris per produk berisi data produk, kategori dan
+    bisnis UMKM yang sudah digabung, agar katalog publik cukup membaca satu tabel.
+    Diisi oleh crud.katalog lewat signal, jangan diubah manual.
+    """
+    produk = models.OneToOneField(Produk, on_delete=models.CASCADE, primary_key=True, related_name='katalog')
+    nm_produk = models.CharField(max_length=255)
+    desc = models.TextField()
+    harga = models.IntegerField()
+    stok = models.PositiveIntegerField(default=0)
+    satuan = models.CharField(max_length=50)
+    gambar_utama = models.CharField(max_length=255, blank=True, default='',
+                                    help_text="Path file gambar utama produk di storage")
+    aktif = models.BooleanField(default=True)
+    tgl_dibuat = models.DateTimeField()
+    tgl_update = models.DateTimeField()
+
+    kategori_id = models.UUIDField()
+    nm_kategori = models.CharField(max_length=100)
+    desc_kategori = models.TextField(blank=True, default='')
+
+    umkm_id = models.UUIDField()
+    username = models.CharField(max_length=150)
+    umkm_aktif = models.BooleanField(default=True, help_text="Status is_active user UMKM pemilik produk")
+    nm_bisnis = models.CharField(max_length=255, help_text="Nama bisnis, atau username jika belum ada profil")
+    alamat = models.TextField(blank=True, default='')
+    tlp = models.CharField(max_length=20, blank=True, default='')
+    desc_bisnis = models.TextField(blank=True, default='')
+
+    def __str__(self):
+        return f"{self.nm_produk} - {self.nm_bisnis}"
+
+    class Meta:
+        db_table = "katalog_produk"
+        verbose_name_plural = "Katalog Produk"
+        indexes = [
+            models.Index(fields=['aktif', 'umkm_aktif', '-tgl_update']),
+            models.Index(fields=['kategori_id', 'aktif']),
+            models.Index(fields=['umkm_id', 'aktif']),
+            models.Index(fields=['harga']),
+            models.Index(fields=['stok']),
+        ]
@@ -1,8 +1,32 @@
+import datetime
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 from collections import OrderedDict
+from functools import partial
 from math import ceil
 
+from .counting import CountingPaginator, cached_count, estimated_table_rows
+
+
+class CursorPositionEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder memotong mikrodetik datetime menjadi milidetik,
+    padahal posisi cursor harus sama persis dengan nilai di database
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
 
 class LaravelStylePagination(PageNumberPagination):
     page_size = 10  # Jumlah item per halaman
@@ -10,7 +34,147 @@ class LaravelStylePagination(PageNumberPagination):
     max_page_size = 100  # Batasan maksimum untuk page_size
     page_query_param = 'page'  # Parameter untuk nomor halaman
 
+    # Mode cursor (keyset) aktif jika parameter ini ada di query, mis. ?cursor= untuk halaman pertama
+    cursor_query_param = 'cursor'
+    # Total data hanya dihitung di mode cursor jika diminta, mis. ?with_total=true
+    with_total_query_param = 'with_total'
+    invalid_cursor_message = 'Cursor tidak valid'
+
+    count_cache_timeout = 300  # Detik, cache count tetap diinvalidasi saat ada penulisan data
+    # Daftar admin tanpa filter memakai statistik tabel jika tabel sebesar ini atau lebih
+    estimated_count_threshold = 100000
+
+    @property
+    def django_paginator_class(self):
+        return partial(CountingPaginator, count_function=self.get_count)
+
+    def get_count(self, queryset):
+        """
+        Menghitung total data: perkiraan dari statistik tabel untuk daftar admin tanpa filter
+        yang sangat besar, selain itu COUNT(*) yang di-cache per endpoint dan filter
+        """
+        if self.request.user.is_staff and not queryset.query.where:
+            estimate = estimated_table_rows(queryset.model, using=queryset.db)
+            if estimate is not None and estimate >= self.estimated_count_threshold:
+                self.count_is_estimate = True
+                return estimate
+
+        return cached_count(queryset, namespace=self.request.path, timeout=self.count_cache_timeout)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.count_is_estimate = False
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_queryset_cursor(queryset, request)
+
+    def paginate_queryset_cursor(self, queryset, request):
+        """
+        Paginasi keyset: halaman berikutnya diambil dengan WHERE (kunci urutan, id) > posisi terakhir,
+        sehingga tidak ada OFFSET dan tidak ada COUNT(*) kecuali diminta
+        """
+        page_size = self.get_page_size(request)
+        ordering = self._get_keyset_ordering(queryset)
+        position, reverse = self._decode_cursor(request, len(ordering))
+
+        self.total = None
+        if str(request.query_params.get(self.with_total_query_param, '')).lower() in ['true', '1', 'yes']:
+            self.total = self.get_count(queryset)
+
+        keys = []
+        for idx, field_name in enumerate(ordering):
+            descending = field_name.startswith('-')
+            name = field_name.lstrip('-')
+            alias = name if name == 'pk' else f'keyset_{idx}'
+            if alias != 'pk':
+                queryset = queryset.annotate(**{alias: F(name)})
+            # Mundur ke halaman sebelumnya = membaca dengan urutan terbalik
+            keys.append((alias, descending != reverse))
+
+        if position is not None:
+            queryset = queryset.filter(self._build_keyset_filter(keys, position))
+
+        queryset = queryset.order_by(*[f'-{alias}' if desc else alias for alias, desc in keys])
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        self.pk_attname = queryset.model._meta.pk.attname
+        self.page_size_value = page_size
+        self.has_next = has_more if not reverse else True
+        self.has_previous = has_more if reverse else position is not None
+        self.next_position = self._get_position(results[-1], keys) if results and self.has_next else None
+        self.previous_position = self._get_position(results[0], keys) if results and self.has_previous else None
+        return results
+
+    def _get_keyset_ordering(self, queryset):
+        """
+        Mengambil urutan aktif queryset (dari OrderingFilter atau Meta.ordering) dan menambahkan pk
+        sebagai pemecah seri agar posisi cursor selalu unik
+        """
+        ordering = [
+            field for field in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(field, str) and field.lstrip('-') not in ['pk', 'id', '?']
+        ]
+        last_desc = ordering[-1].startswith('-') if ordering else False
+        ordering.append('-pk' if last_desc else 'pk')
+        return ordering
+
+    def _build_keyset_filter(self, keys, position):
+        """
+        Membangun kondisi (k1, k2, ..., pk) > posisi secara leksikografis.
+        NULL dianggap nilai terkecil seperti urutan default MySQL
+        """
+        condition = Q(pk__in=[])
+        equal_prefix = Q()
+        for (alias, descending), value in zip(keys, position):
+            if value is None:
+                after = Q(pk__in=[]) if descending else Q(**{f'{alias}__isnull': False})
+                equal = Q(**{f'{alias}__isnull': True})
+            else:
+                lookup = 'lt' if descending else 'gt'
+                after = Q(**{f'{alias}__{lookup}': value})
+                if descending:
+                    after |= Q(**{f'{alias}__isnull': True})
+                equal = Q(**{alias: value})
+            condition |= equal_prefix & after
+            equal_prefix &= equal
+        return condition
+
+    def _get_position(self, instance, keys):
+        if isinstance(instance, dict):
+            # Queryset .values(): pk tersedia dengan nama kolomnya
+            return [instance[self.pk_attname if alias == 'pk' else alias] for alias, _ in keys]
+        return [getattr(instance, alias) for alias, _ in keys]
+
+    def _encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, cls=CursorPositionEncoder)
+        return b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def _decode_cursor(self, request, key_count):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position = payload['p']
+            reverse = bool(payload.get('r', 0))
+        except (TypeError, ValueError, KeyError, UnicodeError, BinasciiError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != key_count:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_cursor_link(self, position, reverse):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self._encode_cursor(position, reverse))
+
     def get_paginated_response(self, data):
+        if getattr(self, 'cursor_mode', False):
+            return self.get_cursor_paginated_response(data)
         count = self.page.paginator.count
         page_size = self.get_page_size(self.request)
         current_page = self.page.number
@@ -24,7 +188,7 @@ class LaravelStylePagination(PageNumberPagination):
         path = self.request.build_absolute_uri().split('?')[0]
 
         # Membuat struktur respons mirip Laravel
-        return Response(OrderedDict([
+        response = OrderedDict([
             ('data', data),
             ('links', OrderedDict([
                 ('first', f"{path}?page=1"),
@@ -40,7 +204,64 @@ class LaravelStylePagination(PageNumberPagination):
                 ('to', to_item),
                 ('total', count),
                 ('links', self._get_page_links(current_page, total_pages, path)),
-        ]))
+        ])
+        if self.count_is_estimate:
+            response['total_is_estimate'] = True
+        return Response(response)
+
+    def get_cursor_paginated_response(self, data):
+        """
+        Struktur respons mode cursor, mengikuti cursorPaginate() Laravel
+        """
+        path = self.request.build_absolute_uri().split('?')[0]
+        first_url = replace_query_param(
+            remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param),
+            self.cursor_query_param, ''
+        )
+        next_url = self.get_cursor_link(self.next_position, False) if self.next_position is not None else None
+        prev_url = self.get_cursor_link(self.previous_position, True) if self.previous_position is not None else None
+
+        response = OrderedDict([
+            ('data', data),
+            ('links', OrderedDict([
+                ('first', first_url),
+                ('last', None),
+                ('prev', prev_url),
+                ('next', next_url),
+            ])),
+            ('path', path),
+            ('per_page', self.page_size_value),
+            ('next_cursor', self._encode_cursor(self.next_position, False) if next_url else None),
+            ('prev_cursor', self._encode_cursor(self.previous_position, True) if prev_url else None),
+        ])
+
+        if self.total is not None:
+            response['total'] = self.total
+            response['last_page'] = ceil(self.total / self.page_size_value)
+            if self.count_is_estimate:
+                response['total_is_estimate'] = True
+
+        return Response(response)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters += [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Aktifkan paginasi cursor (kosongkan untuk halaman pertama)',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.with_total_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Sertakan total data pada paginasi cursor',
+                'schema': {'type': 'boolean'},
+            },
+        ]
+        return parameters
 
     def _get_page_links(self, current_page, total_pages, path):
         """
@@ -0,0 +1,119 @@
+# crud/pagination/counting.py
+import hashlib
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.utils.functional import cached_property
+
+from ..cache_versions import bump_cache_version, bump_cache_version_on_commit, cache_versions
+
+# App yang perubahan datanya membatalkan cache count
+COUNTED_APPS = ['crud', 'authentication']
+
+
+def _version_name(table):
+    return f"count:{table}"
+
+
+def bump_count_version(table):
+    """
+    Menandai semua count yang melibatkan tabel ini sebagai kadaluarsa
+    """
+    bump_cache_version(_version_name(table))
+
+
+def invalidate_counts_on_write(sender, **kwargs):
+    # Setelah commit: count yang dihitung ulang sebelumnya tidak boleh melihat data lama
+    bump_cache_version_on_commit(_version_name(sender._meta.db_table))
+
+
+def connect_count_invalidation():
+    """
+    Mendaftarkan invalidasi count hanya untuk model di COUNTED_APPS (dipanggil dari AppConfig.ready)
+    """
+    for label in COUNTED_APPS:
+        for model in apps.get_app_config(label).get_models():
+            post_save.connect(invalidate_counts_on_write, sender=model, dispatch_uid=f'count:{model._meta.label}:save')
+            post_delete.connect(invalidate_counts_on_write, sender=model, dispatch_uid=f'count:{model._meta.label}:delete')
+
+
+def prepare_count_queryset(queryset):
+    """
+    Membuang bagian queryset yang tidak mempengaruhi jumlah baris
+    (select_related, prefetch_related, ordering)
+    """
+    try:
+        queryset = queryset.select_related(None)
+    except TypeError:
+        # Queryset .values() tidak mendukung select_related
+        pass
+    return queryset.prefetch_related(None).order_by()
+
+
+def cached_count(queryset, namespace='', timeout=300):
+    """
+    Menghitung COUNT(*) dengan cache per (namespace, SQL + parameter terfilter).
+    Cache otomatis berganti versi saat ada penulisan ke salah satu tabel yang terlibat.
+    """
+    queryset = prepare_count_queryset(queryset)
+    db = queryset.db
+    sql, params = queryset.query.sql_with_params()
+
+    tables = {queryset.model._meta.db_table}
+    tables.update(join.table_name for join in queryset.query.alias_map.values())
+    tables = sorted(tables)
+    versions = cache_versions([_version_name(table) for table in tables])
+
+    key_string = f"{namespace}:{db}:{sql}:{params!r}:{sorted(versions.items())}"
+    cache_key = f"count:{hashlib.md5(key_string.encode()).hexdigest()}"
+
+    count = cache.get(cache_key)
+    if count is None:
+        count = queryset.count()
+        cache.set(cache_key, count, timeout)
+    return count
+
+
+def estimated_table_rows(model, using='default'):
+    """
+    Perkiraan jumlah baris dari statistik tabel database.
+    Mengembalikan None jika database tidak menyediakan statistik (mis. SQLite).
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [table]
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+        else:
+            return None
+        row = cursor.fetchone()
+
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class CountingPaginator(Paginator):
+    """
+    Paginator Django yang menyerahkan perhitungan total ke fungsi yang diberikan
+    """
+
+    def __init__(self, *args, count_function=None, **kwargs):
+        self.count_function = count_function
+        super().__init__(*args, **kwargs)
+
+    @cached_property
+    def count(self):
+        if self.count_function is None:
+            return super().count
+        return self.count_function(self.object_list)
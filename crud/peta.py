@@ -0,0 +1,359 @@
+# crud/peta.py
+"""
+Cluster titik peta admin (LokasiUMKM / LokasiPenjualan) per tile Web Mercator.
+
+Semua titik satu layer disimpan sebagai array NumPy yang terurut per latitude
+(indeks titik), dibangun sekali per versi layer. Cluster satu tile (zoom, x, y)
+dihitung dengan membagi tile menjadi CLUSTER_GRID x CLUSTER_GRID sel lalu
+menjumlahkan titik per sel (np.bincount), dan hasilnya di-cache per tile.
+
+Versi layer dinaikkan saat lokasi layer itu berubah atau dihapus. Penjualan baru/berubah
+hanya menghitung ulang total titik yang terkait (lokasi penjualannya dan lokasi UMKM
+pemilik produknya) di indeks yang sudah ada, lalu menaikkan versi tile yang memuat titik
+tersebut di setiap zoom.
+"""
+import math
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache_versions import bump_cache_version, bump_cache_versions, cache_version, cache_versions
+from .models import LokasiPenjualan, LokasiUMKM, Produk, ProdukTerjual
+from .snapshots import old_state, track
+
+TILE_CACHE_TIMEOUT = 60 * 60
+# Batas waktu kunci saat total titik diperbarui; proses lain menaikkan versi layer saja
+TOTAL_LOCK_TIMEOUT = 10
+# Tiap tile dibagi 2^CLUSTER_LEVEL x 2^CLUSTER_LEVEL sel cluster
+CLUSTER_LEVEL = 3
+CLUSTER_GRID = 2 ** CLUSTER_LEVEL
+MAX_ZOOM = 20
+MAX_LATITUDE = 85.05112878
+
+LAYER_UMKM = 'umkm'
+LAYER_PENJUALAN = 'penjualan'
+LAYERS = (LAYER_UMKM, LAYER_PENJUALAN)
+
+# Pemilik lama penjualan yang pindah lokasi/produk ikut dihitung ulang
+_PEMILIK_FIELDS = ('lokasi_penjualan_id', 'produk_id')
+track(ProdukTerjual, _PEMILIK_FIELDS)
+
+
+def _layer_version_name(layer):
+    return f'peta:{layer}'
+
+
+def _tile_version_name(layer, zoom, x, y):
+    return f'peta:{layer}:{zoom}:{x}:{y}'
+
+
+def layer_version(layer):
+    return cache_version(_layer_version_name(layer))
+
+
+def invalidate_peta(*layers):
+    """
+    Membangun ulang indeks titik layer tertentu (default semua layer) pada akses berikutnya
+    """
+    for layer in layers or LAYERS:
+        bump_cache_version(_layer_version_name(layer))
+
+
+def _invalidate_layer_on_commit(layer):
+    transaction.on_commit(lambda: invalidate_peta(layer))
+
+
+@receiver(post_save, sender=LokasiUMKM)
+@receiver(post_delete, sender=LokasiUMKM)
+def invalidate_peta_umkm_on_write(sender, **kwargs):
+    _invalidate_layer_on_commit(LAYER_UMKM)
+
+
+@receiver(post_save, sender=LokasiPenjualan)
+@receiver(post_delete, sender=LokasiPenjualan)
+def invalidate_peta_penjualan_on_write(sender, **kwargs):
+    _invalidate_layer_on_commit(LAYER_PENJUALAN)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_peta_on_user_write(sender, created, update_fields=None, **kwargs):
+    # Layer UMKM hanya memuat akun aktif
+    if created or (update_fields is not None and 'is_active' not in update_fields):
+        return
+    _invalidate_layer_on_commit(LAYER_UMKM)
+
+
+@receiver(pre_save, sender=ProdukTerjual)
+def peta_sale_pre_save(sender, instance, raw=False, **kwargs):
+    instance._peta_pemilik = None
+    if raw or instance._state.adding:
+        return
+    state = old_state(instance, _PEMILIK_FIELDS)
+    if state is not None:
+        instance._peta_pemilik = tuple(state[field] for field in _PEMILIK_FIELDS)
+
+
+def _refresh_on_commit(pemilik):
+    lokasi_ids = {lokasi_id for lokasi_id, _ in pemilik if lokasi_id is not None}
+    produk_ids = {produk_id for _, produk_id in pemilik}
+    transaction.on_commit(lambda: refresh_totals(lokasi_ids, produk_ids))
+
+
+@receiver(post_save, sender=ProdukTerjual)
+def peta_sale_post_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    pemilik = {(instance.lokasi_penjualan_id, instance.produk_id)}
+    if getattr(instance, '_peta_pemilik', None):
+        pemilik.add(instance._peta_pemilik)
+    _refresh_on_commit(pemilik)
+
+
+@receiver(post_delete, sender=ProdukTerjual)
+def peta_sale_post_delete(sender, instance, origin=None, **kwargs):
+    if origin is not None and origin is not instance:
+        # Ikut terhapus bersama produk/lokasi/user: cukup bangun ulang kedua layer sekali
+        transaction.on_commit(invalidate_peta)
+        return
+    _refresh_on_commit({(instance.lokasi_penjualan_id, instance.produk_id)})
+
+
+def _layer_rows(layer):
+    """
+    (pk, pemilik total penjualan, latitude, longitude) setiap titik layer, urut pk
+    """
+    if layer == LAYER_PENJUALAN:
+        queryset = LokasiPenjualan.objects.filter(aktif=True, latitude__isnull=False, longitude__isnull=False)
+        return queryset.order_by('pk').values_list('pk', 'pk', 'latitude', 'longitude')
+    queryset = LokasiUMKM.objects.filter(pengguna__is_active=True)
+    return queryset.order_by('pk').values_list('pk', 'pengguna_id', 'latitude', 'longitude')
+
+
+def _totals(layer, pemilik=None):
+    """
+    Total penjualan per pemilik (lokasi penjualan atau user UMKM), opsional hanya pemilik tertentu
+    """
+    field = 'lokasi_penjualan_id' if layer == LAYER_PENJUALAN else 'produk__umkm_id'
+    queryset = ProdukTerjual.objects.order_by()
+    if pemilik is not None:
+        queryset = queryset.filter(**{f'{field}__in': pemilik})
+    return {
+        str(key): total
+        for key, total in queryset.values(field).annotate(total=Sum('total_penjualan')).values_list(field, 'total')
+        if key is not None
+    }
+
+
+def _build_points(layer):
+    rows = list(_layer_rows(layer))
+    if rows:
+        pks, pemilik, latitudes, longitudes = zip(*rows)
+    else:
+        pks, pemilik, latitudes, longitudes = (), (), (), ()
+
+    latitudes = np.array(latitudes, dtype=float)
+    order = np.argsort(latitudes, kind='stable')
+    position = np.empty(len(order), dtype=np.intp)
+    position[order] = np.arange(len(order))
+
+    # UMKM dengan beberapa lokasi: total penjualannya hanya dihitung sekali, di lokasi pertama (pk terkecil)
+    titik_pemilik = {}
+    for i, key in enumerate(pemilik):
+        titik_pemilik.setdefault(str(key), int(position[i]))
+
+    totals = _totals(layer)
+    total = np.zeros(len(order), dtype=np.int64)
+    for key, idx in titik_pemilik.items():
+        total[idx] = totals.get(key, 0)
+
+    return {
+        'pk': [str(pks[i]) for i in order],
+        'latitude': latitudes[order],
+        'longitude': np.array(longitudes, dtype=float)[order],
+        'total': total,
+        'titik_pemilik': titik_pemilik,
+    }
+
+
+def _points_key(layer, version):
+    return f'peta_points:{version}:{layer}'
+
+
+def get_points(layer, version=None):
+    """
+    Indeks titik satu layer untuk versi layer saat ini (array terurut per latitude)
+    """
+    version = version or layer_version(layer)
+    cache_key = _points_key(layer, version)
+    points = cache.get(cache_key)
+    if points is None:
+        points = _build_points(layer)
+        cache.set(cache_key, points, TILE_CACHE_TIMEOUT)
+    return points
+
+
+def _point_tiles(layer, latitude, longitude):
+    """
+    Nama versi tile yang memuat satu titik, di setiap zoom
+    """
+    names = []
+    for zoom in range(MAX_ZOOM + 1):
+        last = (1 << zoom) - 1
+        x = min(max(int(_tile_x(longitude, zoom)), 0), last)
+        y = min(max(int(_tile_y(latitude, zoom)), 0), last)
+        names.append(_tile_version_name(layer, zoom, x, y))
+    return names
+
+
+def _refresh_layer_totals(layer, pemilik):
+    version = layer_version(layer)
+    lock_key = f'peta_lock:{layer}'
+    if not cache.add(lock_key, 1, TOTAL_LOCK_TIMEOUT):
+        # Proses lain sedang memperbarui indeks yang sama
+        invalidate_peta(layer)
+        return
+    try:
+        cache_key = _points_key(layer, version)
+        points = cache.get(cache_key)
+        if points is None:
+            return
+        totals = _totals(layer, pemilik)
+        tiles = set()
+        for key in map(str, pemilik):
+            idx = points['titik_pemilik'].get(key)
+            total = totals.get(key, 0)
+            if idx is None or points['total'][idx] == total:
+                continue
+            points['total'][idx] = total
+            tiles.update(_point_tiles(layer, points['latitude'][idx], points['longitude'][idx]))
+        if tiles:
+            cache.set(cache_key, points, TILE_CACHE_TIMEOUT)
+            bump_cache_versions(tiles, TILE_CACHE_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+
+
+def refresh_totals(lokasi_ids, produk_ids):
+    """
+    Menghitung ulang total penjualan titik milik lokasi penjualan dan pemilik produk
+    tertentu, tanpa membangun ulang seluruh layer
+    """
+    produk_umkm = dict(Produk.objects.filter(pk__in=produk_ids).values_list('pk', 'umkm_id'))
+    if len(produk_umkm) < len(produk_ids):
+        # Sebagian produk sudah terhapus, pemiliknya tidak diketahui lagi
+        invalidate_peta(LAYER_UMKM)
+    elif produk_umkm:
+        _refresh_layer_totals(LAYER_UMKM, set(produk_umkm.values()))
+    if lokasi_ids:
+        _refresh_layer_totals(LAYER_PENJUALAN, lokasi_ids)
+
+
+def _tile_x(longitude, zoom):
+    return (np.asarray(longitude) + 180.0) / 360.0 * (1 << zoom)
+
+
+def _tile_y(latitude, zoom):
+    latitude = np.radians(np.clip(latitude, -MAX_LATITUDE, MAX_LATITUDE))
+    return (1.0 - np.log(np.tan(latitude) + 1.0 / np.cos(latitude)) / math.pi) / 2.0 * (1 << zoom)
+
+
+def _tile_bounds(zoom, x, y):
+    """
+    (min_lat, min_lng, max_lat, max_lng) sebuah tile
+    """
+    n = 1 << zoom
+
+    def latitude(tile_y):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return latitude(y + 1), x / n * 360.0 - 180.0, latitude(y), (x + 1) / n * 360.0 - 180.0
+
+
+def quadkey(zoom, x, y):
+    digits = []
+    for level in range(zoom, 0, -1):
+        mask = 1 << (level - 1)
+        digits.append(str((1 if x & mask else 0) + (2 if y & mask else 0)))
+    return ''.join(digits)
+
+
+def _compute_tile(points, zoom, x, y):
+    min_lat, min_lng, max_lat, max_lng = _tile_bounds(zoom, x, y)
+    # Tepi atas tile (latitude terbesar) ikut tile ini, sama seperti floor() pada _tile_y
+    start, end = np.searchsorted(points['latitude'], [min_lat, max_lat], side='right')
+    longitudes = points['longitude'][start:end]
+    inside = np.nonzero((longitudes >= min_lng) & (longitudes < max_lng))[0] + start
+    if not len(inside):
+        return []
+
+    latitudes = points['latitude'][inside]
+    longitudes = points['longitude'][inside]
+    totals = points['total'][inside]
+
+    cluster_zoom = zoom + CLUSTER_LEVEL
+    cell_x = np.clip(_tile_x(longitudes, cluster_zoom).astype(np.int64) - x * CLUSTER_GRID, 0, CLUSTER_GRID - 1)
+    cell_y = np.clip(_tile_y(latitudes, cluster_zoom).astype(np.int64) - y * CLUSTER_GRID, 0, CLUSTER_GRID - 1)
+    cells, inverse = np.unique(cell_y * CLUSTER_GRID + cell_x, return_inverse=True)
+
+    jumlah = np.bincount(inverse)
+    sum_latitude = np.bincount(inverse, weights=latitudes)
+    sum_longitude = np.bincount(inverse, weights=longitudes)
+    sum_total = np.bincount(inverse, weights=totals)
+
+    clusters = []
+    for idx, cell in enumerate(cells):
+        row, col = divmod(int(cell), CLUSTER_GRID)
+        cluster = {
+            'quadkey': quadkey(cluster_zoom, x * CLUSTER_GRID + col, y * CLUSTER_GRID + row),
+            'latitude': round(sum_latitude[idx] / jumlah[idx], 6),
+            'longitude': round(sum_longitude[idx] / jumlah[idx], 6),
+            'jumlah': int(jumlah[idx]),
+            'total_penjualan': int(round(sum_total[idx])),
+        }
+        if jumlah[idx] == 1:
+            # Titik tunggal bisa langsung dibuka detailnya di peta
+            cluster['id'] = points['pk'][inside[np.nonzero(inverse == idx)[0][0]]]
+        clusters.append(cluster)
+    return clusters
+
+
+def tile_clusters(layer, zoom, tiles):
+    """
+    dict (x, y) -> cluster untuk setiap tile, dari cache per (versi layer, versi tile, zoom, x, y)
+    """
+    version = layer_version(layer)
+    names = {tile: _tile_version_name(layer, zoom, *tile) for tile in tiles}
+    # Versi tile hanya ada setelah tile tersebut terkena perubahan total penjualan
+    tile_versions = cache_versions(names.values(), default='0')
+    keys = {
+        tile: f'peta_tile:{version}:{tile_versions[name]}:{layer}:{zoom}:{tile[0]}:{tile[1]}'
+        for tile, name in names.items()
+    }
+    cached = cache.get_many(list(keys.values()))
+
+    result, fresh, points = {}, {}, None
+    for tile, key in keys.items():
+        if key in cached:
+            result[tile] = cached[key]
+            continue
+        if points is None:
+            points = get_points(layer, version)
+        result[tile] = fresh[key] = _compute_tile(points, zoom, *tile)
+    if fresh:
+        cache.set_many(fresh, TILE_CACHE_TIMEOUT)
+    return result
+
+
+def tiles_for_bbox(min_lat, min_lng, max_lat, max_lng, zoom):
+    """
+    Semua tile (x, y) pada zoom yang bersinggungan dengan kotak koordinat
+    """
+    last = (1 << zoom) - 1
+    x_start, x_end = (min(max(int(v), 0), last) for v in _tile_x([min_lng, max_lng], zoom))
+    y_start, y_end = (min(max(int(v), 0), last) for v in _tile_y([max_lat, min_lat], zoom))
+    return [(x, y) for y in range(y_start, y_end + 1) for x in range(x_start, x_end + 1)]
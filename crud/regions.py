@@ -0,0 +1,219 @@
+# crud/regions.py
+import gzip
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import Counter, namedtuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache_versions import bump_cache_version, cache_version
+from .models import Kabupaten, Kecamatan, Provinsi
+
+VERSION_NAME = 'region'
+# Versi bersama dicek paling sering sekali per sekian detik (hemat akses cache per baris)
+VERSION_CHECK_INTERVAL = 1
+# Batas umur data, menjaga proses lain tetap segar walau cache tidak dibagi antar proses
+MAX_CACHE_AGE = 300
+# Id yang belum dikenal memicu muat ulang paling sering sekali per sekian detik
+MISS_RELOAD_INTERVAL = 5
+TREE_CACHE_KEY = 'region_tree'
+TREE_CACHE_TIMEOUT = 60 * 60 * 24
+
+ProvinsiData = namedtuple('ProvinsiData', ['id', 'nm_provinsi'])
+KabupatenData = namedtuple('KabupatenData', ['id', 'nm_kabupaten', 'kode', 'is_kota', 'provinsi_id'])
+KecamatanData = namedtuple('KecamatanData', ['id', 'nm_kecamatan', 'kode', 'kabupaten_id'])
+
+
+def tipe_kabupaten(kabupaten):
+    return "Kota" if kabupaten.is_kota else "Kabupaten"
+
+
+def nama_kabupaten(kabupaten):
+    """
+    Nama kabupaten dengan awalan tipenya, mis. "Kota Jayapura"
+    """
+    return f"{tipe_kabupaten(kabupaten)} {kabupaten.nm_kabupaten}"
+
+
+def _as_uuid(pk):
+    return pk if isinstance(pk, uuid.UUID) else uuid.UUID(str(pk))
+
+
+class RegionCache:
+    """
+    Seluruh hierarki Provinsi -> Kabupaten -> Kecamatan di memori proses.
+
+    Serializer memakai cache ini untuk nama, awalan Kota/Kabupaten dan induk wilayah
+    berdasarkan id, sehingga query tidak perlu join ke tabel wilayah.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.provinsi = {}
+        self.kabupaten = {}
+        self.kecamatan = {}
+        self.jumlah_kecamatan_per_kabupaten = Counter()
+        self.version = None
+        # Hash isi data yang dimuat, sama di semua proses untuk data yang sama
+        self.fingerprint = None
+        self.loaded_at = 0
+        self.checked_at = 0
+        self.miss_reloaded_at = 0
+
+    def load(self):
+        with self.lock:
+            self.provinsi = {
+                row[0]: ProvinsiData(*row) for row in Provinsi.objects.values_list('id', 'nm_provinsi')
+            }
+            self.kabupaten = {
+                row[0]: KabupatenData(*row) for row in Kabupaten.objects.values_list(
+                    'id', 'nm_kabupaten', 'kode', 'is_kota', 'provinsi_id')
+            }
+            self.kecamatan = {
+                row[0]: KecamatanData(*row) for row in Kecamatan.objects.values_list(
+                    'id', 'nm_kecamatan', 'kode', 'kabupaten_id')
+            }
+            self.jumlah_kecamatan_per_kabupaten = Counter(
+                kecamatan.kabupaten_id for kecamatan in self.kecamatan.values()
+            )
+            self.fingerprint = hashlib.sha256(repr((
+                sorted(self.provinsi.values()), sorted(self.kabupaten.values()), sorted(self.kecamatan.values())
+            )).encode()).hexdigest()[:32]
+            self.loaded_at = time.monotonic()
+
+    def _get(self, table, pk):
+        if pk is None:
+            return None
+        pk = _as_uuid(pk)
+        item = getattr(self, table).get(pk)
+        if item is None:
+            # Wilayah baru dari proses lain yang versinya belum terlihat
+            with self.lock:
+                if time.monotonic() - self.miss_reloaded_at > MISS_RELOAD_INTERVAL:
+                    self.miss_reloaded_at = time.monotonic()
+                    self.load()
+            item = getattr(self, table).get(pk)
+        return item
+
+    def get_provinsi(self, pk):
+        return self._get('provinsi', pk)
+
+    def get_kabupaten(self, pk):
+        return self._get('kabupaten', pk)
+
+    def get_kecamatan(self, pk):
+        return self._get('kecamatan', pk)
+
+    def hierarchy(self, kecamatan_id):
+        """
+        (kecamatan, kabupaten, provinsi) untuk satu kecamatan, None untuk yang tidak ada
+        """
+        kecamatan = self.get_kecamatan(kecamatan_id)
+        kabupaten = self.get_kabupaten(kecamatan.kabupaten_id) if kecamatan else None
+        provinsi = self.get_provinsi(kabupaten.provinsi_id) if kabupaten else None
+        return kecamatan, kabupaten, provinsi
+
+    def jumlah_kecamatan(self, kabupaten_id):
+        return self.jumlah_kecamatan_per_kabupaten[_as_uuid(kabupaten_id)]
+
+    def tree(self):
+        """
+        Seluruh hierarki sebagai list provinsi bersarang, diurutkan per nama
+        """
+        with self.lock:
+            kecamatan_per_kabupaten = {}
+            for kecamatan in sorted(self.kecamatan.values(), key=lambda k: k.nm_kecamatan):
+                kecamatan_per_kabupaten.setdefault(kecamatan.kabupaten_id, []).append({
+                    'id': str(kecamatan.id),
+                    'nm_kecamatan': kecamatan.nm_kecamatan,
+                })
+
+            kabupaten_per_provinsi = {}
+            for kabupaten in sorted(self.kabupaten.values(), key=lambda k: k.nm_kabupaten):
+                kabupaten_per_provinsi.setdefault(kabupaten.provinsi_id, []).append({
+                    'id': str(kabupaten.id),
+                    'nm_kabupaten': kabupaten.nm_kabupaten,
+                    'is_kota': kabupaten.is_kota,
+                    'kecamatan': kecamatan_per_kabupaten.get(kabupaten.id, []),
+                })
+
+            return [
+                {
+                    'id': str(provinsi.id),
+                    'nm_provinsi': provinsi.nm_provinsi,
+                    'kabupaten': kabupaten_per_provinsi.get(provinsi.id, []),
+                }
+                for provinsi in sorted(self.provinsi.values(), key=lambda p: p.nm_provinsi)
+            ]
+
+
+_regions = RegionCache()
+
+
+def get_region_cache():
+    """
+    Cache wilayah proses ini, dimuat ulang jika versinya tertinggal atau sudah terlalu lama
+    """
+    now = time.monotonic()
+    if _regions.version is not None and now - _regions.checked_at < VERSION_CHECK_INTERVAL:
+        return _regions
+
+    shared_version = cache_version(VERSION_NAME)
+
+    with _regions.lock:
+        if _regions.version != shared_version or now - _regions.loaded_at > MAX_CACHE_AGE:
+            _regions.load()
+            _regions.version = shared_version
+        _regions.checked_at = now
+    return _regions
+
+
+def get_region_tree():
+    """
+    Pohon wilayah siap kirim: JSON mentah, versi gzip dan ETag dari hash isinya.
+
+    Disimpan di cache per hash isi wilayah yang dimuat RegionCache, bukan per versi
+    bersama: proses yang cache versinya tidak ikut berganti (LocMemCache per proses)
+    tetap berpindah ke kunci baru paling lambat MAX_CACHE_AGE setelah data berubah.
+    """
+    regions = get_region_cache()
+    cache_key = f'{TREE_CACHE_KEY}:{regions.fingerprint}'
+    tree = cache.get(cache_key)
+    if tree is None:
+        content = json.dumps({
+            'status': 'success',
+            'message': 'Berhasil mendapatkan pohon wilayah',
+            'data': regions.tree(),
+        }, ensure_ascii=False, separators=(',', ':')).encode()
+        tree = {
+            'content': content,
+            # mtime=0 agar hasil gzip sama persis untuk isi yang sama
+            'gzip': gzip.compress(content, compresslevel=9, mtime=0),
+            'etag': '"%s"' % hashlib.sha256(content).hexdigest()[:32],
+            'dibuat': timezone.now(),
+        }
+        cache.set(cache_key, tree, TREE_CACHE_TIMEOUT)
+    return tree
+
+
+def invalidate_regions():
+    bump_cache_version(VERSION_NAME)
+    # Proses ini langsung memuat ulang pada akses berikutnya
+    _regions.version = None
+
+
+@receiver(post_save, sender=Provinsi)
+@receiver(post_delete, sender=Provinsi)
+@receiver(post_save, sender=Kabupaten)
+@receiver(post_delete, sender=Kabupaten)
+@receiver(post_save, sender=Kecamatan)
+@receiver(post_delete, sender=Kecamatan)
+def invalidate_regions_on_write(sender, **kwargs):
+    transaction.on_commit(invalidate_regions)
@@ -0,0 +1,9 @@
+from .autocomplete import get_autocomplete_index
+from .backends import get_search_backend, BaseSearchBackend, InvertedIndexBackend, MySQLFullTextBackend
+from .filters import ProdukSearchFilter
+from .text import tokenize, normalize
+
+__all__ = [
+    'get_autocomplete_index', 'get_search_backend', 'BaseSearchBackend', 'InvertedIndexBackend', 'MySQLFullTextBackend',
+    'ProdukSearchFilter', 'tokenize', 'normalize'
+]
@@ -0,0 +1,254 @@
+# crud/search/autocomplete.py
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from ..cache_versions import bump_cache_version, cache_version
+from .text import words
+
+VERSION_NAME = 'autocomplete'
+# Batas umur indeks, menjaga proses lain tetap segar walau cache tidak dibagi antar proses
+MAX_INDEX_AGE = 300
+
+KIND_PRIORITY = {'produk': 0, 'umkm': 1, 'kategori': 2}
+MAX_QUERY_WORDS = 4
+MAX_WORD_LENGTH = 32
+
+
+def max_distance_for(word):
+    """
+    Toleransi salah ketik: tidak ada untuk kata sangat pendek, 1 untuk kata pendek, 2 untuk kata panjang
+    """
+    if len(word) <= 2:
+        return 0
+    if len(word) <= 5:
+        return 1
+    return 2
+
+
+def edit_distance(query, word, max_distance, prefix=False):
+    """
+    Jarak Levenshtein antara query dan word (atau awalan word jika prefix=True).
+    Mengembalikan None jika jarak melebihi max_distance.
+    """
+    if prefix:
+        word = word[:len(query) + max_distance]
+    elif abs(len(query) - len(word)) > max_distance:
+        return None
+
+    previous = list(range(len(word) + 1))
+    for i, query_char in enumerate(query, 1):
+        current = [i]
+        for j, word_char in enumerate(word, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (query_char != word_char),
+            ))
+        if min(current) > max_distance:
+            return None
+        previous = current
+
+    distance = min(previous) if prefix else previous[-1]
+    return distance if distance <= max_distance else None
+
+
+def bigrams(word):
+    return {word[i:i + 2] for i in range(len(word) - 1)}
+
+
+class AutocompleteIndex:
+    """
+    Indeks nama produk, bisnis UMKM dan kategori di memori proses.
+
+    Setiap kata nama disimpan dalam daftar terurut (pencarian awalan dengan bisect) dan
+    indeks bigram (kandidat untuk pencocokan dengan salah ketik).
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.entries = {}
+        self.word_entries = defaultdict(set)
+        self.bigram_words = defaultdict(set)
+        self.sorted_words = []
+        self.sorted_dirty = False
+        self.version = None
+        self.loaded_at = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.word_entries.clear()
+        self.bigram_words.clear()
+        self.sorted_words = []
+        self.sorted_dirty = False
+
+    def load(self):
+        from ..models import KategoriProduk, Produk, ProfilUMKM
+
+        with self.lock:
+            self.clear()
+            # Hanya produk dan bisnis milik akun aktif, sama seperti katalog promosi
+            for pk, nama in Produk.objects.filter(aktif=True, umkm__is_active=True).values_list('pk', 'nm_produk'):
+                self.add('produk', pk, nama)
+            for user_id, nama in ProfilUMKM.objects.filter(user__is_active=True).exclude(
+                    nm_bisnis__isnull=True).exclude(nm_bisnis='').values_list('user_id', 'nm_bisnis'):
+                self.add('umkm', user_id, nama)
+            for pk, nama in KategoriProduk.objects.values_list('pk', 'nm_kategori'):
+                self.add('kategori', pk, nama)
+            self.loaded_at = time.monotonic()
+
+    def add(self, kind, pk, text):
+        key = (kind, str(pk))
+        with self.lock:
+            self.remove(kind, pk)
+            name_words = [word[:MAX_WORD_LENGTH] for word in words(text, keep_stopwords=True)]
+            if not name_words:
+                return
+            self.entries[key] = (text, name_words)
+            for word in name_words:
+                if word not in self.word_entries:
+                    for bigram in bigrams(word):
+                        self.bigram_words[bigram].add(word)
+                    self.sorted_dirty = True
+                self.word_entries[word].add(key)
+
+    def remove(self, kind, pk):
+        key = (kind, str(pk))
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if not entry:
+                return
+            for word in entry[1]:
+                keys = self.word_entries.get(word)
+                if keys is None:
+                    continue
+                keys.discard(key)
+                if not keys:
+                    del self.word_entries[word]
+                    for bigram in bigrams(word):
+                        self.bigram_words[bigram].discard(word)
+                    self.sorted_dirty = True
+
+    def _sorted_words(self):
+        if self.sorted_dirty:
+            self.sorted_words = sorted(self.word_entries)
+            self.sorted_dirty = False
+        return self.sorted_words
+
+    def _candidates(self, word, max_distance):
+        """
+        Kata yang berbagi cukup bigram dengan query (q-gram lemma: satu edit merusak maksimal 2 bigram)
+        """
+        query_bigrams = bigrams(word)
+        threshold = len(query_bigrams) - 2 * max_distance
+        if threshold <= 0:
+            return [candidate for candidate in self.word_entries if candidate[:1] == word[:1]]
+
+        counts = defaultdict(int)
+        for bigram in query_bigrams:
+            for candidate in self.bigram_words.get(bigram, ()):
+                counts[candidate] += 1
+        return [candidate for candidate, count in counts.items() if count >= threshold]
+
+    def match_word(self, word, prefix=False):
+        """
+        Kata indeks yang cocok dengan word beserta jaraknya: {kata: jarak}
+        """
+        matches = {}
+        if prefix:
+            sorted_words = self._sorted_words()
+            idx = bisect_left(sorted_words, word)
+            while idx < len(sorted_words) and sorted_words[idx].startswith(word):
+                matches[sorted_words[idx]] = 0
+                idx += 1
+        elif word in self.word_entries:
+            matches[word] = 0
+
+        max_distance = max_distance_for(word)
+        if max_distance:
+            for candidate in self._candidates(word, max_distance):
+                if candidate in matches:
+                    continue
+                distance = edit_distance(word, candidate, max_distance, prefix=prefix)
+                if distance is not None:
+                    matches[candidate] = distance
+        return matches
+
+    def _keys_for(self, word, prefix):
+        best = {}
+        for candidate, distance in self.match_word(word, prefix=prefix).items():
+            for key in self.word_entries[candidate]:
+                if key not in best or distance < best[key]:
+                    best[key] = distance
+        return best
+
+    def search(self, query, limit=10):
+        query_words = [word[:MAX_WORD_LENGTH] for word in words(query, keep_stopwords=True)]
+        query_words = query_words[-MAX_QUERY_WORDS:]
+        if not query_words:
+            return []
+
+        with self.lock:
+            *head, last = query_words
+            scores = self._keys_for(last, prefix=True)
+            for word in head:
+                if not scores:
+                    break
+                word_keys = self._keys_for(word, prefix=False)
+                scores = {
+                    key: distance + word_keys[key]
+                    for key, distance in scores.items() if key in word_keys
+                }
+
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (item[1], KIND_PRIORITY[item[0][0]], len(self.entries[item[0]][0]),
+                                  self.entries[item[0]][0])
+            )[:limit]
+
+            return [
+                {'id': key[1], 'nama': self.entries[key][0], 'tipe': key[0], 'jarak': distance}
+                for key, distance in ranked
+            ]
+
+
+_index = AutocompleteIndex()
+
+
+def get_autocomplete_index():
+    """
+    Indeks autocomplete proses ini, dimuat ulang jika versinya tertinggal atau sudah terlalu lama
+    """
+    shared_version = cache_version(VERSION_NAME)
+
+    with _index.lock:
+        expired = time.monotonic() - _index.loaded_at > MAX_INDEX_AGE
+        if _index.version != shared_version or expired:
+            _index.load()
+            _index.version = shared_version
+    return _index
+
+
+def invalidate_autocomplete():
+    """
+    Menandai indeks semua proses untuk dimuat ulang (setelah perubahan massal tanpa signal)
+    """
+    bump_cache_version(VERSION_NAME)
+
+
+def update_autocomplete(kind, pk, text=None):
+    """
+    Memperbarui satu nama (text=None berarti dihapus) di indeks proses ini dan
+    menandai indeks proses lain untuk dimuat ulang
+    """
+    with _index.lock:
+        up_to_date = _index.version is not None and _index.version == cache_version(VERSION_NAME)
+        new_version = bump_cache_version(VERSION_NAME)
+        if not up_to_date:
+            return
+        if text:
+            _index.add(kind, pk, text)
+        else:
+            _index.remove(kind, pk)
+        _index.version = new_version
@@ -0,0 +1,193 @@
+# crud/search/backends.py
+import abc
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Func, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.utils.module_loading import import_string
+
+from ..models import IndeksPencarianProduk, Produk
+from .text import tokenize, words
+
+DEFAULT_SEARCH_BACKEND = 'crud.search.backends.InvertedIndexBackend'
+
+# Bobot per sumber teks, nama produk paling menentukan
+FIELD_WEIGHTS = {
+    'nm_produk': 3.0,
+    'kategori': 2.0,
+    'nm_bisnis': 2.0,
+    'username': 1.0,
+    'desc': 1.0,
+    'bahan_baku': 0.5,
+    'metode_produksi': 0.5,
+}
+# Kemunculan berulang di satu field dihitung maksimal sekian kali
+MAX_TERM_FREQUENCY = 3
+
+
+def get_search_backend():
+    """
+    Backend pencarian aktif, bisa diganti lewat settings.SEARCH_BACKEND
+    """
+    return import_string(getattr(settings, 'SEARCH_BACKEND', DEFAULT_SEARCH_BACKEND))()
+
+
+def produk_documents(produk_list):
+    """
+    Teks per field untuk setiap produk, termasuk kategori dan bisnis UMKM pemiliknya
+    """
+    for produk in produk_list:
+        profil = getattr(produk.umkm, 'profil_umkm', None)
+        yield produk, {
+            'nm_produk': produk.nm_produk,
+            'kategori': produk.kategori.nm_kategori,
+            'nm_bisnis': profil.nm_bisnis if profil else '',
+            'username': produk.umkm.username,
+            'desc': produk.desc,
+            'bahan_baku': produk.bahan_baku,
+            'metode_produksi': produk.metode_produksi,
+        }
+
+
+def build_index_rows(produk, fields):
+    """
+    Menghitung baris IndeksPencarianProduk untuk satu produk
+    """
+    weights = defaultdict(float)
+    surface = {}
+    for field, text in fields.items():
+        frequency = defaultdict(int)
+        for term, kata in tokenize(text):
+            frequency[term] += 1
+            surface.setdefault(term, kata)
+        for term, count in frequency.items():
+            weights[term] += FIELD_WEIGHTS[field] * min(count, MAX_TERM_FREQUENCY)
+
+    return [
+        IndeksPencarianProduk(produk=produk, term=term, kata=surface[term], bobot=bobot)
+        for term, bobot in weights.items()
+    ]
+
+
+class BaseSearchBackend(abc.ABC):
+    """
+    Antarmuka backend pencarian katalog produk.
+
+    search() mengembalikan queryset yang sudah difilter dan dianotasi skor_pencarian
+    (semakin besar semakin relevan). Autocomplete ada di crud.search.autocomplete.
+    """
+
+    @abc.abstractmethod
+    def search(self, queryset, query):
+        pass
+
+    def index_produk(self, produk_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class InvertedIndexBackend(BaseSearchBackend):
+    """
+    Pencarian memakai tabel indeks_pencarian_produk, portabel untuk semua database.
+    Semua kata query wajib cocok; kata terakhir dicocokkan sebagai awalan (search-as-you-type).
+    """
+    batch_size = 500
+
+    def index_produk(self, produk_ids):
+        produk_ids = list(produk_ids)
+        if not produk_ids:
+            return
+
+        produk_list = Produk.objects.filter(pk__in=produk_ids).select_related('kategori', 'umkm__profil_umkm')
+        rows = []
+        for produk, fields in produk_documents(produk_list):
+            rows.extend(build_index_rows(produk, fields))
+
+        with transaction.atomic():
+            IndeksPencarianProduk.objects.filter(produk_id__in=produk_ids).delete()
+            IndeksPencarianProduk.objects.bulk_create(rows, batch_size=self.batch_size)
+
+    def rebuild(self):
+        IndeksPencarianProduk.objects.all().delete()
+        ids = list(Produk.objects.values_list('pk', flat=True))
+        for start in range(0, len(ids), self.batch_size):
+            self.index_produk(ids[start:start + self.batch_size])
+        return len(ids)
+
+    def _term_conditions(self, query):
+        tokens = tokenize(query)
+        conditions = [Q(term=term) for term, kata in tokens[:-1]]
+        if tokens:
+            term, kata = tokens[-1]
+            conditions.append(Q(term=term) | Q(kata__startswith=kata))
+        return conditions
+
+    def search(self, queryset, query):
+        conditions = self._term_conditions(query)
+        if not conditions:
+            # Query hanya berisi stopword/simbol, gunakan pencocokan nama biasa
+            return queryset.filter(nm_produk__icontains=query.strip()).annotate(
+                skor_pencarian=Value(0.0, output_field=FloatField())
+            )
+
+        # Setiap kata query harus cocok minimal satu term milik produk
+        flags = {
+            f'cocok_{idx}': Max(Case(When(condition, then=Value(1)), default=Value(0)))
+            for idx, condition in enumerate(conditions)
+        }
+        matches = IndeksPencarianProduk.objects.filter(reduce(or_, conditions)).values('produk')
+        matches = matches.annotate(skor=Sum('bobot'), **flags).filter(**{name: 1 for name in flags})
+
+        skor = matches.filter(produk=OuterRef('pk')).values('skor')
+        return queryset.filter(pk__in=matches.values('produk')).annotate(
+            skor_pencarian=Subquery(skor, output_field=FloatField())
+        )
+
+
+class MatchAgainst(Func):
+    """
+    MATCH (kolom, ...) AGAINST (query IN BOOLEAN MODE) MySQL.
+    Kolom berupa F() sehingga alias tabel ikut diganti Django (mis. di dalam Subquery).
+    """
+    output_field = FloatField()
+
+    def __init__(self, *fields, query):
+        super().__init__(*[F(field) for field in fields], Value(query))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        *columns, query = self.get_source_expressions()
+        sql_parts, params = [], []
+        for column in columns:
+            sql, column_params = compiler.compile(column)
+            sql_parts.append(sql)
+            params.extend(column_params)
+        query_sql, query_params = compiler.compile(query)
+        return f'MATCH ({", ".join(sql_parts)}) AGAINST ({query_sql} IN BOOLEAN MODE)', (*params, *query_params)
+
+
+class MySQLFullTextBackend(InvertedIndexBackend):
+    """
+    Pencarian memakai FULLTEXT index MySQL pada kolom teks produk (MATCH ... AGAINST).
+    Hanya mencakup teks produk itu sendiri (tanpa kategori dan nama bisnis).
+    Index dideklarasikan di Produk.Meta.indexes (FullTextIndex) dan dibuat oleh migrate.
+    """
+    index_name = 'produk_fulltext'
+
+    @property
+    def fields(self):
+        return next(index.fields for index in Produk._meta.indexes if index.name == self.index_name)
+
+    def search(self, queryset, query):
+        query_words = words(query)
+        if connection.vendor != 'mysql' or not query_words:
+            return super().search(queryset, query)
+
+        # Semua kata wajib ada, kata terakhir sebagai awalan
+        boolean_query = ' '.join(f'+{word}' for word in query_words[:-1]) + f' +{query_words[-1]}*'
+        score = MatchAgainst(*self.fields, query=boolean_query.strip())
+        return queryset.annotate(skor_pencarian=score).filter(skor_pencarian__gt=0)
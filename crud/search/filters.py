@@ -0,0 +1,32 @@
+# crud/search/filters.py
+from rest_framework.filters import BaseFilterBackend
+
+from .backends import get_search_backend
+
+
+class ProdukSearchFilter(BaseFilterBackend):
+    """
+    Filter DRF untuk parameter ?search= pada queryset Produk memakai backend pencarian.
+    Hasil diurutkan berdasarkan relevansi kecuali parameter ordering diberikan.
+    """
+    search_param = 'search'
+    ordering_param = 'ordering'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+
+        queryset = get_search_backend().search(queryset, query)
+        if self.ordering_param not in request.query_params:
+            queryset = queryset.order_by('-skor_pencarian', *queryset.query.order_by)
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Kata kunci pencarian produk (diurutkan berdasarkan relevansi)',
+            'schema': {'type': 'string'},
+        }]
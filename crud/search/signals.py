@@ -0,0 +1,85 @@
+# crud/search/signals.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..models import KategoriProduk, Produk, ProfilUMKM
+from .autocomplete import invalidate_autocomplete, update_autocomplete
+from .backends import get_search_backend
+
+
+def reindex_produk_later(produk_ids):
+    """
+    Memperbarui indeks setelah transaksi selesai, agar indeks tidak berisi data yang di-rollback
+    """
+    produk_ids = list(produk_ids)
+    if produk_ids:
+        transaction.on_commit(lambda: get_search_backend().index_produk(produk_ids))
+
+
+@receiver(post_save, sender=Produk)
+def reindex_produk(sender, instance, **kwargs):
+    reindex_produk_later([instance.pk])
+
+
+@receiver(post_save, sender=KategoriProduk)
+def reindex_produk_kategori(sender, instance, created, **kwargs):
+    if not created:
+        reindex_produk_later(instance.produk.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=ProfilUMKM)
+def reindex_produk_profil(sender, instance, **kwargs):
+    reindex_produk_later(Produk.objects.filter(umkm_id=instance.user_id).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def reindex_produk_user(sender, instance, created, update_fields=None, **kwargs):
+    # Hanya username yang ikut diindeks (mis. login hanya menyimpan last_login)
+    if created or (update_fields is not None and 'username' not in update_fields):
+        return
+    if not instance.tracked_changed('username'):
+        return
+    reindex_produk_later(instance.produk.values_list('pk', flat=True))
+
+
+def update_autocomplete_later(kind, pk, text=None):
+    transaction.on_commit(lambda: update_autocomplete(kind, pk, text))
+
+
+@receiver(post_save, sender=Produk)
+def autocomplete_produk(sender, instance, **kwargs):
+    tampil = instance.aktif and instance.umkm.is_active
+    update_autocomplete_later('produk', instance.pk, instance.nm_produk if tampil else None)
+
+
+@receiver(post_save, sender=ProfilUMKM)
+def autocomplete_profil(sender, instance, **kwargs):
+    update_autocomplete_later('umkm', instance.user_id, instance.nm_bisnis if instance.user.is_active else None)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def autocomplete_user(sender, instance, created, update_fields=None, **kwargs):
+    # Produk dan bisnis akun yang (di)nonaktifkan ikut hilang/muncul: muat ulang seluruh indeks
+    if created or (update_fields is not None and 'is_active' not in update_fields):
+        return
+    if instance.tracked_changed('is_active'):
+        transaction.on_commit(invalidate_autocomplete)
+
+
+@receiver(post_save, sender=KategoriProduk)
+def autocomplete_kategori(sender, instance, **kwargs):
+    update_autocomplete_later('kategori', instance.pk, instance.nm_kategori)
+
+
+@receiver(post_delete, sender=Produk)
+@receiver(post_delete, sender=KategoriProduk)
+def autocomplete_hapus(sender, instance, **kwargs):
+    kind = 'produk' if sender is Produk else 'kategori'
+    update_autocomplete_later(kind, instance.pk)
+
+
+@receiver(post_delete, sender=ProfilUMKM)
+def autocomplete_hapus_profil(sender, instance, **kwargs):
+    update_autocomplete_later('umkm', instance.user_id)
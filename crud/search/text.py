@@ -0,0 +1,76 @@
+# crud/search/text.py
+import re
+import unicodedata
+
+# Kata umum bahasa Indonesia yang tidak membantu pencarian
+STOPWORDS = frozenset([
+    'ada', 'adalah', 'agar', 'akan', 'atau', 'bagi', 'bahwa', 'dalam', 'dan', 'dari', 'dengan',
+    'di', 'hingga', 'ini', 'itu', 'juga', 'ke', 'karena', 'kami', 'kita', 'lebih', 'oleh', 'pada',
+    'para', 'saja', 'sangat', 'secara', 'serta', 'seperti', 'sudah', 'tanpa', 'telah', 'tersebut',
+    'untuk', 'yaitu', 'yang',
+])
+
+PARTIKEL = ('lah', 'kah', 'tah', 'pun')
+KATA_GANTI_MILIK = ('nya', 'ku', 'mu')
+AKHIRAN = ('kan', 'an')
+AWALAN = ('meng', 'meny', 'mem', 'men', 'me', 'peng', 'peny', 'pem', 'pen', 'per', 'pe',
+          'ber', 'be', 'ter', 'di', 'ke', 'se')
+
+# Sisa kata dasar minimal agar imbuhan boleh dilepas (mencegah 'ikan' -> 'ik')
+PANJANG_DASAR_MINIMAL = 4
+PANJANG_TERM_MAKSIMAL = 64
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    """
+    Huruf kecil dan tanpa aksen/diakritik
+    """
+    text = unicodedata.normalize('NFKD', str(text or '').lower())
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def _strip_suffix(word, suffixes):
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= PANJANG_DASAR_MINIMAL:
+            return word[:-len(suffix)]
+    return word
+
+
+def _strip_prefix(word, prefixes):
+    for prefix in prefixes:
+        if word.startswith(prefix) and len(word) - len(prefix) >= PANJANG_DASAR_MINIMAL:
+            return word[len(prefix):]
+    return word
+
+
+def stem(word):
+    """
+    Stemmer ringan bahasa Indonesia: partikel, kata ganti milik, satu akhiran dan satu awalan.
+    Tidak selengkap Nazief-Adriani, tapi konsisten untuk dokumen dan query.
+    """
+    if word.isdigit():
+        return word
+    word = _strip_suffix(word, PARTIKEL)
+    word = _strip_suffix(word, KATA_GANTI_MILIK)
+    word = _strip_suffix(word, AKHIRAN)
+    word = _strip_prefix(word, AWALAN)
+    return word
+
+
+def words(text, keep_stopwords=False):
+    """
+    Kata ternormalisasi dari teks sesuai urutan kemunculan, stopword dibuang kecuali diminta
+    """
+    return [
+        word[:PANJANG_TERM_MAKSIMAL] for word in _TOKEN_RE.findall(normalize(text))
+        if len(word) > 1 and (keep_stopwords or word not in STOPWORDS)
+    ]
+
+
+def tokenize(text):
+    """
+    Daftar pasangan (term, kata) dari teks: term = kata dasar, kata = bentuk aslinya
+    """
+    return [(stem(word), word) for word in words(text)]
@@ -11,6 +11,8 @@ class FilePenjualanSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model FilePenjualan
     """
+    select_related_fields = ('umkm__profil_umkm',)
+
     umkm_detail = serializers.SerializerMethodField()
     ukuran_file_display = serializers.SerializerMethodField()
     file_url = serializers.SerializerMethodField()
@@ -87,6 +89,8 @@ class FilePenjualanListSerializer(serializers.ModelSerializer):
     """
     Serializer untuk list FilePenjualan (lightweight)
     """
+    select_related_fields = ('umkm',)
+
     ukuran_file_display = serializers.SerializerMethodField()
     nama_umkm = serializers.CharField(source='umkm.username', read_only=True)
 
@@ -1,13 +1,15 @@
 from rest_framework import serializers
 from ..models import Kabupaten, Provinsi
+from ..regions import get_region_cache, tipe_kabupaten
 
 
 class KabupatenSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model Kabupaten
     """
+
     provinsi_detail = serializers.SerializerMethodField()
-    provinsi_nama = serializers.CharField(source='provinsi.nm_provinsi', read_only=True)
+    provinsi_nama = serializers.SerializerMethodField()
     kecamatan_count = serializers.SerializerMethodField()
     tipe = serializers.SerializerMethodField()
 
@@ -20,22 +22,26 @@ class KabupatenSerializer(serializers.ModelSerializer):
         """
         Menampilkan detail provinsi
         """
+        prov = get_region_cache().get_provinsi(obj.provinsi_id)
         return {
-            'id': obj.provinsi.id,
-            'nm_provinsi': obj.provinsi.nm_provinsi
+            'id': prov.id,
+            'nm_provinsi': prov.nm_provinsi
         }
 
+    def get_provinsi_nama(self, obj):
+        return get_region_cache().get_provinsi(obj.provinsi_id).nm_provinsi
+
     def get_kecamatan_count(self, obj):
         """
         Menghitung jumlah kecamatan dalam kabupaten
         """
-        return obj.kecamatan.count()
+        return get_region_cache().jumlah_kecamatan(obj.pk)
 
     def get_tipe(self, obj):
         """
         Mengembalikan tipe kabupaten atau kota
         """
-        return "Kota" if obj.is_kota else "Kabupaten"
+        return tipe_kabupaten(obj)
 
     def validate(self, data):
         """
@@ -69,7 +75,8 @@ class KabupatenListSerializer(serializers.ModelSerializer):
     """
     Serializer untuk list Kabupaten (lightweight)
     """
-    provinsi_nama = serializers.CharField(source='provinsi.nm_provinsi', read_only=True)
+
+    provinsi_nama = serializers.SerializerMethodField()
     provinsi_detail = serializers.SerializerMethodField()
     tipe = serializers.SerializerMethodField()
     kecamatan_count = serializers.SerializerMethodField()
@@ -83,19 +90,23 @@ class KabupatenListSerializer(serializers.ModelSerializer):
         """
         Menampilkan detail provinsi
         """
+        prov = get_region_cache().get_provinsi(obj.provinsi_id)
         return {
-            'id': obj.provinsi.id,
-            'nm_provinsi': obj.provinsi.nm_provinsi
+            'id': prov.id,
+            'nm_provinsi': prov.nm_provinsi
         }
 
+    def get_provinsi_nama(self, obj):
+        return get_region_cache().get_provinsi(obj.provinsi_id).nm_provinsi
+
     def get_tipe(self, obj):
         """
         Mengembalikan tipe kabupaten atau kota
         """
-        return "Kota" if obj.is_kota else "Kabupaten"
+        return tipe_kabupaten(obj)
 
     def get_kecamatan_count(self, obj):
         """
         Menghitung jumlah kecamatan dalam kabupaten
         """
-        return obj.kecamatan.count()
\ No newline at end of file
+        return get_region_cache().jumlah_kecamatan(obj.pk)
\ No newline at end of file
@@ -1,7 +1,22 @@
+from django.db.models import Count
 from rest_framework import serializers
 from ..models import KategoriProduk
 
 
+def annotate_produk_count(queryset):
+    """
+    Jumlah produk per kategori dihitung dalam query list, bukan satu COUNT per baris
+    """
+    return queryset.annotate(produk_count=Count('produk'))
+
+
+def get_produk_count_value(obj):
+    # Instance hasil create/update tidak melewati annotate_produk_count
+    if hasattr(obj, 'produk_count'):
+        return obj.produk_count
+    return obj.produk.count()
+
+
 class KategoriProdukSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model KategoriProduk
@@ -13,11 +28,15 @@ class KategoriProdukSerializer(serializers.ModelSerializer):
         fields = ['id', 'nm_kategori', 'jasa', 'desc', 'produk_count']
         read_only_fields = ['id']
 
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        return annotate_produk_count(queryset)
+
     def get_produk_count(self, obj):
         """
         Menghitung jumlah produk dalam kategori ini
         """
-        return obj.produk.count()
+        return get_produk_count_value(obj)
 
     def validate_nm_kategori(self, value):
         """
@@ -41,8 +60,12 @@ class KategoriProdukListSerializer(serializers.ModelSerializer):
         model = KategoriProduk
         fields = ['id', 'nm_kategori', 'jasa', 'produk_count']
 
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        return annotate_produk_count(queryset)
+
     def get_produk_count(self, obj):
         """
         Menghitung jumlah produk dalam kategori ini
         """
-        return obj.produk.count()
\ No newline at end of file
+        return get_produk_count_value(obj)
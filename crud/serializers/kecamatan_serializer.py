@@ -1,15 +1,17 @@
 from rest_framework import serializers
 from ..models import Kecamatan, Kabupaten
+from ..regions import get_region_cache, tipe_kabupaten
 
 
 class KecamatanSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model Kecamatan
     """
+
     kabupaten_detail = serializers.SerializerMethodField()
     provinsi_detail = serializers.SerializerMethodField()
-    kabupaten_nama = serializers.CharField(source='kabupaten.nm_kabupaten', read_only=True)
-    provinsi_nama = serializers.CharField(source='kabupaten.provinsi.nm_provinsi', read_only=True)
+    kabupaten_nama = serializers.SerializerMethodField()
+    provinsi_nama = serializers.SerializerMethodField()
     tipe_kabupaten = serializers.SerializerMethodField()
 
     class Meta:
@@ -21,27 +23,37 @@ class KecamatanSerializer(serializers.ModelSerializer):
         """
         Menampilkan detail kabupaten
         """
+        kab = get_region_cache().get_kabupaten(obj.kabupaten_id)
         return {
-            'id': obj.kabupaten.id,
-            'nm_kabupaten': obj.kabupaten.nm_kabupaten,
-            'is_kota': obj.kabupaten.is_kota,
-            'kode': obj.kabupaten.kode
+            'id': kab.id,
+            'nm_kabupaten': kab.nm_kabupaten,
+            'is_kota': kab.is_kota,
+            'kode': kab.kode
         }
 
     def get_provinsi_detail(self, obj):
         """
         Menampilkan detail provinsi
         """
+        kab = get_region_cache().get_kabupaten(obj.kabupaten_id)
+        prov = get_region_cache().get_provinsi(kab.provinsi_id)
         return {
-            'id': obj.kabupaten.provinsi.id,
-            'nm_provinsi': obj.kabupaten.provinsi.nm_provinsi
+            'id': prov.id,
+            'nm_provinsi': prov.nm_provinsi
         }
 
+    def get_kabupaten_nama(self, obj):
+        return get_region_cache().get_kabupaten(obj.kabupaten_id).nm_kabupaten
+
+    def get_provinsi_nama(self, obj):
+        kab = get_region_cache().get_kabupaten(obj.kabupaten_id)
+        return get_region_cache().get_provinsi(kab.provinsi_id).nm_provinsi
+
     def get_tipe_kabupaten(self, obj):
         """
         Mengembalikan tipe kabupaten atau kota
         """
-        return "Kota" if obj.kabupaten.is_kota else "Kabupaten"
+        return tipe_kabupaten(get_region_cache().get_kabupaten(obj.kabupaten_id))
 
     def validate(self, data):
         """
@@ -75,8 +87,9 @@ class KecamatanListSerializer(serializers.ModelSerializer):
     """
     Serializer untuk list Kecamatan (lightweight)
     """
-    kabupaten_nama = serializers.CharField(source='kabupaten.nm_kabupaten', read_only=True)
-    provinsi_nama = serializers.CharField(source='kabupaten.provinsi.nm_provinsi', read_only=True)
+
+    kabupaten_nama = serializers.SerializerMethodField()
+    provinsi_nama = serializers.SerializerMethodField()
     kabupaten_detail = serializers.SerializerMethodField()
     provinsi_detail = serializers.SerializerMethodField()
     tipe_kabupaten = serializers.SerializerMethodField()
@@ -90,24 +103,34 @@ class KecamatanListSerializer(serializers.ModelSerializer):
         """
         Menampilkan detail kabupaten
         """
+        kab = get_region_cache().get_kabupaten(obj.kabupaten_id)
         return {
-            'id': obj.kabupaten.id,
-            'nm_kabupaten': obj.kabupaten.nm_kabupaten,
-            'is_kota': obj.kabupaten.is_kota,
-            'kode': obj.kabupaten.kode
+            'id': kab.id,
+            'nm_kabupaten': kab.nm_kabupaten,
+            'is_kota': kab.is_kota,
+            'kode': kab.kode
         }
 
     def get_provinsi_detail(self, obj):
         """
         Menampilkan detail provinsi
         """
+        kab = get_region_cache().get_kabupaten(obj.kabupaten_id)
+        prov = get_region_cache().get_provinsi(kab.provinsi_id)
         return {
-            'id': obj.kabupaten.provinsi.id,
-            'nm_provinsi': obj.kabupaten.provinsi.nm_provinsi
+            'id': prov.id,
+            'nm_provinsi': prov.nm_provinsi
         }
 
+    def get_kabupaten_nama(self, obj):
+        return get_region_cache().get_kabupaten(obj.kabupaten_id).nm_kabupaten
+
+    def get_provinsi_nama(self, obj):
+        kab = get_region_cache().get_kabupaten(obj.kabupaten_id)
+        return get_region_cache().get_provinsi(kab.provinsi_id).nm_provinsi
+
     def get_tipe_kabupaten(self, obj):
         """
         Mengembalikan tipe kabupaten atau kota
         """
-        return "Kota" if obj.kabupaten.is_kota else "Kabupaten"
\ No newline at end of file
+        return tipe_kabupaten(get_region_cache().get_kabupaten(obj.kabupaten_id))
\ No newline at end of file
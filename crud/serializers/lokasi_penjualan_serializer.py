@@ -1,13 +1,36 @@
 # Update untuk serializers/lokasi_penjualan_serializer.py
 
+from django.db.models import F
 from rest_framework import serializers
 from ..models import LokasiPenjualan
+from ..regions import get_region_cache, nama_kabupaten, tipe_kabupaten
+
+
+def annotate_total_penjualan(queryset):
+    """
+    Menambahkan jumlah transaksi penjualan per lokasi sebagai anotasi total_penjualan,
+    dibaca dari kolom penghitung jumlah_penjualan (crud/counters.py)
+    """
+    return queryset.annotate(total_penjualan=F('jumlah_penjualan'))
+
+
+def get_total_penjualan_value(obj):
+    """
+    Membaca anotasi total_penjualan, atau kolom penghitung jika instance tidak berasal
+    dari queryset beranotasi (mis. hasil create/update)
+    """
+    total = getattr(obj, 'total_penjualan', None)
+    if total is None:
+        return obj.jumlah_penjualan
+    return total
 
 
 class LokasiPenjualanSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model LokasiPenjualan
     """
+    select_related_fields = ('umkm__profil_umkm', 'kategori_lokasi')
+
     kecamatan_detail = serializers.SerializerMethodField()
     kabupaten_detail = serializers.SerializerMethodField()
     provinsi_detail = serializers.SerializerMethodField()
@@ -16,7 +39,7 @@ class LokasiPenjualanSerializer(serializers.ModelSerializer):
     total_penjualan = serializers.SerializerMethodField()
 
     # Direct access fields
-    kecamatan_nama = serializers.CharField(source='kecamatan.nm_kecamatan', read_only=True, allow_null=True)
+    kecamatan_nama = serializers.SerializerMethodField()
     kabupaten_nama = serializers.SerializerMethodField()
     provinsi_nama = serializers.SerializerMethodField()
     kategori_lokasi_nama = serializers.CharField(source='kategori_lokasi.nm_kategori_lokasi', read_only=True,
@@ -96,56 +119,63 @@ class LokasiPenjualanSerializer(serializers.ModelSerializer):
 
         return data
 
+    def get_kecamatan_nama(self, obj):
+        kec = get_region_cache().get_kecamatan(obj.kecamatan_id)
+        return kec.nm_kecamatan if kec else None
+
     def get_kecamatan_detail(self, obj):
-        if not obj.kecamatan:
+        kec = get_region_cache().get_kecamatan(obj.kecamatan_id)
+        if not kec:
             return None
         return {
-            'id': obj.kecamatan.id,
-            'nm_kecamatan': obj.kecamatan.nm_kecamatan,
-            'kode': obj.kecamatan.kode
+            'id': kec.id,
+            'nm_kecamatan': kec.nm_kecamatan,
+            'kode': kec.kode
         }
 
     def get_kabupaten_detail(self, obj):
-        if not obj.kecamatan or not obj.kecamatan.kabupaten:
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        if not kab:
             return None
-        kab = obj.kecamatan.kabupaten
         return {
             'id': kab.id,
             'nm_kabupaten': kab.nm_kabupaten,
             'is_kota': kab.is_kota,
-            'tipe': "Kota" if kab.is_kota else "Kabupaten",
+            'tipe': tipe_kabupaten(kab),
             'kode': kab.kode
         }
 
     def get_provinsi_detail(self, obj):
-        if not obj.kecamatan or not obj.kecamatan.kabupaten or not obj.kecamatan.kabupaten.provinsi:
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        if not prov:
             return None
-        prov = obj.kecamatan.kabupaten.provinsi
         return {
             'id': prov.id,
             'nm_provinsi': prov.nm_provinsi
         }
 
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        return annotate_total_penjualan(queryset)
+
     def get_total_penjualan(self, obj):
-        return obj.penjualan.count()
+        return get_total_penjualan_value(obj)
 
     def get_kabupaten_nama(self, obj):
-        if obj.kecamatan and obj.kecamatan.kabupaten:
-            kab = obj.kecamatan.kabupaten
-            prefix = "Kota" if kab.is_kota else "Kabupaten"
-            return f"{prefix} {kab.nm_kabupaten}"
-        return None
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        return nama_kabupaten(kab) if kab else None
 
     def get_provinsi_nama(self, obj):
-        if obj.kecamatan and obj.kecamatan.kabupaten and obj.kecamatan.kabupaten.provinsi:
-            return obj.kecamatan.kabupaten.provinsi.nm_provinsi
-        return None
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        return prov.nm_provinsi if prov else None
 
 
 class LokasiPenjualanListSerializer(serializers.ModelSerializer):
     """
     Serializer untuk list LokasiPenjualan (lightweight)
     """
+    select_related_fields = ('umkm__profil_umkm', 'kategori_lokasi')
+
     kecamatan_nama = serializers.SerializerMethodField()
     kabupaten_nama = serializers.SerializerMethodField()
     provinsi_nama = serializers.SerializerMethodField()
@@ -165,27 +195,22 @@ class LokasiPenjualanListSerializer(serializers.ModelSerializer):
         """
         Mendapatkan nama kecamatan
         """
-        if obj.kecamatan:
-            return obj.kecamatan.nm_kecamatan
-        return None
+        kec = get_region_cache().get_kecamatan(obj.kecamatan_id)
+        return kec.nm_kecamatan if kec else None
 
     def get_kabupaten_nama(self, obj):
         """
         Mendapatkan nama kabupaten
         """
-        if obj.kecamatan and obj.kecamatan.kabupaten:
-            kab = obj.kecamatan.kabupaten
-            prefix = "Kota" if kab.is_kota else "Kabupaten"
-            return f"{prefix} {kab.nm_kabupaten}"
-        return None
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        return nama_kabupaten(kab) if kab else None
 
     def get_provinsi_nama(self, obj):
         """
         Mendapatkan nama provinsi
         """
-        if obj.kecamatan and obj.kecamatan.kabupaten and obj.kecamatan.kabupaten.provinsi:
-            return obj.kecamatan.kabupaten.provinsi.nm_provinsi
-        return None
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        return prov.nm_provinsi if prov else None
 
     def get_umkm_nama(self, obj):
         """
@@ -195,8 +220,12 @@ class LokasiPenjualanListSerializer(serializers.ModelSerializer):
             return obj.umkm.profil_umkm.nm_bisnis
         return f"{obj.umkm.first_name} {obj.umkm.last_name}".strip() or obj.umkm.username
 
+    @classmethod
+    def annotate_queryset(cls, queryset):
+        return annotate_total_penjualan(queryset)
+
     def get_total_penjualan(self, obj):
         """
         Menghitung total penjualan di lokasi ini
         """
-        return obj.penjualan.count()
\ No newline at end of file
+        return get_total_penjualan_value(obj)
\ No newline at end of file
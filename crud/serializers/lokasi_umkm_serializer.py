@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from ..models import LokasiUMKM
+from ..regions import get_region_cache, tipe_kabupaten
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -9,6 +10,8 @@ class LokasiUMKMSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model LokasiUMKM
     """
+    select_related_fields = ('pengguna__profil_umkm',)
+
     pengguna_detail = serializers.SerializerMethodField()
     kecamatan_detail = serializers.SerializerMethodField()
     kabupaten_detail = serializers.SerializerMethodField()
@@ -16,9 +19,9 @@ class LokasiUMKMSerializer(serializers.ModelSerializer):
     nm_bisnis = serializers.SerializerMethodField()
 
     # Direct access fields
-    kecamatan_nama = serializers.CharField(source='kecamatan.nm_kecamatan', read_only=True)
-    kabupaten_nama = serializers.CharField(source='kecamatan.kabupaten.nm_kabupaten', read_only=True)
-    provinsi_nama = serializers.CharField(source='kecamatan.kabupaten.provinsi.nm_provinsi', read_only=True)
+    kecamatan_nama = serializers.SerializerMethodField()
+    kabupaten_nama = serializers.SerializerMethodField()
+    provinsi_nama = serializers.SerializerMethodField()
     pengguna_nama = serializers.SerializerMethodField()
     tipe_kabupaten = serializers.SerializerMethodField()
 
@@ -58,26 +61,38 @@ class LokasiUMKMSerializer(serializers.ModelSerializer):
             return obj.pengguna.profil_umkm.nm_bisnis
         return obj.pengguna.username
 
+    def get_kecamatan_nama(self, obj):
+        return get_region_cache().get_kecamatan(obj.kecamatan_id).nm_kecamatan
+
+    def get_kabupaten_nama(self, obj):
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        return kab.nm_kabupaten
+
+    def get_provinsi_nama(self, obj):
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        return prov.nm_provinsi
+
     def get_kecamatan_detail(self, obj):
         """
         Menampilkan detail kecamatan
         """
+        kec = get_region_cache().get_kecamatan(obj.kecamatan_id)
         return {
-            'id': obj.kecamatan.id,
-            'nm_kecamatan': obj.kecamatan.nm_kecamatan,
-            'kode': obj.kecamatan.kode
+            'id': kec.id,
+            'nm_kecamatan': kec.nm_kecamatan,
+            'kode': kec.kode
         }
 
     def get_kabupaten_detail(self, obj):
         """
         Menampilkan detail kabupaten
         """
-        kab = obj.kecamatan.kabupaten
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
         return {
             'id': kab.id,
             'nm_kabupaten': kab.nm_kabupaten,
             'is_kota': kab.is_kota,
-            'tipe': "Kota" if kab.is_kota else "Kabupaten",
+            'tipe': tipe_kabupaten(kab),
             'kode': kab.kode
         }
 
@@ -85,7 +100,7 @@ class LokasiUMKMSerializer(serializers.ModelSerializer):
         """
         Menampilkan detail provinsi
         """
-        prov = obj.kecamatan.kabupaten.provinsi
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
         return {
             'id': prov.id,
             'nm_provinsi': prov.nm_provinsi
@@ -95,7 +110,8 @@ class LokasiUMKMSerializer(serializers.ModelSerializer):
         """
         Mengembalikan tipe kabupaten atau kota
         """
-        return "Kota" if obj.kecamatan.kabupaten.is_kota else "Kabupaten"
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        return tipe_kabupaten(kab)
 
     def validate(self, data):
         """
@@ -129,11 +145,13 @@ class LokasiUMKMListSerializer(serializers.ModelSerializer):
     """
     Serializer untuk list LokasiUMKM (lightweight)
     """
+    select_related_fields = ('pengguna__profil_umkm',)
+
     nm_bisnis = serializers.SerializerMethodField()
     pengguna_nama = serializers.SerializerMethodField()
-    kecamatan_nama = serializers.CharField(source='kecamatan.nm_kecamatan', read_only=True)
-    kabupaten_nama = serializers.CharField(source='kecamatan.kabupaten.nm_kabupaten', read_only=True)
-    provinsi_nama = serializers.CharField(source='kecamatan.kabupaten.provinsi.nm_provinsi', read_only=True)
+    kecamatan_nama = serializers.SerializerMethodField()
+    kabupaten_nama = serializers.SerializerMethodField()
+    provinsi_nama = serializers.SerializerMethodField()
 
     pengguna_detail = serializers.SerializerMethodField()
     kecamatan_detail = serializers.SerializerMethodField()
@@ -171,20 +189,32 @@ class LokasiUMKMListSerializer(serializers.ModelSerializer):
             'nama_lengkap': f"{obj.pengguna.first_name} {obj.pengguna.last_name}".strip()
         }
 
+    def get_kecamatan_nama(self, obj):
+        return get_region_cache().get_kecamatan(obj.kecamatan_id).nm_kecamatan
+
+    def get_kabupaten_nama(self, obj):
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        return kab.nm_kabupaten
+
+    def get_provinsi_nama(self, obj):
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
+        return prov.nm_provinsi
+
     def get_kecamatan_detail(self, obj):
         """
         Menampilkan detail kecamatan (versi ringkas)
         """
+        kec = get_region_cache().get_kecamatan(obj.kecamatan_id)
         return {
-            'id': obj.kecamatan.id,
-            'nm_kecamatan': obj.kecamatan.nm_kecamatan
+            'id': kec.id,
+            'nm_kecamatan': kec.nm_kecamatan
         }
 
     def get_kabupaten_detail(self, obj):
         """
         Menampilkan detail kabupaten (versi ringkas)
         """
-        kab = obj.kecamatan.kabupaten
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
         return {
             'id': kab.id,
             'nm_kabupaten': kab.nm_kabupaten,
@@ -195,7 +225,7 @@ class LokasiUMKMListSerializer(serializers.ModelSerializer):
         """
         Menampilkan detail provinsi (versi ringkas)
         """
-        prov = obj.kecamatan.kabupaten.provinsi
+        kec, kab, prov = get_region_cache().hierarchy(obj.kecamatan_id)
         return {
             'id': prov.id,
             'nm_provinsi': prov.nm_provinsi
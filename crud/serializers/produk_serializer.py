@@ -10,6 +10,8 @@ class ProdukSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model Produk
     """
+    select_related_fields = ('umkm__profil_umkm', 'kategori')
+
     umkm_detail = serializers.SerializerMethodField()
     kategori_detail = serializers.SerializerMethodField()
     nm_bisnis = serializers.SerializerMethodField()
@@ -110,6 +112,8 @@ class ProdukListSerializer(serializers.ModelSerializer):
     """
     Serializer untuk list Produk (lightweight)
     """
+    select_related_fields = ('umkm__profil_umkm', 'kategori')
+
     umkm_nama = serializers.SerializerMethodField()
     nm_bisnis = serializers.SerializerMethodField()
     kategori_nama = serializers.CharField(source='kategori.nm_kategori', read_only=True)
@@ -2,6 +2,7 @@
 
 from rest_framework import serializers
 from ..models import ProdukTerjual
+from ..regions import get_region_cache, nama_kabupaten
 from decimal import Decimal
 
 
@@ -9,6 +10,12 @@ class ProdukTerjualSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model ProdukTerjual
     """
+    select_related_fields = (
+        'produk__umkm__profil_umkm',
+        'produk__kategori',
+        'lokasi_penjualan'
+    )
+
     produk_detail = serializers.SerializerMethodField()
     lokasi_penjualan_detail = serializers.SerializerMethodField()
     umkm_detail = serializers.SerializerMethodField()
@@ -70,16 +77,15 @@ class ProdukTerjualSerializer(serializers.ModelSerializer):
             'alamat': lokasi.alamat
         }
 
-        if lokasi.kecamatan:
-            result['kecamatan'] = lokasi.kecamatan.nm_kecamatan
+        kec, kab, prov = get_region_cache().hierarchy(lokasi.kecamatan_id)
+        if kec:
+            result['kecamatan'] = kec.nm_kecamatan
 
-            if lokasi.kecamatan.kabupaten:
-                kab = lokasi.kecamatan.kabupaten
-                prefix = "Kota" if kab.is_kota else "Kabupaten"
-                result['kabupaten'] = f"{prefix} {kab.nm_kabupaten}"
+            if kab:
+                result['kabupaten'] = nama_kabupaten(kab)
 
-                if kab.provinsi:
-                    result['provinsi'] = kab.provinsi.nm_provinsi
+                if prov:
+                    result['provinsi'] = prov.nm_provinsi
 
         return result
 
@@ -157,11 +163,23 @@ class ProdukTerjualSerializer(serializers.ModelSerializer):
 
         return data
 
+    def save(self, **kwargs):
+        instance = super().save(**kwargs)
+        # Stok dikurangi lewat UPDATE di crud/inventory.py, objek produk di sini masih nilai lama
+        instance.produk.refresh_from_db(fields=['stok', 'bobot_penjualan', 'tgl_update'])
+        return instance
+
 
 class ProdukTerjualListSerializer(serializers.ModelSerializer):
     """
     Serializer untuk list ProdukTerjual (lightweight)
     """
+    select_related_fields = (
+        'produk__umkm__profil_umkm',
+        'produk__kategori',
+        'lokasi_penjualan'
+    )
+
     produk_nama = serializers.CharField(source='produk.nm_produk', read_only=True)
     umkm_nama = serializers.SerializerMethodField()
     lokasi_nama = serializers.SerializerMethodField()
@@ -246,4 +264,167 @@ class ProdukTerjualListSerializer(serializers.ModelSerializer):
         return {
             'id': obj.lokasi_penjualan.id,
             'nm_lokasi': obj.lokasi_penjualan.nm_lokasi,
-        }
\ No newline at end of file
+        }
+
+# ---------------------------------------------------------------------------
+# Jalur render cepat untuk daftar penjualan.
+# Kolom diambil langsung dengan .values() (tanpa membuat instance model) lalu
+# dipetakan ke dict dengan struktur yang sama persis dengan serializer di atas.
+# ---------------------------------------------------------------------------
+
+_date_field = serializers.DateField()
+_datetime_field = serializers.DateTimeField()
+
+PRODUK_TERJUAL_LIST_VALUES = (
+    'id', 'produk_id', 'lokasi_penjualan_id',
+    'tgl_penjualan', 'jumlah_terjual', 'harga_jual', 'total_penjualan', 'tgl_pelaporan',
+    'produk__nm_produk', 'produk__satuan', 'produk__harga',
+    'produk__kategori_id', 'produk__kategori__nm_kategori',
+    'produk__umkm_id', 'produk__umkm__username',
+    'produk__umkm__first_name', 'produk__umkm__last_name',
+    'produk__umkm__profil_umkm__nm_bisnis',
+    'lokasi_penjualan__nm_lokasi',
+)
+
+PRODUK_TERJUAL_DETAIL_VALUES = PRODUK_TERJUAL_LIST_VALUES + (
+    'catatan', 'produk__stok', 'produk__kategori__desc', 'produk__umkm__email',
+    'lokasi_penjualan__alamat', 'lokasi_penjualan__kecamatan_id',
+)
+
+
+def produk_terjual_list_rows(queryset, detail=False):
+    """
+    Mengubah queryset ProdukTerjual menjadi queryset dict berisi kolom yang dibutuhkan saja
+    """
+    return queryset.values(*(PRODUK_TERJUAL_DETAIL_VALUES if detail else PRODUK_TERJUAL_LIST_VALUES))
+
+
+def render_produk_terjual_list(rows):
+    """
+    Render baris .values() dengan output identik ProdukTerjualListSerializer
+    """
+    to_date = _date_field.to_representation
+    to_datetime = _datetime_field.to_representation
+    result = []
+    append = result.append
+
+    for row in rows:
+        nama_lengkap = f"{row['produk__umkm__first_name']} {row['produk__umkm__last_name']}".strip()
+        nm_bisnis = row['produk__umkm__profil_umkm__nm_bisnis']
+
+        umkm_detail = {
+            'id': row['produk__umkm_id'],
+            'username': row['produk__umkm__username'],
+            'nama_lengkap': nama_lengkap
+        }
+        if nm_bisnis:
+            umkm_detail['nm_bisnis'] = nm_bisnis
+
+        lokasi_id = row['lokasi_penjualan_id']
+
+        append({
+            'id': str(row['id']),
+            'produk': row['produk_id'],
+            'produk_nama': row['produk__nm_produk'],
+            'produk_detail': {
+                'id': row['produk_id'],
+                'nm_produk': row['produk__nm_produk'],
+                'satuan': row['produk__satuan'],
+                'harga': row['produk__harga']
+            },
+            'umkm_nama': nm_bisnis or nama_lengkap or row['produk__umkm__username'],
+            'umkm_detail': umkm_detail,
+            'lokasi_penjualan': lokasi_id,
+            'lokasi_nama': row['lokasi_penjualan__nm_lokasi'] if lokasi_id else None,
+            'lokasi_penjualan_detail': {
+                'id': lokasi_id,
+                'nm_lokasi': row['lokasi_penjualan__nm_lokasi'],
+            } if lokasi_id else None,
+            'kategori_nama': row['produk__kategori__nm_kategori'],
+            'kategori_detail': {
+                'id': row['produk__kategori_id'],
+                'nm_kategori': row['produk__kategori__nm_kategori']
+            },
+            'tgl_penjualan': to_date(row['tgl_penjualan']),
+            'jumlah_terjual': row['jumlah_terjual'],
+            'satuan': row['produk__satuan'],
+            'harga_jual': row['harga_jual'],
+            'total_penjualan': row['total_penjualan'],
+            'tgl_pelaporan': to_datetime(row['tgl_pelaporan']),
+        })
+
+    return result
+
+
+def render_produk_terjual_detail_list(rows):
+    """
+    Render baris .values() dengan output identik ProdukTerjualSerializer
+    """
+    to_date = _date_field.to_representation
+    to_datetime = _datetime_field.to_representation
+    # Nama wilayah dari cache, bukan join tiga tabel wilayah
+    regions = get_region_cache()
+    result = []
+    append = result.append
+
+    for row in rows:
+        nama_lengkap = f"{row['produk__umkm__first_name']} {row['produk__umkm__last_name']}".strip()
+        nm_bisnis = row['produk__umkm__profil_umkm__nm_bisnis']
+
+        umkm_detail = {
+            'id': row['produk__umkm_id'],
+            'username': row['produk__umkm__username'],
+            'email': row['produk__umkm__email'],
+            'nama_lengkap': nama_lengkap
+        }
+        if nm_bisnis:
+            umkm_detail['nm_bisnis'] = nm_bisnis
+
+        lokasi_id = row['lokasi_penjualan_id']
+        lokasi_detail = None
+        if lokasi_id:
+            lokasi_detail = {
+                'id': lokasi_id,
+                'nm_lokasi': row['lokasi_penjualan__nm_lokasi'],
+                'alamat': row['lokasi_penjualan__alamat']
+            }
+            kec, kab, prov = regions.hierarchy(row['lokasi_penjualan__kecamatan_id'])
+            if kec:
+                lokasi_detail['kecamatan'] = kec.nm_kecamatan
+                lokasi_detail['kabupaten'] = nama_kabupaten(kab)
+                lokasi_detail['provinsi'] = prov.nm_provinsi
+
+        append({
+            'id': str(row['id']),
+            'produk': row['produk_id'],
+            'produk_nama': row['produk__nm_produk'],
+            'satuan': row['produk__satuan'],
+            'produk_detail': {
+                'id': row['produk_id'],
+                'nm_produk': row['produk__nm_produk'],
+                'kategori': row['produk__kategori__nm_kategori'],
+                'satuan': row['produk__satuan'],
+                'harga': row['produk__harga'],
+                'stok': row['produk__stok']
+            },
+            'kategori_nama': row['produk__kategori__nm_kategori'],
+            'kategori_detail': {
+                'id': row['produk__kategori_id'],
+                'nm_kategori': row['produk__kategori__nm_kategori'],
+                'desc': row['produk__kategori__desc']
+            },
+            'lokasi_penjualan': lokasi_id,
+            'lokasi_nama': row['lokasi_penjualan__nm_lokasi'] if lokasi_id else None,
+            'lokasi_penjualan_detail': lokasi_detail,
+            'umkm_detail': umkm_detail,
+            'umkm_nama': nama_lengkap or row['produk__umkm__username'],
+            'nm_bisnis': nm_bisnis or None,
+            'tgl_penjualan': to_date(row['tgl_penjualan']),
+            'jumlah_terjual': row['jumlah_terjual'],
+            'harga_jual': row['harga_jual'],
+            'total_penjualan': row['total_penjualan'],
+            'catatan': row['catatan'],
+            'tgl_pelaporan': to_datetime(row['tgl_pelaporan']),
+        })
+
+    return result
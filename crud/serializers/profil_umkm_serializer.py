@@ -11,6 +11,8 @@ class ProfilUMKMSerializer(serializers.ModelSerializer):
     """
     Serializer untuk model ProfilUMKM
     """
+    select_related_fields = ('user',)
+
     user_detail = serializers.SerializerMethodField()
     nama_pemilik = serializers.SerializerMethodField()
 
@@ -70,6 +72,8 @@ class ProfilUMKMListSerializer(serializers.ModelSerializer):
     """
     Serializer untuk list ProfilUMKM (lightweight)
     """
+    select_related_fields = ('user',)
+
     nama_pemilik = serializers.SerializerMethodField()
     email_pemilik = serializers.CharField(source='user.email', read_only=True)
     username = serializers.CharField(source='user.username', read_only=True)
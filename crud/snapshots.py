@@ -0,0 +1,54 @@
+# crud/snapshots.py
+"""
+Nilai lama baris (sebelum save) yang dibaca bersama oleh signal penghitung, stok dan peta.
+
+Setiap modul mendaftarkan kolom yang dibutuhkannya lewat track(model, fields). Satu receiver
+pre_save per model membaca gabungan kolom semua pendaftar dalam satu SELECT dan menyimpannya
+di instance._old_row; receiver pre_save modul lain cukup memanggil old_state(instance, fields).
+
+track() dipanggil di tingkat modul sebelum receiver pre_save pemanggil didefinisikan, sehingga
+receiver pembaca nilai lama terdaftar (dan dijalankan) lebih dulu.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models.signals import pre_save
+
+_TRACKED_FIELDS = defaultdict(set)
+
+
+def saved_attnames(model, update_fields):
+    return {model._meta.get_field(name).attname for name in update_fields}
+
+
+def track(model, fields):
+    """
+    Mendaftarkan kolom (attname) `model` yang nilai lamanya dibutuhkan saat save
+    """
+    _TRACKED_FIELDS[model].update(fields)
+    pre_save.connect(_load_old_row, sender=model, dispatch_uid=f'snapshots:{model._meta.label}')
+
+
+def _load_old_row(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._old_row = None
+    if raw or instance._state.adding:
+        return
+    fields = _TRACKED_FIELDS[sender]
+    if update_fields is not None and not fields & saved_attnames(sender, update_fields):
+        return
+    queryset = sender.objects.filter(pk=instance.pk)
+    if transaction.get_connection().in_atomic_block:
+        # Nilai lama dikunci sampai transaksi save selesai
+        queryset = queryset.select_for_update()
+    instance._old_row = queryset.values(*sorted(fields)).first()
+
+
+def old_state(instance, fields):
+    """
+    Nilai lama `fields` dari baris yang sedang disimpan (dict), atau None untuk baris baru,
+    baris yang sudah tidak ada dan save yang tidak menyentuh kolom yang dilacak
+    """
+    row = getattr(instance, '_old_row', None)
+    if row is None:
+        return None
+    return {field: row[field] for field in fields}
@@ -0,0 +1,215 @@
+# crud/spatial.py
+"""
+Indeks grid sederhana untuk pencarian lokasi terdekat tanpa PostGIS.
+
+Bumi dibagi menjadi sel GRID_SIZE x GRID_SIZE derajat. Nomor sel disimpan di kolom
+grid_cell (ter-index) sebagai baris * GRID_COLS + kolom, sehingga satu baris grid
+adalah satu rentang nilai yang berurutan dan kotak sel bisa dicari dengan beberapa
+query range. Kotak yang sudah besar dicari sebagai satu rentang baris utuh ditambah
+filter kolom (grid_cell mod GRID_COLS), agar jumlah kondisi OR tidak ikut membesar. Jarak sebenarnya dihitung dengan haversine (NumPy) pada kandidat saja.
+Batas bujur +-180 tidak dilintasi (tidak relevan untuk wilayah Indonesia).
+"""
+import math
+
+import numpy as np
+from django.db.models import Q, Value
+from django.db.models.functions import Mod
+
+# +- 5,5 km per sel di khatulistiwa
+GRID_SIZE = 0.05
+GRID_ROWS = int(round(180 / GRID_SIZE))
+GRID_COLS = int(round(360 / GRID_SIZE))
+EARTH_RADIUS_KM = 6371.0088
+CELL_HEIGHT_KM = EARTH_RADIUS_KM * math.radians(GRID_SIZE)
+# Kotak yang lebih tinggi dari ini cukup difilter dengan rentang latitude/longitude
+MAX_BBOX_ROWS = 100
+# Cincin pencarian yang lebih lebar dari ini dicari sebagai satu pita baris, bukan rentang per baris
+MAX_RING_CELLS = 8
+
+
+def _cell_index(latitude, longitude):
+    row = int((latitude + 90) // GRID_SIZE)
+    col = int((longitude + 180) // GRID_SIZE)
+    return min(max(row, 0), GRID_ROWS - 1), min(max(col, 0), GRID_COLS - 1)
+
+
+def grid_cell(latitude, longitude):
+    """
+    Nomor sel grid untuk koordinat, None jika koordinat belum diisi
+    """
+    if latitude is None or longitude is None:
+        return None
+    row, col = _cell_index(latitude, longitude)
+    return row * GRID_COLS + col
+
+
+def _row_ranges(rows, col_start, col_end):
+    """
+    Rentang grid_cell (awal, akhir) untuk kolom col_start..col_end di setiap baris
+    """
+    col_start, col_end = max(col_start, 0), min(col_end, GRID_COLS - 1)
+    if col_start > col_end:
+        return []
+    return [
+        (row * GRID_COLS + col_start, row * GRID_COLS + col_end)
+        for row in rows if 0 <= row < GRID_ROWS
+    ]
+
+
+def _ranges_q(ranges):
+    q = Q()
+    for start, end in ranges:
+        q |= Q(grid_cell__range=(start, end))
+    return q
+
+
+def _box_q(row, col, cells):
+    """
+    Kotak selebar `cells` sel di sekitar (row, col): satu rentang grid_cell yang
+    mencakup baris-baris utuhnya, dibatasi kolom lewat anotasi grid_col
+    """
+    row_start, row_end = max(row - cells, 0), min(row + cells, GRID_ROWS - 1)
+    return Q(
+        grid_cell__range=(row_start * GRID_COLS, row_end * GRID_COLS + GRID_COLS - 1),
+        grid_col__range=(max(col - cells, 0), min(col + cells, GRID_COLS - 1)),
+    )
+
+
+def _ring_q(row, col, inner, outer):
+    """
+    Filter sel cincin antara kotak `inner` dan `outer` (lihat _ring_ranges), None jika kosong
+    """
+    if outer > MAX_RING_CELLS:
+        q = _box_q(row, col, outer)
+        return q & ~_box_q(row, col, inner) if inner >= 0 else q
+    ranges = _ring_ranges(row, col, inner, outer)
+    return _ranges_q(ranges) if ranges else None
+
+
+def _ring_ranges(row, col, inner, outer):
+    """
+    Rentang sel pada kotak selebar `outer` sel di sekitar (row, col) yang berada
+    di luar kotak selebar `inner` sel (inner=-1 berarti tanpa lubang)
+    """
+    if inner < 0:
+        return _row_ranges(range(row - outer, row + outer + 1), col - outer, col + outer)
+
+    ranges = _row_ranges(range(row - outer, row - inner), col - outer, col + outer)
+    ranges += _row_ranges(range(row + inner + 1, row + outer + 1), col - outer, col + outer)
+    inner_rows = range(row - inner, row + inner + 1)
+    ranges += _row_ranges(inner_rows, col - outer, col - inner - 1)
+    ranges += _row_ranges(inner_rows, col + inner + 1, col + outer)
+    return ranges
+
+
+def _covered_km(latitude, cells):
+    """
+    Jarak minimum dari titik ke tepi kotak selebar `cells` sel di sekitarnya.
+    Semua lokasi dalam jarak ini pasti sudah ikut terbaca.
+    """
+    edge_latitude = min(abs(latitude) + (cells + 1) * GRID_SIZE, 90)
+    cell_width_km = CELL_HEIGHT_KM * math.cos(math.radians(edge_latitude))
+    return cells * min(CELL_HEIGHT_KM, cell_width_km)
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """
+    Jarak (km) dari satu titik ke array titik, dihitung sekaligus dengan NumPy
+    """
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=float))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(longitudes, dtype=float) - longitude)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def _candidates(queryset, q):
+    queryset = queryset.annotate(grid_col=Mod('grid_cell', Value(GRID_COLS)))
+    rows = list(queryset.filter(q).values_list('pk', 'latitude', 'longitude'))
+    if not rows:
+        return [], np.empty(0), np.empty(0)
+    pks, latitudes, longitudes = zip(*rows)
+    return list(pks), np.array(latitudes, dtype=float), np.array(longitudes, dtype=float)
+
+
+def nearest(queryset, latitude, longitude, k, radius_km):
+    """
+    k lokasi terdekat dalam radius_km sebagai list (pk, jarak_km), terurut dari yang terdekat.
+
+    Kotak pencarian diperbesar dua kali lipat sampai k lokasi ditemukan dan lokasi
+    ke-k berada di dalam jarak yang sudah pasti tercakup kotak, atau kotak sudah
+    mencakup seluruh radius. Setiap langkah hanya membaca sel baru di tepi kotak,
+    dengan jumlah kondisi query yang tetap kecil (lihat _ring_q).
+    """
+    row, col = _cell_index(latitude, longitude)
+    pks, distances = [], np.empty(0)
+    inner, outer = -1, 1
+
+    while True:
+        q = _ring_q(row, col, inner, outer)
+        ring_pks, ring_latitudes, ring_longitudes = (
+            _candidates(queryset, q) if q is not None else ([], None, None)
+        )
+        if ring_pks:
+            pks += ring_pks
+            distances = np.concatenate([
+                distances, haversine_km(latitude, longitude, ring_latitudes, ring_longitudes)
+            ])
+
+        covered = _covered_km(latitude, outer)
+        within = np.count_nonzero(distances <= radius_km)
+        if within >= k and np.partition(distances, k - 1)[k - 1] <= covered:
+            break
+        if covered >= radius_km or outer >= max(GRID_ROWS, GRID_COLS):
+            break
+        inner, outer = outer, outer * 2
+
+    order = np.argsort(distances, kind='stable')
+    return [
+        (pks[i], float(distances[i])) for i in order[:k] if distances[i] <= radius_km
+    ]
+
+
+def in_bbox(queryset, min_lat, min_lng, max_lat, max_lng, center, limit):
+    """
+    Lokasi di dalam kotak koordinat sebagai list (pk, jarak_km dari center),
+    terurut dari yang terdekat ke center, paling banyak `limit`
+    """
+    min_row, min_col = _cell_index(min_lat, min_lng)
+    max_row, max_col = _cell_index(max_lat, max_lng)
+    q = Q(latitude__range=(min_lat, max_lat), longitude__range=(min_lng, max_lng))
+    if max_row - min_row < MAX_BBOX_ROWS:
+        q &= _ranges_q(_row_ranges(range(min_row, max_row + 1), min_col, max_col))
+
+    pks, latitudes, longitudes = _candidates(queryset, q)
+    if not pks:
+        return []
+    distances = haversine_km(center[0], center[1], latitudes, longitudes)
+    order = np.argsort(distances, kind='stable')[:limit]
+    return [(pks[i], float(distances[i])) for i in order]
+
+
+def grid_update_fields(update_fields):
+    """
+    update_fields untuk save() model ber-grid_cell: grid_cell ikut disimpan jika koordinat disimpan.
+    queryset.update() koordinat tidak melewati save(); isi grid_cell di update yang sama
+    atau jalankan rebuild_grid_cells.
+    """
+    if update_fields is None or not {'latitude', 'longitude'} & set(update_fields):
+        return update_fields
+    return {*update_fields, 'grid_cell'}
+
+
+def rebuild_grid_cells(model, batch_size=1000):
+    """
+    Mengisi ulang grid_cell semua baris model (untuk data lama / setelah GRID_SIZE diubah)
+    """
+    changed = []
+    for obj in model.objects.only('pk', 'latitude', 'longitude', 'grid_cell').iterator(chunk_size=batch_size):
+        cell = grid_cell(obj.latitude, obj.longitude)
+        if cell != obj.grid_cell:
+            obj.grid_cell = cell
+            changed.append(obj)
+    model.objects.bulk_update(changed, ['grid_cell'], batch_size=batch_size)
+    return len(changed)
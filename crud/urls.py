@@ -3,7 +3,7 @@ from rest_framework.documentation import include_docs_urls
 from rest_framework.routers import DefaultRouter
 
 from crud.views import UserViewSet, LokasiPenjualanViewSet, ProdukTerjualViewSet, ProfilUMKMViewSet, \
-    KategoriLokasiPenjualanViewSet, AdminViewSet
+    KategoriLokasiPenjualanViewSet, AdminViewSet, PetaViewSet
 from crud.views.file_penjualan_view import FilePenjualanViewSet
 
 from crud.views.provinsi_view import ProvinsiViewSet
@@ -30,6 +30,7 @@ router.register(r'file-penjualan', FilePenjualanViewSet)
 router.register(r'kategori-lokasi-penjualan', KategoriLokasiPenjualanViewSet)
 
 router.register(r'administrator', AdminViewSet, basename='admin')
+router.register(r'peta', PetaViewSet, basename='peta')
 
 
 urlpatterns = [
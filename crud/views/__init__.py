@@ -10,6 +10,7 @@ from .lokasi_penjualan_view import LokasiPenjualanViewSet
 from .produk_terjual_view import ProdukTerjualViewSet
 from .kategori_lokasi_penjualan_view import KategoriLokasiPenjualanViewSet
 from .admin_view import AdminViewSet
+from .peta_view import PetaViewSet
 
 __all__ = [
     'ProvinsiViewSet',
@@ -24,4 +25,5 @@ __all__ = [
     'ProdukTerjualViewSet',
     'KategoriLokasiPenjualanViewSet',
     'AdminViewSet',
+    'PetaViewSet',
 ]
\ No newline at end of file
@@ -12,11 +12,12 @@ from django.contrib.auth import get_user_model
 from ..models import FilePenjualan
 from ..serializers.file_penjualan_serializer import FilePenjualanSerializer, FilePenjualanListSerializer
 from ..pagination import LaravelStylePagination
+from .mixins import ConditionalGetMixin, SerializerRelationsMixin
 
 User = get_user_model()
 
 
-class FilePenjualanViewSet(viewsets.ModelViewSet):
+class FilePenjualanViewSet(ConditionalGetMixin, SerializerRelationsMixin, viewsets.ModelViewSet):
     """
     API endpoint untuk mengelola file Excel detail penjualan UMKM.
     """
@@ -29,6 +30,7 @@ class FilePenjualanViewSet(viewsets.ModelViewSet):
     search_fields = ['nama_file', 'deskripsi', 'umkm__username']
     ordering_fields = ['nama_file', 'tgl_upload', 'tgl_update']
     ordering = ['-tgl_upload']
+    conditional_actions = ('list', 'retrieve', 'my_files')
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -57,6 +59,11 @@ class FilePenjualanViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def get_conditional_queryset(self):
+        if self.action == 'my_files':
+            return self.filter_queryset(FilePenjualan.objects.filter(umkm=self.request.user))
+        return super().get_conditional_queryset()
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -5,8 +5,9 @@ from django_filters.rest_framework import DjangoFilterBackend
 from ..models import Kabupaten
 from ..serializers.kabupaten_serializer import KabupatenSerializer, KabupatenListSerializer
 from ..pagination import LaravelStylePagination
+from .mixins import SerializerRelationsMixin
 
-class KabupatenViewSet(viewsets.ModelViewSet):
+class KabupatenViewSet(SerializerRelationsMixin, viewsets.ModelViewSet):
     """
     API endpoint yang memungkinkan Kabupaten untuk dilihat atau diedit.
     """
@@ -6,8 +6,9 @@ from django_filters.rest_framework import DjangoFilterBackend
 from ..models import KategoriProduk
 from ..serializers.kategori_produk_serializer import KategoriProdukSerializer, KategoriProdukListSerializer
 from ..pagination import LaravelStylePagination
+from .mixins import SerializerRelationsMixin
 
-class KategoriProdukViewSet(viewsets.ModelViewSet):
+class KategoriProdukViewSet(SerializerRelationsMixin, viewsets.ModelViewSet):
     """
     API endpoint yang memungkinkan Kategori Produk untuk dilihat atau diedit.
     """
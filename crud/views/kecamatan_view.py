@@ -5,8 +5,9 @@ from django_filters.rest_framework import DjangoFilterBackend
 from ..models import Kecamatan
 from ..serializers.kecamatan_serializer import KecamatanSerializer, KecamatanListSerializer
 from ..pagination import LaravelStylePagination
+from .mixins import SerializerRelationsMixin
 
-class KecamatanViewSet(viewsets.ModelViewSet):
+class KecamatanViewSet(SerializerRelationsMixin, viewsets.ModelViewSet):
     """
     API endpoint yang memungkinkan Kecamatan untuk dilihat atau diedit.
     """
@@ -4,16 +4,19 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import action
 
+from ..counters import JUMLAH_PENJUALAN_VERSION
 from ..models import LokasiPenjualan
 from ..serializers.lokasi_penjualan_serializer import LokasiPenjualanSerializer, LokasiPenjualanListSerializer
 from ..pagination import LaravelStylePagination
+from .mixins import ConditionalGetMixin, NearbyLocationsMixin, SerializerRelationsMixin
 
 # views/lokasi_penjualan_view.py
-class LokasiPenjualanViewSet(viewsets.ModelViewSet):
+class LokasiPenjualanViewSet(ConditionalGetMixin, NearbyLocationsMixin, SerializerRelationsMixin,
+                             viewsets.ModelViewSet):
     """
     API endpoint yang memungkinkan Lokasi Penjualan untuk dilihat atau diedit.
     """
-    queryset = LokasiPenjualan.objects.select_related('kecamatan__kabupaten__provinsi', 'kategori_lokasi', 'umkm')
+    queryset = LokasiPenjualan.objects.all()
     pagination_class = LaravelStylePagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['kategori_lokasi', 'kecamatan', 'kecamatan__kabupaten', 'kecamatan__kabupaten__provinsi',
@@ -21,6 +24,10 @@ class LokasiPenjualanViewSet(viewsets.ModelViewSet):
     search_fields = ['nm_lokasi', 'alamat', 'tlp_pengelola']
     ordering_fields = ['nm_lokasi', 'kategori_lokasi', 'tgl_dibuat']
     ordering = ['nm_lokasi']
+    # total_penjualan dibaca dari penghitung jumlah_penjualan, yang tidak mengubah tgl_update
+    conditional_versions = (JUMLAH_PENJUALAN_VERSION,)
+    conditional_actions = ('list', 'retrieve', 'my_locations')
+    nearby_serializer_class = LokasiPenjualanListSerializer
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -31,7 +38,7 @@ class LokasiPenjualanViewSet(viewsets.ModelViewSet):
         """
         Instantiates and returns the list of permissions that this view requires.
         """
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'nearby', 'bbox']:
             permission_classes = [IsAuthenticated]
         elif self.action in ['my_locations', 'create_my_location', 'update_my_location', 'destroy_my_location']:
             permission_classes = [IsAuthenticated]
@@ -51,6 +58,14 @@ class LokasiPenjualanViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def get_nearby_queryset(self):
+        return LokasiPenjualan.objects.filter(aktif=True)
+
+    def get_conditional_queryset(self):
+        if self.action == 'my_locations':
+            return self.filter_queryset(LokasiPenjualan.objects.filter(umkm=self.request.user))
+        return super().get_conditional_queryset()
+
     def perform_create(self, serializer):
         """
         Set UMKM otomatis saat membuat lokasi penjualan
@@ -69,10 +84,7 @@ class LokasiPenjualanViewSet(viewsets.ModelViewSet):
                 'message': 'Hanya pengguna dengan role UMKM yang dapat melihat lokasi mereka'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        queryset = LokasiPenjualan.objects.filter(umkm=request.user).select_related(
-            'kecamatan__kabupaten__provinsi', 'kategori_lokasi'
-        )
-
+        queryset = LokasiPenjualan.objects.filter(umkm=request.user)
         queryset = self.filter_queryset(queryset)
         page = self.paginate_queryset(queryset)
 
@@ -8,9 +8,10 @@ from ..models import LokasiUMKM
 from ..serializers.lokasi_umkm_serializer import LokasiUMKMSerializer, LokasiUMKMListSerializer
 from ..filters import LokasiUMKMFilter
 from ..pagination import LaravelStylePagination
+from .mixins import ConditionalGetMixin, NearbyLocationsMixin, SerializerRelationsMixin
 
 
-class LokasiUMKMViewSet(viewsets.ModelViewSet):
+class LokasiUMKMViewSet(ConditionalGetMixin, NearbyLocationsMixin, SerializerRelationsMixin, viewsets.ModelViewSet):
     """
     API endpoint yang memungkinkan Lokasi UMKM untuk dilihat atau diedit.
     """
@@ -21,6 +22,8 @@ class LokasiUMKMViewSet(viewsets.ModelViewSet):
     search_fields = ['alamat_lengkap', 'kode_pos', 'pengguna__username', 'pengguna__profil_umkm__nm_bisnis']
     ordering_fields = ['tgl_update', 'pengguna__username', 'kecamatan__nm_kecamatan']
     ordering = ['-tgl_update']
+    conditional_actions = ('list', 'retrieve', 'my_locations')
+    nearby_serializer_class = LokasiUMKMListSerializer
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -33,12 +36,21 @@ class LokasiUMKMViewSet(viewsets.ModelViewSet):
         """
         if self.action in ['my_locations', 'create_my_location', 'update_my_location']:
             permission_classes = [IsAuthenticated]
-        elif self.action == 'list' or self.action == 'retrieve':
+        elif self.action in ['list', 'retrieve', 'nearby', 'bbox']:
             permission_classes = [IsAuthenticated]
         else:
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
+    def get_nearby_queryset(self):
+        # LokasiUMKM tidak punya status aktif sendiri, mengikuti akun UMKM-nya
+        return LokasiUMKM.objects.filter(pengguna__is_active=True)
+
+    def get_conditional_queryset(self):
+        if self.action == 'my_locations':
+            return LokasiUMKM.objects.filter(pengguna=self.request.user)
+        return super().get_conditional_queryset()
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -129,7 +141,9 @@ class LokasiUMKMViewSet(viewsets.ModelViewSet):
                 'message': 'Hanya pengguna dengan role UMKM yang dapat melihat lokasi UMKM mereka'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        locations = LokasiUMKM.objects.filter(pengguna=request.user)
+        locations = self.apply_serializer_relations(
+            LokasiUMKM.objects.filter(pengguna=request.user), LokasiUMKMSerializer
+        )
         serializer = LokasiUMKMSerializer(locations, many=True)
 
         return Response({
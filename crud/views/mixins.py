@@ -0,0 +1,271 @@
+# views/mixins.py
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from .. import spatial
+from ..cache_versions import cache_versions
+from ..pagination.counting import prepare_count_queryset
+
+
+class SerializerRelationsMixin:
+    """
+    Menerapkan relasi yang dideklarasikan serializer ke queryset viewset.
+
+    Serializer cukup mendeklarasikan relasi yang dibacanya:
+        select_related_fields = ('umkm__profil_umkm', 'kategori')
+        prefetch_related_fields = (...)
+    dan viewset otomatis memakai select_related/prefetch_related tersebut di semua
+    queryset yang melewati filter_queryset (list, retrieve, dan action custom).
+    Serializer juga boleh menyediakan classmethod annotate_queryset(queryset) untuk
+    nilai agregat yang dibacanya, agar tidak dihitung per baris.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return self.apply_serializer_relations(queryset)
+
+    def apply_serializer_relations(self, queryset, serializer_class=None):
+        """
+        Menambahkan select_related/prefetch_related milik serializer_class
+        (default: serializer action saat ini) ke queryset
+        """
+        serializer_class = serializer_class or self.get_serializer_class()
+
+        # Relasi hanya berlaku jika serializer memang untuk model queryset ini
+        meta = getattr(serializer_class, 'Meta', None)
+        if getattr(meta, 'model', None) is not queryset.model:
+            return queryset
+
+        select_related = getattr(serializer_class, 'select_related_fields', ())
+        prefetch_related = getattr(serializer_class, 'prefetch_related_fields', ())
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+
+        annotate_queryset = getattr(serializer_class, 'annotate_queryset', None)
+        if annotate_queryset:
+            queryset = annotate_queryset(queryset)
+        return queryset
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+    default_detail = 'Not Modified'
+    default_code = 'not_modified'
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET (ETag/Last-Modified) untuk action baca pada viewset.
+
+    Sebelum action dijalankan, validator dihitung dengan satu query agregat
+    (jumlah baris + Max(conditional_fields)) atas queryset action tersebut, digabung
+    dengan user, parameter query, kwargs URL dan versi cache di conditional_versions
+    (untuk kolom yang berubah tanpa tgl_update, mis. penghitung di crud/counters.py). Jika If-None-Match klien sama,
+    respons 304 dikirim tanpa menjalankan query data maupun serializer.
+
+        conditional_fields = ('tgl_update', 'produk__tgl_update')
+        conditional_actions = ('list', 'retrieve', 'my_sales')
+
+    Action selain list/retrieve yang memakai queryset berbeda (mis. my_*) cukup
+    meng-override get_conditional_queryset().
+    """
+    conditional_fields = ('tgl_update',)
+    conditional_actions = ('list', 'retrieve')
+    conditional_versions = ()
+
+    def get_conditional_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset
+
+    def get_conditional_validators(self):
+        """
+        (etag, last_modified) untuk request saat ini
+        """
+        queryset = prepare_count_queryset(self.get_conditional_queryset())
+        aggregates = {f'terakhir_{idx}': Max(field) for idx, field in enumerate(self.conditional_fields)}
+        # COUNT(*) ikut menghitung baris relasi balik yang di-join (mis. penjualan__tgl_update),
+        # sehingga baris relasi yang dihapus tetap mengubah validator
+        stats = queryset.aggregate(jumlah=Count('*'), **aggregates)
+
+        terakhir = [value for name, value in stats.items() if name != 'jumlah' and value is not None]
+        last_modified = max(terakhir) if terakhir else None
+
+        key_string = ':'.join([
+            queryset.model._meta.label,
+            str(self.action),
+            str(self.request.user.pk),
+            str(sorted(self.request.query_params.lists())),
+            str(sorted(self.kwargs.items())),
+            str(sorted((name, str(value)) for name, value in stats.items())),
+            str(sorted(cache_versions(self.conditional_versions).items())) if self.conditional_versions else '',
+        ])
+        # Weak ETag: validator hanya mencerminkan tabel di conditional_fields, bukan byte respons
+        etag = 'W/"%s"' % hashlib.md5(key_string.encode()).hexdigest()
+        return etag, last_modified
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.conditional_etag = self.conditional_last_modified = None
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return
+
+        self.conditional_etag, self.conditional_last_modified = self.get_conditional_validators()
+        # Hanya If-None-Match yang dievaluasi: Last-Modified tidak berubah saat baris dihapus
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            etags = [etag.removeprefix('W/') for etag in parse_etags(if_none_match)]
+            if self.conditional_etag.removeprefix('W/') in etags or '*' in etags:
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, 'conditional_etag', None)
+        if etag and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            if self.conditional_last_modified:
+                response['Last-Modified'] = http_date(self.conditional_last_modified.timestamp())
+            # Data per user: boleh disimpan klien tapi selalu direvalidasi
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+
+
+class NearbyLocationsMixin:
+    """
+    Action `nearby` dan `bbox` untuk viewset model berkoordinat (latitude, longitude, grid_cell).
+
+        GET .../nearby/?lat=-2.53&lng=140.71&k=10&radius=25
+        GET .../bbox/?min_lat=..&min_lng=..&max_lat=..&max_lng=..&limit=100
+
+    Kandidat dibaca per sel grid (lihat crud.spatial), hasil diserialisasi dengan
+    nearby_serializer_class dan diberi jarak_km. Viewset meng-override
+    get_nearby_queryset() untuk membatasi ke lokasi yang aktif.
+    """
+    nearby_serializer_class = None
+    nearby_default_k = 10
+    nearby_max_k = 100
+    nearby_default_radius_km = 25
+    nearby_max_radius_km = 500
+    bbox_default_limit = 100
+    bbox_max_limit = 500
+
+    def get_nearby_queryset(self):
+        return self.get_queryset()
+
+    def _coordinate_params(self, names, errors, minimum, maximum, default=None):
+        values = []
+        for name in names:
+            raw = self.request.query_params.get(name, default)
+            try:
+                value = float(raw)
+            except (TypeError, ValueError):
+                errors[name] = ['Parameter ini wajib diisi dengan angka.']
+                values.append(None)
+                continue
+            if not minimum <= value <= maximum:
+                errors[name] = [f'Nilai harus berada antara {minimum} dan {maximum}.']
+            values.append(value)
+        return values
+
+    def _limit_param(self, name, default, maximum, errors):
+        raw = self.request.query_params.get(name, default)
+        try:
+            value = int(raw)
+        except (TypeError, ValueError):
+            errors[name] = ['Parameter ini harus berupa bilangan bulat.']
+            return default
+        if not 1 <= value <= maximum:
+            errors[name] = [f'Nilai harus berada antara 1 dan {maximum}.']
+        return value
+
+    def _invalid_params_response(self, errors):
+        return Response({
+            'status': 'error',
+            'message': 'Parameter pencarian lokasi tidak valid',
+            'errors': errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    def _located_response(self, results, message):
+        """
+        Serialisasi hasil (pk, jarak_km) dengan urutan yang sama dan jarak_km di tiap item
+        """
+        serializer_class = self.nearby_serializer_class or self.get_serializer_class()
+        queryset = self.get_nearby_queryset().filter(pk__in=[pk for pk, jarak in results])
+        objects = {
+            obj.pk: obj
+            for obj in self.apply_serializer_relations(queryset, serializer_class)
+        }
+
+        data = []
+        for pk, jarak in results:
+            if pk not in objects:
+                continue
+            item = serializer_class(objects[pk], context=self.get_serializer_context()).data
+            item['jarak_km'] = round(jarak, 3)
+            data.append(item)
+
+        return Response({
+            'status': 'success',
+            'message': message,
+            'data': data
+        })
+
+    @action(detail=False, methods=['get'])
+    def nearby(self, request):
+        """
+        k lokasi aktif terdekat dari titik lat/lng dalam radius (km)
+        """
+        errors = {}
+        latitude, = self._coordinate_params(['lat'], errors, -90, 90)
+        longitude, = self._coordinate_params(['lng'], errors, -180, 180)
+        radius, = self._coordinate_params(
+            ['radius'], errors, 0, self.nearby_max_radius_km, default=self.nearby_default_radius_km)
+        k = self._limit_param('k', self.nearby_default_k, self.nearby_max_k, errors)
+        if errors:
+            return self._invalid_params_response(errors)
+
+        results = spatial.nearest(self.get_nearby_queryset(), latitude, longitude, k, radius)
+        return self._located_response(results, 'Berhasil mendapatkan lokasi terdekat')
+
+    @action(detail=False, methods=['get'])
+    def bbox(self, request):
+        """
+        Lokasi aktif di dalam kotak koordinat, terurut dari yang terdekat ke titik tengahnya
+        (atau ke lat/lng jika diberikan)
+        """
+        errors = {}
+        min_lat, max_lat = self._coordinate_params(['min_lat', 'max_lat'], errors, -90, 90)
+        min_lng, max_lng = self._coordinate_params(['min_lng', 'max_lng'], errors, -180, 180)
+        limit = self._limit_param('limit', self.bbox_default_limit, self.bbox_max_limit, errors)
+        if not errors and (min_lat > max_lat or min_lng > max_lng):
+            errors['bbox'] = ['min_lat/min_lng harus lebih kecil dari max_lat/max_lng.']
+
+        center = ((min_lat or 0) + (max_lat or 0)) / 2, ((min_lng or 0) + (max_lng or 0)) / 2
+        if 'lat' in request.query_params or 'lng' in request.query_params:
+            center = (
+                self._coordinate_params(['lat'], errors, -90, 90)[0],
+                self._coordinate_params(['lng'], errors, -180, 180)[0],
+            )
+        if errors:
+            return self._invalid_params_response(errors)
+
+        results = spatial.in_bbox(
+            self.get_nearby_queryset(), min_lat, min_lng, max_lat, max_lng, center, limit)
+        return self._located_response(results, 'Berhasil mendapatkan lokasi dalam area')
@@ -0,0 +1,90 @@
+# crud/views/peta_view.py
+
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from authentication.permissions import IsAdmin
+from .. import peta
+
+# Batas jumlah tile per request, mencegah bbox besar pada zoom tinggi
+MAX_TILES = 64
+
+
+class PetaViewSet(viewsets.ViewSet):
+    """
+    Data peta admin yang sudah di-cluster di server.
+
+    - GET /peta/clusters/?layer=umkm|penjualan&zoom=..&min_lat=..&min_lng=..&max_lat=..&max_lng=..
+    """
+    permission_classes = [IsAdmin]
+
+    def _error(self, errors):
+        return Response({
+            'status': 'error',
+            'message': 'Parameter peta tidak valid',
+            'errors': errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['get'])
+    def clusters(self, request):
+        """
+        Cluster titik UMKM atau lokasi penjualan (jumlah titik dan total penjualan)
+        untuk semua tile yang menutupi bbox pada zoom tertentu
+        """
+        params = request.query_params
+        errors = {}
+
+        layer = params.get('layer', peta.LAYER_UMKM)
+        if layer not in peta.LAYERS:
+            errors['layer'] = [f"Pilihan yang tersedia: {', '.join(peta.LAYERS)}."]
+
+        try:
+            zoom = int(params.get('zoom', ''))
+            if not 0 <= zoom <= peta.MAX_ZOOM:
+                errors['zoom'] = [f'Nilai harus berada antara 0 dan {peta.MAX_ZOOM}.']
+        except ValueError:
+            errors['zoom'] = ['Parameter ini wajib diisi dengan bilangan bulat.']
+
+        bbox = {}
+        for name, limit in (('min_lat', 90), ('max_lat', 90), ('min_lng', 180), ('max_lng', 180)):
+            try:
+                bbox[name] = float(params.get(name, ''))
+                if not -limit <= bbox[name] <= limit:
+                    errors[name] = [f'Nilai harus berada antara {-limit} dan {limit}.']
+            except ValueError:
+                errors[name] = ['Parameter ini wajib diisi dengan angka.']
+
+        if not errors and (bbox['min_lat'] > bbox['max_lat'] or bbox['min_lng'] > bbox['max_lng']):
+            errors['bbox'] = ['min_lat/min_lng harus lebih kecil dari max_lat/max_lng.']
+        if errors:
+            return self._error(errors)
+
+        tiles = peta.tiles_for_bbox(bbox['min_lat'], bbox['min_lng'], bbox['max_lat'], bbox['max_lng'], zoom)
+        if len(tiles) > MAX_TILES:
+            return self._error({
+                'bbox': [f'Area terlalu luas untuk zoom {zoom} ({len(tiles)} tile, maksimal {MAX_TILES}).']
+            })
+
+        tile_clusters = peta.tile_clusters(layer, zoom, tiles)
+        tile_data = []
+        for x, y in tiles:
+            clusters = tile_clusters[(x, y)]
+            if clusters:
+                tile_data.append({
+                    'quadkey': peta.quadkey(zoom, x, y),
+                    'x': x,
+                    'y': y,
+                    'clusters': clusters,
+                })
+
+        return Response({
+            'status': 'success',
+            'message': 'Berhasil mendapatkan cluster peta',
+            'data': {
+                'layer': layer,
+                'zoom': zoom,
+                'jumlah_titik': sum(c['jumlah'] for tile in tile_data for c in tile['clusters']),
+                'tiles': tile_data,
+            }
+        })
@@ -7,26 +7,28 @@ from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 
 from ..models import ProdukTerjual, Produk, LokasiPenjualan
-from ..serializers.produk_terjual_serializer import ProdukTerjualSerializer, ProdukTerjualListSerializer
+from ..serializers.produk_terjual_serializer import (
+    ProdukTerjualSerializer, ProdukTerjualListSerializer,
+    produk_terjual_list_rows, render_produk_terjual_list, render_produk_terjual_detail_list
+)
 from ..filters import ProdukTerjualFilter
 from ..pagination import LaravelStylePagination
+from .mixins import ConditionalGetMixin, SerializerRelationsMixin
 
 
-class ProdukTerjualViewSet(viewsets.ModelViewSet):
+class ProdukTerjualViewSet(ConditionalGetMixin, SerializerRelationsMixin, viewsets.ModelViewSet):
     """
     API endpoint yang memungkinkan data Produk Terjual untuk dilihat atau diedit.
     """
-    queryset = ProdukTerjual.objects.select_related(
-        'produk__umkm__profil_umkm',
-        'produk__kategori',
-        'lokasi_penjualan__kecamatan__kabupaten__provinsi'
-    )
+    queryset = ProdukTerjual.objects.all()
     pagination_class = LaravelStylePagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = ProdukTerjualFilter
     search_fields = ['produk__nm_produk', 'lokasi_penjualan__nm_lokasi', 'catatan']
     ordering_fields = ['tgl_penjualan', 'jumlah_terjual', 'harga_jual', 'total_penjualan', 'tgl_pelaporan']
     ordering = ['-tgl_penjualan']
+    conditional_fields = ('tgl_update', 'produk__tgl_update', 'lokasi_penjualan__tgl_update')
+    conditional_actions = ('list', 'retrieve', 'my_sales')
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -42,6 +44,11 @@ class ProdukTerjualViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
+    def get_conditional_queryset(self):
+        if self.action == 'my_sales':
+            return self.filter_queryset(ProdukTerjual.objects.filter(produk__umkm=self.request.user))
+        return super().get_conditional_queryset()
+
     def get_queryset(self):
         """
         Customize queryset berdasarkan user role
@@ -54,6 +61,19 @@ class ProdukTerjualViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        """
+        Daftar penjualan dirender dari kolom .values() tanpa membuat instance model.
+        Output sama dengan ProdukTerjualListSerializer.
+        """
+        rows = produk_terjual_list_rows(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(render_produk_terjual_list(page))
+
+        return Response(render_produk_terjual_list(rows))
+
     # Methods yang sudah ada tetap sama, tapi dengan perbaikan kecil...
 
     @action(detail=False, methods=['get'])
@@ -68,30 +88,23 @@ class ProdukTerjualViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         # Optimized query
-        penjualan = ProdukTerjual.objects.filter(
-            produk__umkm=request.user
-        ).select_related(
-            'produk__kategori',
-            'lokasi_penjualan__kecamatan__kabupaten__provinsi'
-        )
-
-        penjualan = self.filter_queryset(penjualan)
+        penjualan = ProdukTerjual.objects.filter(produk__umkm=request.user)
+
+        penjualan = produk_terjual_list_rows(self.filter_queryset(penjualan), detail=True)
         page = self.paginate_queryset(penjualan)
 
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            result = self.get_paginated_response(serializer.data)
+            result = self.get_paginated_response(render_produk_terjual_detail_list(page))
             return Response({
                 'status': 'success',
                 'message': 'Berhasil mendapatkan daftar penjualan',
                 'data': result.data
             })
 
-        serializer = self.get_serializer(penjualan, many=True)
         return Response({
             'status': 'success',
             'message': 'Berhasil mendapatkan daftar penjualan',
-            'data': serializer.data
+            'data': render_produk_terjual_detail_list(penjualan)
         })
 
     @action(detail=False, methods=['post'])
@@ -1,17 +1,21 @@
+import uuid
+
 from rest_framework import viewsets, filters, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 
+from ..inventory import stok_alerts
 from ..models import Produk
 from ..serializers.produk_serializer import ProdukSerializer, ProdukListSerializer
 from ..filters import ProdukFilter
 from ..pagination import LaravelStylePagination
+from .mixins import ConditionalGetMixin, SerializerRelationsMixin
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 
-class ProdukViewSet(viewsets.ModelViewSet):
+class ProdukViewSet(ConditionalGetMixin, SerializerRelationsMixin, viewsets.ModelViewSet):
     """
     API endpoint yang memungkinkan Produk untuk dilihat atau diedit.
     """
@@ -23,6 +27,9 @@ class ProdukViewSet(viewsets.ModelViewSet):
                      'kategori__nm_kategori']
     ordering_fields = ['nm_produk', 'harga', 'stok', 'tgl_dibuat', 'tgl_update']
     ordering = ['-tgl_dibuat']
+    conditional_actions = ('list', 'retrieve', 'my_products')
+    # Nama kategori, nama bisnis dan nama UMKM ikut ditampilkan
+    conditional_fields = ('tgl_update', 'kategori__tgl_update', 'umkm__tgl_update', 'umkm__profil_umkm__tgl_update')
 
     parser_classes = [MultiPartParser, FormParser, JSONParser]
 
@@ -35,7 +42,8 @@ class ProdukViewSet(viewsets.ModelViewSet):
         """
         Instantiates and returns the list of permissions that this view requires.
         """
-        if self.action in ['my_products', 'create_my_product', 'update_my_product','destroy_my_product']:
+        if self.action in ['my_products', 'create_my_product', 'update_my_product','destroy_my_product',
+                           'stok_alerts']:
             permission_classes = [IsAuthenticated]
         elif self.action == 'list' or self.action == 'retrieve':
             permission_classes = [IsAuthenticated]
@@ -43,6 +51,11 @@ class ProdukViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
+    def get_conditional_queryset(self):
+        if self.action == 'my_products':
+            return Produk.objects.filter(umkm=self.request.user)
+        return super().get_conditional_queryset()
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -133,7 +146,7 @@ class ProdukViewSet(viewsets.ModelViewSet):
                 'message': 'Hanya pengguna dengan role UMKM yang dapat melihat produk mereka'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        produk = Produk.objects.filter(umkm=request.user)
+        produk = self.apply_serializer_relations(Produk.objects.filter(umkm=request.user), ProdukSerializer)
         serializer = ProdukSerializer(produk, many=True)
 
         return Response({
@@ -142,6 +155,60 @@ class ProdukViewSet(viewsets.ModelViewSet):
             'data': serializer.data
         })
 
+    @action(detail=False, methods=['get'])
+    def stok_alerts(self, request):
+        """
+        Produk yang stoknya diperkirakan habis dalam `hari` hari (default 14) menurut kecepatan jual.
+        UMKM melihat produknya sendiri, admin melihat semua produk (opsional filter `umkm`).
+        """
+        if request.user.role not in ('umkm', 'admin'):
+            return Response({
+                'status': 'error',
+                'message': 'Hanya pengguna dengan role UMKM atau admin yang dapat melihat peringatan stok'
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            hari = int(request.query_params.get('hari', 14))
+        except ValueError:
+            hari = 0
+        if not 1 <= hari <= 365:
+            return Response({
+                'status': 'error',
+                'message': 'Parameter hari tidak valid',
+                'errors': {'hari': ['Harus bilangan bulat antara 1 dan 365.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Produk.objects.all()
+        if request.user.role == 'umkm':
+            queryset = queryset.filter(umkm=request.user)
+        elif request.query_params.get('umkm'):
+            try:
+                umkm_id = uuid.UUID(request.query_params['umkm'])
+            except ValueError:
+                return Response({
+                    'status': 'error',
+                    'message': 'Parameter umkm tidak valid',
+                    'errors': {'umkm': ['Harus berupa UUID yang valid.']}
+                }, status=status.HTTP_400_BAD_REQUEST)
+            queryset = queryset.filter(umkm_id=umkm_id)
+
+        produk = stok_alerts(queryset, hari).values(
+            'id', 'nm_produk', 'satuan', 'stok', 'umkm_id', 'kecepatan_jual', 'perkiraan_hari_habis'
+        )
+        data = [
+            {
+                **item,
+                'kecepatan_jual': round(item['kecepatan_jual'], 2),
+                'perkiraan_hari_habis': round(item['perkiraan_hari_habis'], 1),
+            }
+            for item in produk
+        ]
+        return Response({
+            'status': 'success',
+            'message': f'{len(data)} produk diperkirakan habis dalam {hari} hari',
+            'data': data
+        })
+
     @action(detail=False, methods=['post'])
     def create_my_product(self, request):
         """
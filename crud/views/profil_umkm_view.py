@@ -8,9 +8,10 @@ from django_filters.rest_framework import DjangoFilterBackend
 from ..models import ProfilUMKM
 from ..serializers.profil_umkm_serializer import ProfilUMKMSerializer, ProfilUMKMListSerializer
 from ..pagination import LaravelStylePagination
+from .mixins import SerializerRelationsMixin
 
 
-class ProfilUMKMViewSet(viewsets.ModelViewSet):
+class ProfilUMKMViewSet(SerializerRelationsMixin, viewsets.ModelViewSet):
     """
     API endpoint yang memungkinkan Profil UMKM untuk dilihat atau diedit.
     """
@@ -1,12 +1,25 @@
+import re
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags
 from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
 from authentication.permissions import IsAdmin
 from ..models import Provinsi
+from ..regions import get_region_tree
 from ..serializers.provinsi_serializer import ProvinsiSerializer, ProvinsiListSerializer
 from ..pagination import LaravelStylePagination
 
+# Wilayah jarang berubah; klien tetap bisa revalidasi lebih awal memakai ETag
+REGION_TREE_MAX_AGE = 60 * 60 * 24
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
 class ProvinsiViewSet(viewsets.ModelViewSet):
     """
     API endpoint yang memungkinkan Provinsi untuk dilihat atau diedit.
@@ -19,6 +32,12 @@ class ProvinsiViewSet(viewsets.ModelViewSet):
     ordering = ['nm_provinsi']
     permission_classes = [IsAdmin]
 
+    def get_permissions(self):
+        # Pohon wilayah dipakai dropdown form semua pengguna
+        if self.action == 'tree':
+            return [IsAuthenticated()]
+        return super().get_permissions()
+
     def get_serializer_class(self):
         if self.action == 'list':
             return ProvinsiListSerializer
@@ -97,4 +116,28 @@ class ProvinsiViewSet(viewsets.ModelViewSet):
         return Response({
             'status': 'success',
             'message': f'Berhasil menghapus provinsi: {provinsi_name}'
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """
+        Seluruh hierarki provinsi -> kabupaten -> kecamatan dalam satu respons,
+        dikirim dari payload gzip yang sudah disiapkan
+        """
+        tree = get_region_tree()
+
+        if_none_match = request.headers.get('If-None-Match')
+        etags = parse_etags(if_none_match) if if_none_match else []
+        if tree['etag'] in etags or '*' in etags:
+            response = HttpResponseNotModified()
+        elif ACCEPTS_GZIP.search(request.headers.get('Accept-Encoding', '')):
+            response = HttpResponse(tree['gzip'], content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(tree['content'], content_type='application/json')
+
+        response['ETag'] = tree['etag']
+        response['Last-Modified'] = http_date(tree['dibuat'].timestamp())
+        response['Cache-Control'] = f'private, max-age={REGION_TREE_MAX_AGE}'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
@@ -104,27 +104,21 @@ class UserViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        instance = serializer.save()
+        # show_password ikut disimpan pada INSERT user, tanpa save kedua
+        instance = serializer.save(show_password=request.data.get('password'))
 
-        # Simpan show_password jika ada
-        if 'password' in request.data:
-            instance.show_password = request.data.get('password')
-            instance.save()
-
-        # Buat profil UMKM jika role adalah 'umkm' dan profile data tersedia
+        # Isi profil UMKM jika role adalah 'umkm' dan profile data tersedia
         profile_response = None
         if instance.role == 'umkm' and profile_data:
             try:
-                # Create a new ProfilUMKM instance directly to avoid serializer issues
-                profile = ProfilUMKM(
-                    user=instance,
-                    nm_bisnis=profile_data.get('nm_bisnis', ''),
-                    total_laki=profile_data.get('total_laki', 0),
-                    total_perempuan=profile_data.get('total_perempuan', 0),
-                    alamat=profile_data.get('alamat', ''),
-                    tlp=profile_data.get('tlp', ''),
-                    desc_bisnis=profile_data.get('desc_bisnis', '')
-                )
+                # Profil kosong sudah dibuat oleh signal post_save user
+                profile, _ = ProfilUMKM.objects.get_or_create(user=instance)
+                profile.nm_bisnis = profile_data.get('nm_bisnis', '')
+                profile.total_laki = profile_data.get('total_laki', 0)
+                profile.total_perempuan = profile_data.get('total_perempuan', 0)
+                profile.alamat = profile_data.get('alamat', '')
+                profile.tlp = profile_data.get('tlp', '')
+                profile.desc_bisnis = profile_data.get('desc_bisnis', '')
                 # Save the profile to the database
                 profile.save()
 
@@ -168,12 +162,11 @@ class UserViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
-
-        # Update show_password jika password diubah
+        # Update show_password jika password diubah, dalam save yang sama
         if 'password' in request.data:
-            instance.show_password = request.data.get('password')
-            instance.save()
+            serializer.save(show_password=request.data.get('password'))
+        else:
+            serializer.save()
 
         # Update profil UMKM jika role adalah 'umkm' dan profile data tersedia
         profile_response = None
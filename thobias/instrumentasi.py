@@ -0,0 +1,256 @@
+# thobias/instrumentasi.py
+"""
+Instrumentasi per request (opt-in lewat settings INSTRUMENTASI_REQUEST).
+
+Middleware mencatat jumlah query, waktu DB, waktu serializer DRF (.data), waktu render
+respons dan waktu total setiap request, mengirimkannya sebagai header Server-Timing, menulis log terstruktur
+untuk request lambat / pola N+1, dan menyimpan histogram bergulir per endpoint.
+Histogram disimpan di memori proses, jadi setiap worker punya datanya sendiri.
+"""
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('thobias.instrumentasi')
+
+# Jumlah request terakhir per endpoint yang disimpan untuk histogram
+HISTOGRAM_WINDOW = 1000
+# Batas atas bucket histogram (ms); bucket terakhir menampung sisanya
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+# Jumlah bentuk SQL teratas yang ikut dicatat di log
+TOP_SQL_SHAPES = 5
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE = re.compile(r'\s+')
+
+# Metrik request yang sedang berjalan, dibaca oleh pembungkus BaseSerializer.data
+_current_metrics = ContextVar('instrumentasi_metrics', default=None)
+
+
+def sql_shape(sql):
+    """
+    Bentuk SQL tanpa nilai literal, sehingga query yang sama dengan parameter
+    berbeda (pola N+1) terhitung sebagai satu bentuk
+    """
+    shape = _STRING_LITERAL.sub('?', sql)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _IN_LIST.sub('IN (...)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+
+class EndpointHistograms:
+    """
+    Durasi request terakhir per endpoint ("METHOD nama-url") dalam jendela bergulir
+    """
+
+    def __init__(self, window=HISTOGRAM_WINDOW):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, endpoint, total_ms, db_ms, queries):
+        with self.lock:
+            samples = self.samples.get(endpoint)
+            if samples is None:
+                samples = self.samples[endpoint] = deque(maxlen=self.window)
+            samples.append((total_ms, db_ms, queries))
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+
+    def snapshot(self):
+        with self.lock:
+            samples = {endpoint: list(rows) for endpoint, rows in self.samples.items()}
+
+        endpoints = []
+        for endpoint, rows in samples.items():
+            values = np.array(rows, dtype=float)
+            total = values[:, 0]
+            p50, p95, p99 = np.percentile(total, [50, 95, 99])
+            counts = np.bincount(
+                np.searchsorted(HISTOGRAM_BUCKETS_MS, total, side='left'),
+                minlength=len(HISTOGRAM_BUCKETS_MS) + 1
+            )
+            endpoints.append({
+                'endpoint': endpoint,
+                'jumlah_request': len(rows),
+                'p50_ms': round(float(p50), 2),
+                'p95_ms': round(float(p95), 2),
+                'p99_ms': round(float(p99), 2),
+                'max_ms': round(float(total.max()), 2),
+                'rata_rata_db_ms': round(float(values[:, 1].mean()), 2),
+                'rata_rata_query': round(float(values[:, 2].mean()), 2),
+                'histogram': [
+                    {'sampai_ms': upper, 'jumlah': int(count)}
+                    for upper, count in zip(HISTOGRAM_BUCKETS_MS + (None,), counts)
+                ],
+            })
+        endpoints.sort(key=lambda item: item['p95_ms'], reverse=True)
+        return endpoints
+
+
+histograms = EndpointHistograms()
+
+
+class _RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.shapes = Counter()
+        self.shape_seconds = Counter()
+        self.render_started = None
+        self.render_seconds = 0.0
+        self.serializing = False
+        self.serializer_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            shape = sql_shape(sql)
+            self.queries += 1
+            self.db_seconds += elapsed
+            self.shapes[shape] += 1
+            self.shape_seconds[shape] += elapsed
+
+    def rendered(self, response):
+        if self.render_started is not None:
+            self.render_seconds = time.perf_counter() - self.render_started
+
+
+def _timed_serializer_data(fget):
+    @functools.wraps(fget)
+    def data(serializer):
+        metrics = _current_metrics.get()
+        # Serializer bersarang (mis. .data di dalam SerializerMethodField) sudah terhitung
+        if metrics is None or metrics.serializing:
+            return fget(serializer)
+        metrics.serializing = True
+        start = time.perf_counter()
+        db_start = metrics.db_seconds
+        try:
+            return fget(serializer)
+        finally:
+            metrics.serializing = False
+            # Queryset lazy yang dievaluasi saat serialisasi sudah masuk waktu db
+            elapsed = time.perf_counter() - start - (metrics.db_seconds - db_start)
+            metrics.serializer_seconds += max(elapsed, 0.0)
+
+    data._instrumentasi = True
+    return data
+
+
+def install_serializer_timer():
+    """
+    Membungkus BaseSerializer.data (to_representation semua serializer DRF) sekali per proses
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    fget = BaseSerializer.data.fget
+    if not getattr(fget, '_instrumentasi', False):
+        BaseSerializer.data = property(_timed_serializer_data(fget))
+
+
+class InstrumentasiMiddleware:
+    """
+    Letakkan paling atas di MIDDLEWARE agar waktu total mencakup middleware lain.
+
+    Header Server-Timing: db (waktu query), serializer (.data serializer DRF, di luar query
+    yang dijalankannya), render (respons menjadi JSON oleh renderer), app (sisa waktu
+    view/middleware) dan total.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INSTRUMENTASI_REQUEST', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'INSTRUMENTASI_SLOW_MS', 500)
+        self.n_plus_one = getattr(settings, 'INSTRUMENTASI_N_PLUS_ONE', 10)
+        install_serializer_timer()
+
+    def __call__(self, request):
+        metrics = _RequestMetrics()
+        request._instrumentasi = metrics
+        token = _current_metrics.set(metrics)
+
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        total_ms = (time.perf_counter() - start) * 1000
+
+        db_ms = metrics.db_seconds * 1000
+        serializer_ms = metrics.serializer_seconds * 1000
+        render_ms = metrics.render_seconds * 1000
+        app_ms = max(total_ms - db_ms - serializer_ms - render_ms, 0.0)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.2f};desc="{metrics.queries} query"',
+            f'serializer;dur={serializer_ms:.2f}',
+            f'render;dur={render_ms:.2f}',
+            f'app;dur={app_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ])
+
+        endpoint = f'{request.method} {self._endpoint_name(request)}'
+        histograms.record(endpoint, total_ms, db_ms, metrics.queries)
+
+        repeated = [
+            (shape, count) for shape, count in metrics.shapes.most_common(TOP_SQL_SHAPES) if count > 1
+        ]
+        n_plus_one = bool(repeated) and repeated[0][1] >= self.n_plus_one
+        if total_ms >= self.slow_ms or n_plus_one:
+            logger.warning(json.dumps({
+                'event': 'request_lambat' if total_ms >= self.slow_ms else 'n_plus_one',
+                'endpoint': endpoint,
+                'path': request.get_full_path(),
+                'status': response.status_code,
+                'pid': os.getpid(),
+                'total_ms': round(total_ms, 2),
+                'db_ms': round(db_ms, 2),
+                'serializer_ms': round(serializer_ms, 2),
+                'render_ms': round(render_ms, 2),
+                'query': metrics.queries,
+                'n_plus_one': n_plus_one,
+                'sql_berulang': [
+                    {'sql': shape, 'jumlah': count, 'db_ms': round(metrics.shape_seconds[shape] * 1000, 2)}
+                    for shape, count in repeated
+                ],
+            }, ensure_ascii=False))
+
+        return response
+
+    def _endpoint_name(self, request):
+        # Nama URL lebih stabil dan ringkas daripada route regex dari router DRF
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return '(tidak ditemukan)'
+        return match.view_name or match.route
+
+    def process_template_response(self, request, response):
+        # Dipanggil terakhir sebelum response.render() (middleware paling luar)
+        metrics = getattr(request, '_instrumentasi', None)
+        if metrics is not None:
+            metrics.render_started = time.perf_counter()
+            response.add_post_render_callback(metrics.rendered)
+        return response
@@ -0,0 +1,275 @@
+# thobias/profiling.py
+"""
+Profil request lambat (opt-in lewat settings PROFIL_REQUEST).
+
+Dua cara profil diambil:
+- Request dari staff dengan header X-Profil: 1 dijalankan di bawah cProfile
+  (profil lengkap, file .prof untuk pstats/snakeviz).
+- Request lain diambil sampel stack-nya oleh satu thread sampler setelah berjalan
+  setengah PROFIL_AMBANG_MS. Jika total waktunya melewati ambang, sampel disimpan
+  dalam format folded (flamegraph.pl / speedscope). Request cepat hanya
+  didaftarkan dan dilepas dari sampler, tanpa biaya lain.
+
+Setiap profil disimpan di PROFIL_DIR bersama metadata JSON (path, filter query,
+pengguna, durasi); hanya PROFIL_SIMPAN profil terakhir yang dipertahankan.
+"""
+import cProfile
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+logger = logging.getLogger('thobias.profiling')
+
+PROFIL_HEADER = 'HTTP_X_PROFIL'
+PROFIL_ID_PATTERN = re.compile(r'^[0-9A-Za-z_-]+$')
+MODE_CPROFILE = 'cprofile'
+MODE_SAMPLING = 'sampling'
+EKSTENSI = {MODE_CPROFILE: '.prof', MODE_SAMPLING: '.folded'}
+# Batas kedalaman stack per sampel
+MAX_STACK_DEPTH = 200
+
+
+def profil_dir():
+    return Path(getattr(settings, 'PROFIL_DIR', Path(settings.BASE_DIR) / 'profiles'))
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    filename = code.co_filename
+    if 'site-packages' in filename:
+        filename = filename.split('site-packages' + os.sep, 1)[-1]
+    elif filename.startswith(str(settings.BASE_DIR)):
+        filename = os.path.relpath(filename, settings.BASE_DIR)
+    return f'{code.co_name} ({filename}:{frame.f_lineno})'
+
+
+def _fold(frame):
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class _SampledRequest:
+    def __init__(self, ident, started):
+        self.ident = ident
+        self.started = started
+        self.samples = Counter()
+
+
+class StackSampler:
+    """
+    Satu thread daemon per proses yang mengambil sampel stack thread request yang
+    sudah berjalan lebih lama dari `mulai` detik. Thread tidur selama tidak ada
+    request yang perlu diambil sampelnya.
+    """
+
+    def __init__(self, mulai, interval):
+        self.mulai = mulai
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.active = {}
+        self.thread = None
+
+    def register(self):
+        entry = _SampledRequest(threading.get_ident(), time.perf_counter())
+        with self.lock:
+            self.active[entry.ident] = entry
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='profil-sampler', daemon=True)
+                self.thread.start()
+        self.wakeup.set()
+        return entry
+
+    def unregister(self, entry):
+        with self.lock:
+            self.active.pop(entry.ident, None)
+
+    def _run(self):
+        while True:
+            with self.lock:
+                now = time.perf_counter()
+                due = [entry for entry in self.active.values() if now - entry.started >= self.mulai]
+                if due:
+                    frames = sys._current_frames()
+                    for entry in due:
+                        frame = frames.get(entry.ident)
+                        if frame is not None:
+                            entry.samples[_fold(frame)] += 1
+                    timeout = self.interval
+                elif self.active:
+                    timeout = min(entry.started + self.mulai - now for entry in self.active.values())
+                else:
+                    timeout = None
+            self.wakeup.wait(timeout)
+            self.wakeup.clear()
+
+
+def _prune(directory, keep):
+    metas = sorted(directory.glob('*.json'), reverse=True)
+    for meta in metas[keep:]:
+        for path in directory.glob(f'{meta.stem}.*'):
+            path.unlink(missing_ok=True)
+
+
+def simpan_profil(request, response, mode, durasi_ms, tulis, **extra):
+    """
+    Menulis satu profil beserta metadatanya, lalu menghapus profil lama di luar PROFIL_SIMPAN
+    """
+    directory = profil_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    now = datetime.now(dt_timezone.utc)
+    profil_id = f"{now.strftime('%Y%m%d%H%M%S%f')}_{uuid.uuid4().hex[:8]}"
+    user = getattr(request, 'user', None)
+    match = getattr(request, 'resolver_match', None)
+    meta = {
+        'id': profil_id,
+        'mode': mode,
+        'file': profil_id + EKSTENSI[mode],
+        'dibuat': now.isoformat(),
+        'method': request.method,
+        'path': request.path,
+        'endpoint': match.view_name if match else None,
+        'filter': {key: values if len(values) > 1 else values[0] for key, values in request.GET.lists()},
+        'user_id': str(user.pk) if user is not None and user.is_authenticated else None,
+        'status': response.status_code,
+        'durasi_ms': round(durasi_ms, 2),
+        'pid': os.getpid(),
+        **extra,
+    }
+
+    tulis(directory / meta['file'])
+    # Metadata ditulis terakhir: profil baru terlihat di daftar setelah filenya lengkap
+    with open(directory / f'{profil_id}.json', 'w') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    _prune(directory, getattr(settings, 'PROFIL_SIMPAN', 20))
+    return meta
+
+
+def daftar_profil():
+    """
+    Metadata profil yang tersimpan, terbaru lebih dulu
+    """
+    directory = profil_dir()
+    if not directory.is_dir():
+        return []
+    metas = []
+    for path in sorted(directory.glob('*.json'), reverse=True):
+        try:
+            with open(path) as f:
+                metas.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return metas
+
+
+def file_profil(profil_id):
+    """
+    (path, metadata) file profil berdasarkan id, None jika tidak ada
+    """
+    if not PROFIL_ID_PATTERN.match(profil_id):
+        return None
+    for meta in daftar_profil():
+        if meta['id'] == profil_id:
+            path = profil_dir() / meta['file']
+            return (path, meta) if path.is_file() else None
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Letakkan di awal MIDDLEWARE agar profil mencakup middleware lain.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFIL_REQUEST', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.ambang_ms = getattr(settings, 'PROFIL_AMBANG_MS', 2000)
+        self.sampler = StackSampler(
+            # Sampling dimulai pada setengah ambang (dalam detik)
+            mulai=self.ambang_ms / 2 / 1000,
+            interval=getattr(settings, 'PROFIL_INTERVAL_MS', 5) / 1000,
+        )
+
+    def __call__(self, request):
+        if request.META.get(PROFIL_HEADER) == '1' and self._is_staff(request):
+            return self._cprofile(request)
+
+        entry = self.sampler.register()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            self.sampler.unregister(entry)
+        durasi_ms = (time.perf_counter() - start) * 1000
+
+        if durasi_ms >= self.ambang_ms and entry.samples:
+            def tulis(path):
+                with open(path, 'w') as f:
+                    for stack, count in entry.samples.most_common():
+                        f.write(f'{stack} {count}\n')
+
+            self._simpan(request, response, MODE_SAMPLING, durasi_ms, tulis,
+                         jumlah_sampel=sum(entry.samples.values()))
+        return response
+
+    def _cprofile(self, request):
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        durasi_ms = (time.perf_counter() - start) * 1000
+
+        meta = self._simpan(request, response, MODE_CPROFILE, durasi_ms,
+                            lambda path: profiler.dump_stats(str(path)))
+        if meta:
+            response['X-Profil-Id'] = meta['id']
+        return response
+
+    def _simpan(self, request, response, mode, durasi_ms, tulis, **extra):
+        # Gagal menyimpan profil tidak boleh menggagalkan request
+        try:
+            return simpan_profil(request, response, mode, durasi_ms, tulis, **extra)
+        except OSError:
+            logger.exception('Gagal menyimpan profil request %s', request.path)
+            return None
+
+    def _is_staff(self, request):
+        """
+        Header profil hanya berlaku untuk staff. Token diperiksa di sini dengan
+        autentikasi DRF karena request.user dari middleware Django belum mengenali token OAuth2.
+        """
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user.is_staff
+
+        drf_request = Request(request)
+        for authenticator_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            try:
+                result = authenticator_class().authenticate(drf_request)
+            except exceptions.APIException:
+                return False
+            if result is not None:
+                return bool(result[0].is_staff)
+        return False
@@ -67,6 +67,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Tidak aktif kecuali INSTRUMENTASI_REQUEST=1 / PROFIL_REQUEST=1
+    'thobias.instrumentasi.InstrumentasiMiddleware',
+    'thobias.profiling.ProfilingMiddleware',
     'oauth2_provider.middleware.OAuth2TokenMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -78,6 +81,21 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Instrumentasi per request: header Server-Timing, log request lambat / N+1,
+# histogram per endpoint di /api/instrumentasi/
+INSTRUMENTASI_REQUEST = os.getenv('INSTRUMENTASI_REQUEST', '0') == '1'
+INSTRUMENTASI_SLOW_MS = int(os.getenv('INSTRUMENTASI_SLOW_MS', '500'))
+# Bentuk SQL yang sama sebanyak ini dalam satu request dianggap N+1
+INSTRUMENTASI_N_PLUS_ONE = int(os.getenv('INSTRUMENTASI_N_PLUS_ONE', '10'))
+
+# Profil request lambat (sampling) atau request staff dengan header X-Profil: 1 (cProfile),
+# bisa diunduh di /api/profil/
+PROFIL_REQUEST = os.getenv('PROFIL_REQUEST', '0') == '1'
+PROFIL_AMBANG_MS = int(os.getenv('PROFIL_AMBANG_MS', '2000'))
+PROFIL_INTERVAL_MS = int(os.getenv('PROFIL_INTERVAL_MS', '5'))
+PROFIL_SIMPAN = int(os.getenv('PROFIL_SIMPAN', '20'))
+PROFIL_DIR = os.getenv('PROFIL_DIR', str(BASE_DIR / 'profiles'))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'oauth2_provider.contrib.rest_framework.OAuth2Authentication',
@@ -183,6 +201,22 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/ref/settings/#caches
+# Versi cache (crud/cache_versions.py) harus terlihat oleh semua worker, jadi default-nya
+# tabel cache di database di atas (dibuat otomatis setelah migrate). Bisa diganti ke
+# Redis/Memcached lewat CACHE_BACKEND dan CACHE_LOCATION.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache')
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'django_cache'),
+    }
+}
+if CACHE_BACKEND.endswith('.DatabaseCache'):
+    # Default 300 entri terlalu kecil untuk cache count, tile peta dan statistik
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', '20000'))}
+
 
 
 # Password validation